@@ -10,7 +10,22 @@ Autor:  Societal Business Think Tank
 Stack:  Streamlit · yfinance · Plotly
 """
 
+import hashlib
+import json
 import math
+import os
+import pickle
+import socket
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from functools import partial
+from pathlib import Path
+from typing import IO, Callable, Iterator
 import numpy as np
 import pandas as pd
 
@@ -23,6 +38,7 @@ def _sf(v, default=0.0):
         return default
 import streamlit as st
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 from translations import T, LANGUAGES
 
@@ -46,6 +62,33 @@ try:
     YF_AVAILABLE = True
 except ImportError:
     YF_AVAILABLE = False
+# FLYNN_OFFLINE=1 pins the app to FALLBACK_DATA (load tests, offline demos)
+if os.environ.get("FLYNN_OFFLINE"):
+    YF_AVAILABLE = False
+
+# ─── fcntl (POSIX) for cross-process single-flight locks ─────────────────────
+try:
+    import fcntl
+    FLOCK_AVAILABLE = True
+except ImportError:
+    FLOCK_AVAILABLE = False
+
+# ─── pyarrow (ships with Streamlit) for Parquet / Arrow exports ──────────────
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# ─── Numba (optional) compiles the Flynn index recurrence ────────────────────
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+# FLYNN_JIT=off keeps the NumPy reference path even where Numba is installed
+JIT_ENABLED = NUMBA_AVAILABLE and os.environ.get("FLYNN_JIT", "auto") != "off"
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  PAGE CONFIG & THEME
@@ -182,37 +225,90 @@ TICKER_COLORS = {
 #  Costs based on REVENUE (entire business activity), NOT just NI!
 #  These are the REAL costs that the extractive system hides.
 # ══════════════════════════════════════════════════════════════════
-EXT_CATEGORIES = {
-    # ── EHI-driven (Ecological) ──
-    "Klima & CO2":            {"rate": 0.12, "index": "ehi", "color": "#ff6b6b", "icon": "\U0001F321"},
-    "Biodiversitaetsverlust": {"rate": 0.06, "index": "ehi", "color": "#cc4444", "icon": "\U0001F33F"},
-    "Wasser & Boden":         {"rate": 0.04, "index": "ehi", "color": "#aa3333", "icon": "\U0001F4A7"},
-    # ── HRI-driven (Social) ──
-    "Gesundheitsschaeden":    {"rate": 0.06, "index": "hri", "color": "#ff8c42", "icon": "\U0001F3E5"},
-    "Soziale Ungleichheit":   {"rate": 0.08, "index": "hri", "color": "#e07020", "icon": "\u2696"},
-    "Arbeitnehmerausbeutung": {"rate": 0.04, "index": "hri", "color": "#c06010", "icon": "\u26D3"},
-    # ── IRI-driven (Institutional) ──
-    "Systemisches Risiko":    {"rate": 0.07, "index": "iri", "color": "#fbbf24", "icon": "\U0001F4A3"},
-    "Regulat. Erfassung":     {"rate": 0.03, "index": "iri", "color": "#d4a017", "icon": "\U0001F3DB"},
-}
+EXT_CONFIG_PATH = Path(__file__).with_name("externalities.json")
+
+
+def load_ext_registry(path: Path = EXT_CONFIG_PATH) -> dict:
+    """
+    Read the externality registry and compile it for matrix evaluation.
+    A category either splits its rate over the weighted dimensions named in
+    "split" (e.g. region × sector) or lists explicit "subcategories"; the
+    "index" of a category or sub-category is one of ehi/hri/iri or a
+    {index: weight} mix. Sub-categories are the modelling unit; their rates
+    and index weights are summed per category so every phase evaluates
+        cost[cat] = Rev · (rates[cat] − index_w[cat] · (EHI, HRI, IRI))
+    as one matrix product, whatever the number of sub-categories.
+    """
+    with open(path, encoding="utf-8") as fh:
+        cfg = json.load(fh)
+    dims = {name: {k: w / sum(weights.values()) for k, w in weights.items()}
+            for name, weights in cfg.get("dimensions", {}).items()}
+
+    def _index_row(spec) -> np.ndarray:
+        spec = {spec: 1.0} if isinstance(spec, str) else spec
+        unknown = set(spec) - set(_IDX_KEYS)
+        if unknown:
+            raise ValueError(f"{path.name}: unknown index {sorted(unknown)}")
+        row = np.array([float(spec.get(k, 0.0)) for k in _IDX_KEYS])
+        return row / row.sum()
+
+    categories, subcategories, rows = {}, [], []
+    for c, cat in enumerate(cfg["categories"]):
+        subs = cat.get("subcategories")
+        if subs is None:
+            subs = [{"name": cat["name"], "rate": cat["rate"]}]
+            for dim in cat.get("split", []):
+                if dim not in dims:
+                    raise ValueError(f"{path.name}: unknown dimension {dim!r} in {cat['name']!r}")
+                subs = [{**sub, "name": f"{sub['name']} · {key}", dim: key, "rate": sub["rate"] * w}
+                        for sub in subs for key, w in dims[dim].items()]
+        for sub in subs:
+            subcategories.append({**sub, "category": cat["name"]})
+            rows.append((c, float(sub["rate"]), _index_row(sub["index"] if "index" in sub else cat["index"])))
+        categories[cat["name"]] = {k: cat[k] for k in ("index", "color", "icon") if k in cat}
+        categories[cat["name"]]["label"] = cat.get("label", "")
+
+    sub_to_cat = np.zeros((len(rows), len(categories)))
+    sub_to_cat[np.arange(len(rows)), [c for c, _, _ in rows]] = 1.0
+    sub_rates = np.array([r for _, r, _ in rows])
+    sub_index = np.array([w for _, _, w in rows])
+    rates = sub_to_cat.T @ sub_rates
+    index_w = sub_to_cat.T @ (sub_rates[:, None] * sub_index)
+    for cfg_c, rate, w in zip(categories.values(), rates, index_w):
+        cfg_c["rate"] = float(rate)
+        cfg_c.setdefault("index", _IDX_KEYS[int(np.argmax(w))])
+    return {
+        "categories": categories, "subcategories": subcategories,
+        "sub_rates": sub_rates, "sub_index": sub_index, "sub_to_cat": sub_to_cat,
+        "rates": rates, "index_w": index_w,
+    }
+
+
+_IDX_KEYS = ("ehi", "hri", "iri")
+_EXT_REGISTRY = load_ext_registry()
+EXT_CATEGORIES = _EXT_REGISTRY["categories"]
 EXT_CAT_NAMES = list(EXT_CATEGORIES.keys())
+EXT_SUBCATEGORIES = _EXT_REGISTRY["subcategories"]
 
 # Mapping: internal German key → translation key (for chart legends)
-CAT_TRANSLATE = {
-    "Klima & CO2":            "math_cat_climate",
-    "Biodiversitaetsverlust": "math_cat_biodiv",
-    "Wasser & Boden":         "math_cat_water",
-    "Gesundheitsschaeden":    "math_cat_health",
-    "Soziale Ungleichheit":   "math_cat_inequality",
-    "Arbeitnehmerausbeutung": "math_cat_exploitation",
-    "Systemisches Risiko":    "math_cat_systemic",
-    "Regulat. Erfassung":     "math_cat_regulatory",
-}
+CAT_TRANSLATE = {name: cfg["label"] for name, cfg in EXT_CATEGORIES.items() if cfg["label"]}
 def _tcat(key: str) -> str:
     """Translate an internal category key to the current language."""
     return t(CAT_TRANSLATE.get(key, "")) if key in CAT_TRANSLATE else key
 # Total max rate at full degradation (all indices=0): sum of all rates = 0.50 of Revenue
 
+# Matrix form of the registry for the vectorized kernel:
+# cost = Rev * (_EXT_RATES - _EXT_INDEX_W @ I) with I = (EHI, HRI, IRI)
+_EXT_RATES = _EXT_REGISTRY["rates"]
+_EXT_INDEX_W = _EXT_REGISTRY["index_w"]
+
+
+def _ext_cost_share(idx) -> np.ndarray:
+    """Externality cost per unit revenue by category; idx has shape (3, ...)."""
+    idx = np.asarray(idx, dtype=float)
+    return _EXT_RATES.reshape((-1,) + (1,) * (idx.ndim - 1)) - np.tensordot(_EXT_INDEX_W, idx, axes=1)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  30-YEAR RETROPOLATION: Estimated combined Revenue for Big 5 Asset Managers
 #  The extractive system didn't start in 2021 — it has been running for DECADES.
@@ -237,46 +333,631 @@ _RETRO_COMBINED_REVENUE = {
     2019: 97.0e9, 2020: 94.0e9,
 }
 RETRO_START = min(_RETRO_COMBINED_REVENUE.keys())  # 1996
+# Indices were WORSE in the past: linear decline per year back (EHI, HRI, IRI), floored
+_RETRO_SLOPES = (0.005, 0.004, 0.003)
+_RETRO_FLOORS = (0.10, 0.15, 0.20)
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def fetch_annual_history() -> pd.DataFrame:
+# ── Circuit breakers around yfinance: one per (ticker, endpoint) ──
+# A failed call is remembered for _NEGATIVE_TTL seconds (negative cache);
+# _BREAKER_THRESHOLD consecutive failures open the circuit for an interval
+# that doubles with every further failure. A skipped or failed call yields
+# None and the dataset keeps its last-known-good snapshot.
+_NEGATIVE_TTL = 30
+_BREAKER_THRESHOLD = 2
+_BREAKER_BASE = 60
+_BREAKER_MAX = 3600
+
+
+class CircuitBreaker:
     """
-    Pull REAL annual data for all TICKERS: stock price + net income + revenue.
-    Returns a DataFrame indexed by year with columns per ticker.
+    Failure state of one yfinance endpoint. Sessions and the refresh thread
+    share breakers, so the state is changed under a lock, and a half-open
+    breaker lets exactly one trial call through until it records its outcome.
     """
-    rows: dict[int, dict] = {}
 
-    for tick in TICKERS:
-        t = yf.Ticker(tick)
+    def __init__(self):
+        self.failures = 0
+        self.retry_at = 0.0
+        self.last_error = ""
+        self.probing = False
+        self._lock = threading.Lock()
+
+    def state(self, now: float) -> str:
+        with self._lock:
+            return self._state(now)
+
+    def _state(self, now: float) -> str:
+        if self.failures < _BREAKER_THRESHOLD:
+            return "negative-cached" if now < self.retry_at else "closed"
+        return "open" if now < self.retry_at else "half-open"
+
+    def allow(self, now: float) -> bool:
+        with self._lock:
+            if now < self.retry_at:
+                return False
+            if self.failures < _BREAKER_THRESHOLD:
+                return True
+            if self.probing:
+                return False
+            self.probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures, self.retry_at, self.probing = 0, 0.0, False
+
+    def record_failure(self, error: Exception, now: float) -> None:
+        with self._lock:
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"[:120]
+            delay = _NEGATIVE_TTL if self.failures < _BREAKER_THRESHOLD else min(
+                _BREAKER_MAX, _BREAKER_BASE * 2 ** (self.failures - _BREAKER_THRESHOLD))
+            self.retry_at = now + delay
+            self.probing = False
+
+    def release(self) -> None:
+        """End an interrupted trial call without an outcome; the next caller probes."""
+        with self._lock:
+            self.probing = False
+
+    def status(self, now: float) -> dict:
+        with self._lock:
+            return {"state": self._state(now), "failures": self.failures,
+                    "retry_in_s": max(0.0, self.retry_at - now), "last_error": self.last_error}
+
+
+@st.cache_resource(show_spinner=False)
+def _breakers() -> tuple[dict[tuple[str, str], CircuitBreaker], threading.Lock]:
+    """
+    The process-wide (ticker, endpoint) → breaker registry and its lock. Every
+    script run executes in a fresh module, so a module-level dict would be
+    new on each rerun while the scheduler thread kept filling the first one.
+    """
+    return {}, threading.Lock()
+
+
+def _guarded(tick: str, endpoint: str, fetch: Callable[[], object]):
+    """fetch() through the (tick, endpoint) breaker; None when skipped or failing."""
+    registry, lock = _breakers()
+    with lock:
+        breaker = registry.setdefault((tick, endpoint), CircuitBreaker())
+    if not breaker.allow(time.time()):
+        return None
+    try:
+        value = fetch()
+        if value is None or len(value) == 0:
+            raise ValueError("empty response")
+    except Exception as exc:
+        breaker.record_failure(exc, time.time())
+        return None
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record_success()
+    return value
+
+
+def breaker_status() -> pd.DataFrame:
+    """One row per (ticker, endpoint) breaker, for diagnostics."""
+    now = time.time()
+    registry, lock = _breakers()
+    with lock:
+        items = sorted(registry.items())
+    return pd.DataFrame([{"ticker": tick, "endpoint": endpoint, **br.status(now)}
+                         for (tick, endpoint), br in items])
+
+
+def _ticker_history(tick: str, interval: str) -> pd.DataFrame:
+    hist = yf.Ticker(tick).history(period="6y", interval=interval)
+    if hist is not None and not hist.empty:
+        hist.index = (
+            hist.index.tz_localize(None)
+            if hist.index.tz is None
+            else hist.index.tz_convert(None)
+        )
+    return hist
+
+
+def _annual_prices(tick: str) -> dict[int, dict]:
+    """Annual close of one ticker from yfinance, as {year: {"{tk}_price": close}}."""
+    hist = _guarded(tick, "history_3mo", lambda: _ticker_history(tick, "3mo"))
+    if hist is None:
+        return {}
+    annual = hist.groupby(hist.index.year)["Close"].last()
+    return {yr: {f"{tick}_price": float(price)} for yr, price in annual.items()}
+
 
-        # ── Stock price history (annual close) ──
+def _annual_statements(tick: str) -> dict[int, dict]:
+    """Annual net income + revenue of one ticker from its income statement."""
+    rows: dict[int, dict] = {}
+    inc = _guarded(tick, "income_stmt", lambda: yf.Ticker(tick).income_stmt)
+    if inc is not None:
+        if "Net Income" in inc.index:
+            for col_ts, val in inc.loc["Net Income"].items():
+                rows.setdefault(col_ts.year, {})[f"{tick}_netincome"] = float(val)
+        if "Total Revenue" in inc.index:
+            for col_ts, val in inc.loc["Total Revenue"].items():
+                rows.setdefault(col_ts.year, {})[f"{tick}_revenue"] = float(val)
+    return rows
+
+
+def _period_prices(tick: str, steps_per_year: int) -> pd.Series:
+    """Sub-annual closes of one ticker, indexed by the decimal period start."""
+    interval = "3mo" if steps_per_year == 4 else "1mo"
+    months_per_step = 12 // steps_per_year
+    hist = _guarded(tick, f"history_{interval}", lambda: _ticker_history(tick, interval))
+    if hist is None:
+        return pd.Series(dtype=float)
+    idx = hist.index
+    period = idx.year + ((idx.month - 1) // months_per_step) / steps_per_year
+    closes = pd.Series(hist["Close"].to_numpy(dtype=float), index=np.round(period, 4))
+    return closes.groupby(level=0).last()
+
+
+# ── Shared cache backend: market data, simulation results, figures ──
+# One cache shared by all replicas raises the hit rate with total traffic.
+# FLYNN_CACHE selects the backend:
+#   memory (default)          in-process LRU
+#   sqlite:///path/cache.db   SQLite file, shared by processes on one host
+#   redis://host:port         network key-value store speaking the Redis
+#                             protocol (GET/SET PX); kv_standin.py is a local
+#                             stand-in for tests
+# Values are pickled, zlib-compressed above 1 KB and expire after their TTL.
+# Keys carry a digest of the code, so replicas on another version never
+# share entries; market data, which does not depend on the code, is keyed
+# by _MARKET_SCHEMA instead. A failing backend behaves like a miss.
+CACHE_URL = os.environ.get("FLYNN_CACHE", "memory")
+_COMPRESS_MIN = 1024
+_CACHE_VERSION = hashlib.blake2b(b"".join(
+    (Path(__file__).with_name(f)).read_bytes()
+    for f in ("app.py", "translations.py", "externalities.json")
+), digest_size=6).hexdigest()
+
+
+class CacheBackend:
+    """Byte store with per-entry TTL; subclasses implement _get/_set."""
+    name = "base"
+
+    def __init__(self):
+        self.hits = self.misses = self.errors = 0
+
+    def get(self, key: str) -> bytes | None:
         try:
-            hist = t.history(period="6y", interval="3mo")
-            if hist is not None and not hist.empty:
-                hist.index = (
-                    hist.index.tz_localize(None)
-                    if hist.index.tz is None
-                    else hist.index.tz_convert(None)
-                )
-                annual = hist.groupby(hist.index.year)["Close"].last()
-                for yr, price in annual.items():
-                    rows.setdefault(yr, {})[f"{tick}_price"] = float(price)
+            value = self._get(key)
         except Exception:
-            pass
+            self.errors += 1
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
 
-        # ── Income statement (annual net income + revenue) ──
+    def set(self, key: str, value: bytes, ttl: float) -> None:
         try:
-            inc = t.income_stmt
-            if inc is not None and not inc.empty:
-                if "Net Income" in inc.index:
-                    for col_ts, val in inc.loc["Net Income"].items():
-                        rows.setdefault(col_ts.year, {})[f"{tick}_netincome"] = float(val)
-                if "Total Revenue" in inc.index:
-                    for col_ts, val in inc.loc["Total Revenue"].items():
-                        rows.setdefault(col_ts.year, {})[f"{tick}_revenue"] = float(val)
+            self._set(key, value, ttl)
         except Exception:
-            pass
+            self.errors += 1
+
+    def status(self) -> dict:
+        total = self.hits + self.misses
+        return {"backend": self.name, "hits": self.hits, "misses": self.misses, "errors": self.errors,
+                "hit_ratio": self.hits / total if total else np.nan}
+
+
+class MemoryLRUBackend(CacheBackend):
+    name = "memory"
+
+    def __init__(self, max_entries: int = 256):
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.time():
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteBackend(CacheBackend):
+    name = "sqlite"
+
+    def __init__(self, path: Path):
+        super().__init__()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=2.0, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires REAL, value BLOB)")
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _get(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT expires, value FROM cache WHERE key = ?", (key,)).fetchone()
+        return row[1] if row is not None and row[0] >= time.time() else None
+
+    def _set(self, key, value, ttl):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?)", (key, time.time() + ttl, value))
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._db.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+
+
+class KVBackend(CacheBackend):
+    """Network key-value store over the Redis protocol (GET / SET … PX)."""
+    name = "kv"
+
+    def __init__(self, host: str, port: int, timeout: float = 0.5):
+        super().__init__()
+        self.address, self.timeout = (host, port), timeout
+        self._sock: socket.socket | None = None
+        self._reader = None
+        self._lock = threading.Lock()
+        self._breaker = CircuitBreaker()    # an unreachable store is skipped, not waited on
+
+    def _call(self, *args: bytes):
+        if not self._breaker.allow(time.time()):
+            raise ConnectionError("cache store unavailable")
+        with self._lock:
+            try:
+                if self._sock is None:
+                    self._sock = socket.create_connection(self.address, timeout=self.timeout)
+                    self._reader = self._sock.makefile("rb")
+                self._sock.sendall(b"*%d\r\n" % len(args)
+                                   + b"".join(b"$%d\r\n%s\r\n" % (len(a), a) for a in args))
+                reply = self._read_reply()
+            except Exception as exc:
+                self._close()
+                self._breaker.record_failure(exc, time.time())
+                raise
+        self._breaker.record_success()
+        return reply
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"$":
+            size = int(rest)
+            return None if size < 0 else self._reader.read(size + 2)[:-2]
+        if kind == b"-":
+            raise RuntimeError(rest.decode())
+        if not line:
+            raise ConnectionError("connection closed")
+        return rest
+
+    def _close(self):
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = self._reader = None
+
+    def _get(self, key):
+        return self._call(b"GET", key.encode())
+
+    def _set(self, key, value, ttl):
+        self._call(b"SET", key.encode(), value, b"PX", str(max(1, int(ttl * 1000))).encode())
+
+
+@st.cache_resource(show_spinner=False)
+def cache_backend(url: str = CACHE_URL) -> CacheBackend:
+    """The process-wide cache backend configured by FLYNN_CACHE."""
+    if url.startswith("sqlite://"):
+        return SQLiteBackend(Path(url[len("sqlite://"):]))
+    if url.startswith(("redis://", "kv://")):
+        host, _, port = url.split("://", 1)[1].rstrip("/").partition(":")
+        return KVBackend(host or "localhost", int(port or 6379))
+    return MemoryLRUBackend()
+
+
+def _cache_key(key: str, versioned: bool) -> str:
+    return f"flynn:{_CACHE_VERSION}:{key}" if versioned else f"flynn:{key}"
+
+
+def cache_get(key: str, versioned: bool = True):
+    """Shared-cache lookup of a pickled value (None on a miss); see _cache_key."""
+    blob = cache_backend().get(_cache_key(key, versioned))
+    if blob is None:
+        return None
+    return pickle.loads(zlib.decompress(blob[1:]) if blob[:1] == b"z" else blob[1:])
+
+
+def _encode(value) -> bytes:
+    """The blob cache_set stores for `value`: pickled, zlib-compressed above _COMPRESS_MIN."""
+    blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    return b"z" + zlib.compress(blob, 1) if len(blob) >= _COMPRESS_MIN else b"r" + blob
+
+
+def cache_set(key: str, value, ttl: float, versioned: bool = True) -> None:
+    cache_backend().set(_cache_key(key, versioned), _encode(value), ttl)
+
+
+def shared_cached(namespace: str, parts, compute: Callable[[], object], ttl: float = 3600):
+    """compute() through the shared cache, keyed by a digest of `parts`."""
+    key = f"{namespace}:{hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()}"
+    value = cache_get(key)
+    if value is None:
+        value = compute()
+        cache_set(key, value, ttl)
+    return value
+
+
+# ── Single-flight: one download per dataset, however many callers ──
+# Threads asking for a dataset that is already being fetched wait for that
+# fetch and share its result. Across worker processes on the same host a
+# lock file serialises the fetch; whoever gets the lock second finds the
+# first one's result in the shared file and takes it instead of fetching.
+# Without fcntl (Windows) only the thread level applies.
+# The shared files are unpickled, so their directory is per user and private:
+# _shared_dir() refuses one that another user owns or can write to.
+_UID = os.getuid() if hasattr(os, "getuid") else None
+_SHARED_DIR = Path(os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()) / f"flynn-dashboard-{_UID}"
+
+
+def _shared_dir() -> Path | None:
+    """The single-flight directory (created 0700), or None if it is not ours alone."""
+    if _UID is None:
+        return None
+    try:
+        _SHARED_DIR.mkdir(mode=0o700, exist_ok=True)
+        info = os.stat(_SHARED_DIR, follow_symlinks=False)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != _UID or stat.S_IMODE(info.st_mode) != 0o700:
+        return None
+    return _SHARED_DIR
+
+
+class _Flight:
+    __slots__ = ("done", "result")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: tuple[float, object] = (0.0, None)
+
+
+@st.cache_resource(show_spinner=False)
+def _inflight() -> tuple[dict[str, _Flight], threading.Lock]:
+    """The process-wide map of running fetches and its lock (shared by all script runs)."""
+    return {}, threading.Lock()
+
+
+def _fetch_shared(key: str, fetch: Callable[[], object], fresh_for: float) -> tuple[float, object]:
+    """fetch() under the host-wide lock of `key`, or a peer's result younger than `fresh_for` s."""
+    shared_dir = _shared_dir() if FLOCK_AVAILABLE else None
+    if shared_dir is None:
+        return time.time(), fetch()
+    base = shared_dir / key.replace(":", "_")
+    shared = base.with_suffix(".pkl")
+    with open(base.with_suffix(".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            if shared.exists() and time.time() - shared.stat().st_mtime < fresh_for:
+                with open(shared, "rb") as fh:
+                    return shared.stat().st_mtime, pickle.load(fh)
+            value = fetch()
+            if value is not None and len(value) > 0:
+                tmp = base.with_suffix(f".{os.getpid()}.tmp")
+                with open(tmp, "wb") as fh:
+                    pickle.dump(value, fh)
+                os.replace(tmp, shared)
+            return time.time(), value
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def single_flight(key: str, fetch: Callable[[], object], fresh_for: float) -> tuple[float, object]:
+    """
+    Deduplicated fetch of dataset `key`: returns (fetched at, value), where
+    the value may come from a concurrent caller in this process or from
+    another process on the host that fetched it less than `fresh_for` s ago.
+    """
+    flights, lock = _inflight()
+    with lock:
+        flight = flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = flights[key] = _Flight()
+    if not leader:
+        flight.done.wait()
+        return flight.result
+    try:
+        flight.result = _fetch_shared(key, fetch, fresh_for)
+    finally:
+        with lock:
+            del flights[key]
+        flight.done.set()
+    return flight.result
+
+
+# ── Market data snapshots: stale-while-revalidate ──
+# Every dataset ("{kind}:{ticker}") is downloaded by a background scheduler
+# shortly before its refresh interval runs out and carries its own
+# timestamp; requests always read the latest snapshots and never wait on
+# the network. A ticker whose data has not arrived (or never does) is
+# filled from FALLBACK_DATA on read, the others stay live. Prices move
+# daily, statements only quarterly. A failed download keeps the old
+# snapshot and is retried after _RETRY_AFTER (the 30 s negative-cache TTL);
+# an endpoint that keeps failing is backed off further by its breaker.
+MARKET_DATASETS: dict[str, tuple[Callable[[], object], float]] = {}
+for _tick in TICKERS:
+    MARKET_DATASETS[f"prices:{_tick}"] = (partial(_annual_prices, _tick), 3600)
+    MARKET_DATASETS[f"statements:{_tick}"] = (partial(_annual_statements, _tick), 24 * 3600)
+    for _n in (4, 12):
+        MARKET_DATASETS[f"period_{_n}:{_tick}"] = (partial(_period_prices, _tick, _n), 3600)
+_REFRESH_AHEAD = 0.8      # refresh once a snapshot is 80 % through its interval
+_RETRY_AFTER = _NEGATIVE_TTL  # a dataset whose download failed waits at least this long
+_SCHEDULER_TICK = 15      # seconds between scheduler passes
+_ALWAYS_WANTED = tuple(n for n in MARKET_DATASETS if n.startswith(("prices:", "statements:")))
+# Layout of the market snapshots, (fetched at, what the loaders above
+# return). Their shared-cache entries and single-flight files outlive code
+# deploys; bump this when a loader's output changes so old ones are ignored.
+_MARKET_SCHEMA = 1
+
+
+def _market_key(name: str) -> str:
+    return f"market:v{_MARKET_SCHEMA}:{name}"
+
+
+class MarketDataStore:
+    """Process-wide snapshots of MARKET_DATASETS, refreshed in the background."""
+
+    def __init__(self, datasets: dict[str, tuple[Callable[[], object], float]]):
+        self.datasets = datasets
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._snapshots: dict[str, tuple[float, object]] = {}   # name → (fetched at, value)
+        self._failed_at: dict[str, float] = {}
+        self._wanted = set(_ALWAYS_WANTED)
+        self._stats = {name: {"refreshes": 0, "failures": 0, "durations": deque(maxlen=50)}
+                       for name in datasets}
+
+    def get(self, name: str):
+        """Latest snapshot (None before the first download); never blocks."""
+        with self._lock:
+            if name not in self._wanted:
+                self._wanted.add(name)
+                self._wake.set()
+            snap = self._snapshots.get(name)
+        return None if snap is None else snap[1]
+
+    def preload(self) -> None:
+        """
+        Seed the snapshots from the persistent stores (shared cache, then the
+        single-flight files of earlier fetches on this host, only from the
+        checked private directory of _shared_dir) without touching the
+        network; the scheduler refreshes whatever turns out to be stale.
+        """
+        shared_dir = _shared_dir()
+        for name in _ALWAYS_WANTED:
+            snap = cache_get(_market_key(name), versioned=False)
+            shared = None if shared_dir is None else shared_dir / (_market_key(name).replace(":", "_") + ".pkl")
+            if snap is None and shared is not None and shared.exists():
+                try:
+                    with open(shared, "rb") as fh:
+                        snap = shared.stat().st_mtime, pickle.load(fh)
+                except Exception:
+                    snap = None
+            if snap is not None:
+                with self._lock:
+                    self._snapshots[name] = snap
+
+    def _due(self, name: str, now: float) -> bool:
+        snap = self._snapshots.get(name)
+        if name in self._failed_at and now - self._failed_at[name] < _RETRY_AFTER:
+            return False
+        return snap is None or now - snap[0] >= _REFRESH_AHEAD * self.datasets[name][1]
+
+    def refresh(self, name: str) -> None:
+        loader, interval = self.datasets[name]
+        start = time.perf_counter()
+        try:
+            # Another replica may have fetched it recently: the shared cache first
+            cached = cache_get(_market_key(name), versioned=False)
+            if cached is not None and time.time() - cached[0] < _REFRESH_AHEAD * interval:
+                fetched_at, value = cached
+            else:
+                fetched_at, value = single_flight(_market_key(name), loader, _REFRESH_AHEAD * interval)
+            ok = value is not None and len(value) > 0
+            if ok and (cached is None or fetched_at != cached[0]):
+                cache_set(_market_key(name), (fetched_at, value), interval, versioned=False)
+        except Exception:
+            value, ok = None, False
+        duration = time.perf_counter() - start
+        with self._lock:
+            stats = self._stats[name]
+            stats["durations"].append(duration)
+            if ok:
+                stats["refreshes"] += 1
+                self._snapshots[name] = (fetched_at, value)
+                self._failed_at.pop(name, None)
+            else:
+                stats["failures"] += 1
+                self._failed_at[name] = time.time()
+
+    def run(self) -> None:
+        """Scheduler loop (daemon thread): refresh whatever is due, then sleep."""
+        while True:
+            with self._lock:
+                due = [n for n in self.datasets if n in self._wanted and self._due(n, time.time())]
+            for name in due:
+                self.refresh(name)
+            self._wake.wait(_SCHEDULER_TICK)
+            self._wake.clear()
+
+    def status(self) -> pd.DataFrame:
+        """Per-dataset age and observed refresh durations (seconds)."""
+        now = time.time()
+        rows = []
+        with self._lock:
+            for name, (_, interval) in self.datasets.items():
+                snap, stats = self._snapshots.get(name), self._stats[name]
+                durations = np.array(stats["durations"], dtype=float)
+                rows.append({
+                    "dataset": name, "interval_s": interval,
+                    "age_s": now - snap[0] if snap else np.nan,
+                    "refreshes": stats["refreshes"], "failures": stats["failures"],
+                    "last_refresh_s": durations[-1] if len(durations) else np.nan,
+                    "mean_refresh_s": durations.mean() if len(durations) else np.nan,
+                    "max_refresh_s": durations.max() if len(durations) else np.nan,
+                })
+        return pd.DataFrame(rows)
+
+
+@st.cache_resource(show_spinner=False)
+def market_data_store() -> MarketDataStore:
+    """The process-wide store; its scheduler thread starts with it."""
+    store = MarketDataStore(MARKET_DATASETS if YF_AVAILABLE else {})
+    if YF_AVAILABLE:
+        store.preload()
+        threading.Thread(target=store.run, name="market-data-refresh", daemon=True).start()
+    return store
+
+
+def _fallback_rows(kind: str, tick: str) -> dict[int, dict]:
+    """FALLBACK_DATA of one ticker in the shape of a "prices"/"statements" snapshot."""
+    cols = ("_price",) if kind == "prices" else ("_netincome", "_revenue")
+    return {yr: {f"{tick}{sfx}": row[f"{tick}{sfx}"] for sfx in cols}
+            for yr, row in FALLBACK_DATA.items() if f"{tick}_price" in row}
+
+
+def fallback_datasets() -> list[str]:
+    """Annual datasets currently served from FALLBACK_DATA (no snapshot yet)."""
+    store = market_data_store()
+    return [name for name in _ALWAYS_WANTED if store.get(name) is None]
+
+
+def fetch_annual_history() -> pd.DataFrame:
+    """
+    REAL annual data for all TICKERS: stock price + net income + revenue,
+    assembled per ticker from the latest price and statement snapshots;
+    a missing snapshot is filled from FALLBACK_DATA for that ticker only.
+    Returns a DataFrame indexed by year with columns per ticker (empty while
+    no live snapshot exists at all).
+    """
+    store = market_data_store()
+    rows: dict[int, dict] = {}
+    live = False
+    for tick in TICKERS:
+        for kind in ("prices", "statements"):
+            part = store.get(f"{kind}:{tick}")
+            live |= part is not None
+            for yr, values in (part if part is not None else _fallback_rows(kind, tick)).items():
+                rows.setdefault(yr, {}).update(values)
+    if not live:
+        return pd.DataFrame()
 
     df = pd.DataFrame.from_dict(rows, orient="index").sort_index()
     df.index.name = "Jahr"
@@ -297,6 +978,23 @@ def fetch_annual_history() -> pd.DataFrame:
     return df
 
 
+# Engine time steps: label → steps per year
+TIME_STEPS = {"annual": 1, "quarterly": 4, "monthly": 12}
+
+
+def fetch_period_prices(steps_per_year: int) -> pd.DataFrame:
+    """
+    Sub-annual closing prices per ticker (quarterly or monthly bars).
+    Indexed by the decimal period start (2024.25 = Q2 2024, 2024 + 5/12 = June),
+    columns = tickers with a snapshot (the others keep their annual price).
+    """
+    if not YF_AVAILABLE or steps_per_year <= 1:
+        return pd.DataFrame()
+    store = market_data_store()
+    series = {tick: store.get(f"period_{steps_per_year}:{tick}") for tick in TICKERS}
+    return pd.DataFrame({tk: v for tk, v in series.items() if v is not None}).sort_index()
+
+
 # ── Fallback if yfinance completely fails ──
 _fb = {
     "BLK":  {2021: (727, 5.90e9, 19.37e9), 2022: (565, 5.18e9, 17.87e9), 2023: (736, 5.50e9, 17.86e9), 2024: (1049, 6.37e9, 20.41e9), 2025: (1056, 6.80e9, 21.50e9)},
@@ -314,13 +1012,12 @@ for _tick, _years in _fb.items():
         FALLBACK_DATA[_yr][f"{_tick}_revenue"]   = _rev
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
 def get_historical_data() -> pd.DataFrame:
-    """Get real historical data, fall back to hardcoded if yfinance fails."""
+    """Get real historical data (per-ticker fallback), hardcoded if nothing is live."""
     if YF_AVAILABLE:
         try:
             df = fetch_annual_history()
-            if df is not None and not df.empty and len(df) >= 3:
+            if not df.empty:
                 return df
         except Exception:
             pass
@@ -345,28 +1042,371 @@ def _available_tickers(df: pd.DataFrame) -> list[str]:
 #  Historical years: real data  |  Future years: projected + Flynn model
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def run_full_simulation(
-    hist_df: pd.DataFrame,
-    proj_years: int,
-    growth_rate: float,
-    gamma: float,
-    dr_0: float,
-    beta: float,
-    ehi_0: float,
-    hri_0: float,
-    iri_0: float,
-    q_b_share: float,
-    ext_degrad: float,
-) -> pd.DataFrame:
+# Extractive index decay per year: EHI degrades at the full rate, HRI/IRI slower;
+# no index ever falls below the floor.
+_EXT_DEGRAD_WEIGHTS = (1.0, 0.8, 0.5)
+_EXT_INDEX_FLOOR = 0.02
+
+
+def _step_rate(rate, dt: float):
+    """Annual relaxation rate → equivalent rate per step of `dt` years."""
+    return rate if dt == 1 else 1 - (1 - rate) ** dt
+
+
+# ── Model quantity graph ──
+# Every projection output is a node with its inputs and a rule evaluated
+# for all steps at once (arrays of shape (steps, *batch)). project_paths
+# computes only the requested outputs and what they depend on; the one
+# sequential part — the Flynn index recurrence — is a node of its own, so
+# extractive-only requests never run it. Names starting with "_" are
+# intermediates, everything else is a simulation column. Inputs list every
+# node and every path input (PATH_INPUTS) the rule reads, so the graph also
+# tells which quantities a changed parameter invalidates.
+_QUANTITIES: dict[str, tuple[tuple[str, ...], Callable[[dict], np.ndarray]]] = {}
+PATH_INPUTS = ("S", "Rev", "norm", "dt", "ehi_0", "hri_0", "iri_0", "gamma", "dr_0", "beta",
+               "q_b_share", "ext_degrad", "cum_ext_0")
+
+
+def _quantity(name: str, *inputs: str):
+    def register(rule):
+        _QUANTITIES[name] = (inputs, rule)
+        return rule
+    return register
+
+
+def _resolve_quantities(outputs) -> list[str]:
+    """Requested outputs plus their transitive inputs, in evaluation order."""
+    order: list[str] = []
+
+    def visit(name: str):
+        if name in order or name not in _QUANTITIES:
+            return
+        for dep in _QUANTITIES[name][0]:
+            visit(dep)
+        order.append(name)
+
+    for name in outputs:
+        if name.startswith("Ext. ") and name[5:] in EXT_CAT_NAMES:
+            name = "_ext_cats"
+        if name not in _QUANTITIES:
+            raise KeyError(f"unknown model quantity: {name!r}")
+        visit(name)
+    return order
+
+
+def _affected_quantities(changed) -> set[str]:
+    """Every quantity that (transitively) reads one of the `changed` inputs."""
+    affected = set(changed)
+    for name, (inputs, _) in _QUANTITIES.items():   # registration order is topological
+        if affected.intersection(inputs):
+            affected.add(name)
+    return affected - set(PATH_INPUTS)
+
+
+@_quantity("_e_idx", "ehi_0", "hri_0", "iri_0", "ext_degrad", "dt")
+def _q_e_idx(q):
+    # Extractive indices decay geometrically down to the floor (closed form)
+    steps = np.arange(1, q["n_steps"] + 1, dtype=float).reshape((-1,) + (1,) * len(q["batch"]))
+    deg = [(1 - np.asarray(q["ext_degrad"], dtype=float) * w) ** q["dt"] for w in _EXT_DEGRAD_WEIGHTS]
+    return np.stack([np.maximum(_EXT_INDEX_FLOOR, np.broadcast_to(q[k], q["batch"]) * d ** steps)
+                     for k, d in zip(("ehi_0", "hri_0", "iri_0"), deg)])
+
+
+_quantity("Ext. EHI", "_e_idx")(lambda q: q["_e_idx"][0])
+_quantity("Ext. HRI", "_e_idx")(lambda q: q["_e_idx"][1])
+_quantity("Ext. IRI", "_e_idx")(lambda q: q["_e_idx"][2])
+_quantity("_ext_cats", "_e_idx", "Rev")(lambda q: q["Rev"] * _ext_cost_share(q["_e_idx"]))
+_quantity("Ext. Externalities", "_e_idx", "Rev")(
+    lambda q: q["Rev"] * (_EXT_RATES.sum() - np.tensordot(_EXT_INDEX_W.sum(axis=0), q["_e_idx"], axes=1)))
+_quantity("Ext. True Value", "Ext. Externalities", "S")(lambda q: q["S"] - q["Ext. Externalities"])
+_quantity("Matrix-Kapital (Q)", "S")(lambda q: 0.5 * q["S"])
+_quantity("Flynn Retained", "Matrix-Kapital (Q)", "S")(lambda q: q["S"] - q["Matrix-Kapital (Q)"])
+
+
+def _flynn_recurrence(f0: np.ndarray, impact_b: np.ndarray, impact_h: np.ndarray,
+                      iri_regen: float, out: np.ndarray) -> np.ndarray:
     """
-    Build a complete timeline:
-    - PAST (historical): Real stock prices, net income, revenue
-    - FUTURE (projected): Extractive path (degradation) vs Flynn path (regeneration)
+    Reference path of the Flynn index recurrence: f0 (3, batch), impacts
+    (steps, batch), out (2, 3, steps, batch) — sequential in steps, batch
+    vectorized.
     """
-    records = []
+    f_ehi, f_hri, f_iri = f0
+    for i in range(impact_b.shape[0]):
+        out[0, :, i] = f_ehi, f_hri, f_iri
+        f_ehi = np.minimum(1.0, f_ehi + impact_b[i] * (1 - f_ehi))
+        f_hri = np.minimum(1.0, f_hri + impact_h[i] * (1 - f_hri))
+        f_iri = np.minimum(1.0, f_iri + iri_regen * (1 - f_iri))
+        out[1, :, i] = f_ehi, f_hri, f_iri
+    return out
+
+
+def _flynn_recurrence_loops(f0, impact_b, impact_h, iri_regen, out):
+    """The same recurrence as scalar loops, the form Numba compiles."""
+    n_steps, n = impact_b.shape
+    for j in range(n):
+        f_ehi, f_hri, f_iri = f0[0, j], f0[1, j], f0[2, j]
+        for i in range(n_steps):
+            out[0, 0, i, j], out[0, 1, i, j], out[0, 2, i, j] = f_ehi, f_hri, f_iri
+            # written as "1 if x > 1 else x" so NaN propagates as in np.minimum
+            x = f_ehi + impact_b[i, j] * (1 - f_ehi)
+            f_ehi = 1.0 if x > 1.0 else x
+            x = f_hri + impact_h[i, j] * (1 - f_hri)
+            f_hri = 1.0 if x > 1.0 else x
+            x = f_iri + iri_regen * (1 - f_iri)
+            f_iri = 1.0 if x > 1.0 else x
+            out[1, 0, i, j], out[1, 1, i, j], out[1, 2, i, j] = f_ehi, f_hri, f_iri
+    return out
+
+
+@st.cache_resource(show_spinner=False)
+def _jit_recurrence() -> Callable | None:
+    """
+    The compiled recurrence (once per process), or None without Numba. It
+    is only used if it reproduces the reference path bit for bit on a random
+    batch; otherwise (or if compiling fails) the NumPy path stays in charge.
+    """
+    if not JIT_ENABLED:
+        return None
+    try:
+        kernel = numba.njit(nogil=True)(_flynn_recurrence_loops)
+        rng = np.random.default_rng(0)
+        f0 = rng.uniform(0, 1, (3, 7))
+        impact_b, impact_h = rng.uniform(0, 0.2, (2, 40, 7))
+        want = _flynn_recurrence(f0, impact_b, impact_h, 0.008, np.empty((2, 3, 40, 7)))
+        got = kernel(f0, impact_b, impact_h, 0.008, np.empty((2, 3, 40, 7)))
+        return kernel if np.array_equal(want, got) else None
+    except Exception:
+        return None
+
+
+@_quantity("_f_idx", "Matrix-Kapital (Q)", "norm", "dt", "q_b_share", "ehi_0", "hri_0", "iri_0")
+def _q_f_idx(q):
+    """
+    Flynn indices per step, (2, 3, steps, *batch): [0] at the start of the
+    step (drives the dialysis rate), [1] after this step's regeneration.
+    """
+    Q, dt, norm = q["Matrix-Kapital (Q)"], q["dt"], q["norm"]
+    # Impact is defined on the annualized allocation (Q per step / dt)
+    impact_b = _step_rate(0.04 * np.log1p(np.maximum(q["q_b_share"] * Q, 0) / (norm * dt)), dt)
+    impact_h = _step_rate(0.04 * np.log1p(np.maximum((1 - q["q_b_share"]) * Q, 0) / (norm * dt)), dt)
+    iri_regen = _step_rate(0.008, dt)
+    f0 = np.stack([np.array(np.broadcast_to(q[k], q["batch"]), dtype=float)
+                   for k in ("ehi_0", "hri_0", "iri_0")])
+    kernel = _jit_recurrence()
+    if kernel is None:
+        return _flynn_recurrence(f0, impact_b, impact_h, iri_regen, np.empty((2, 3) + Q.shape))
+    # Compiled path on (steps, batch) flattened to 2-D
+    n_steps, size = Q.shape[0], int(np.prod(q["batch"], dtype=int))
+    flat = [np.ascontiguousarray(np.broadcast_to(a, Q.shape).reshape(n_steps, size))
+            for a in (impact_b, impact_h)]
+    out = kernel(f0.reshape(3, size), *flat, float(iri_regen), np.empty((2, 3, n_steps, size)))
+    return out.reshape((2, 3) + Q.shape)
+
+
+_quantity("Flynn EHI", "_f_idx")(lambda q: q["_f_idx"][1, 0])
+_quantity("Flynn HRI", "_f_idx")(lambda q: q["_f_idx"][1, 1])
+_quantity("Flynn IRI", "_f_idx")(lambda q: q["_f_idx"][1, 2])
+
+
+@_quantity("Dialyse-Rate (DR)", "_f_idx", "dr_0", "beta")
+def _q_dr(q):
+    f_ehi, f_hri, f_iri = q["_f_idx"][0]
+    return q["dr_0"] * (1 - q["beta"] * np.maximum(f_ehi, f_hri)) * f_iri
+
+
+@_quantity("Alpha", "Dialyse-Rate (DR)", "dr_0", "gamma")
+def _q_alpha(q):
+    dr_0 = np.asarray(q["dr_0"], dtype=float)
+    return np.where(dr_0 > 0, 1 + q["gamma"] * (q["Dialyse-Rate (DR)"] / np.where(dr_0 > 0, dr_0, 1.0)), 1.0)
+
+
+_quantity("Dialyse-Durchsatz", "Dialyse-Rate (DR)", "Matrix-Kapital (Q)")(
+    lambda q: q["Dialyse-Rate (DR)"] * q["Matrix-Kapital (Q)"])
+_quantity("Matrix-Metamorphose", "Alpha", "Matrix-Kapital (Q)")(
+    lambda q: q["Alpha"] * q["Matrix-Kapital (Q)"])
+
+
+@_quantity("MW_Total", "Matrix-Kapital (Q)", "_f_idx", "q_b_share")
+def _q_mw(q):
+    Q, f = q["Matrix-Kapital (Q)"], q["_f_idx"][1]
+    return q["q_b_share"] * Q * f[0] * 2.5 + (1 - q["q_b_share"]) * Q * f[1] * 2.5
+
+
+_quantity("Flynn Matrix Value", "Flynn Retained", "Matrix-Metamorphose", "MW_Total")(
+    lambda q: q["Flynn Retained"] + q["Matrix-Metamorphose"] + q["MW_Total"])
+_quantity("Delta (abs)", "Flynn Matrix Value", "Ext. True Value")(
+    lambda q: q["Flynn Matrix Value"] - q["Ext. True Value"])
+# % Vorteil bezogen auf Brutto-Surplus (S), NICHT auf ext_true!
+_quantity("Delta (%)", "Delta (abs)", "S")(lambda q: q["Delta (abs)"] / np.maximum(q["S"], 1) * 100)
+_quantity("Flynn Ext. Kosten", "_f_idx", "Rev")(
+    lambda q: q["Rev"] * (_EXT_RATES.sum() - np.tensordot(_EXT_INDEX_W.sum(axis=0), q["_f_idx"][1], axes=1)))
+_quantity("Flynn Jahres-Aufbau", "Matrix-Metamorphose", "Matrix-Kapital (Q)", "MW_Total")(
+    lambda q: (q["Matrix-Metamorphose"] - q["Matrix-Kapital (Q)"]) + q["MW_Total"])
+
+# ── Cumulative columns: the debt carried in from earlier phases is q["cum_ext_0"] ──
+_quantity("Ext. Kum. Externalities", "Ext. Externalities", "cum_ext_0")(
+    lambda q: q["cum_ext_0"] + np.cumsum(q["Ext. Externalities"], axis=0))
+_quantity("Ext. Kum. Wertvernichtung", "Ext. Kum. Externalities")(lambda q: -q["Ext. Kum. Externalities"])
+_quantity("Flynn Kum. Wertschoepfung", "Flynn Jahres-Aufbau")(
+    lambda q: np.cumsum(q["Flynn Jahres-Aufbau"], axis=0))
+_quantity("Kum. Schere (abs)", "Ext. Kum. Externalities", "Flynn Kum. Wertschoepfung")(
+    lambda q: q["Ext. Kum. Externalities"] + q["Flynn Kum. Wertschoepfung"])
+_quantity("Netto-Systemsaldo", "Ext. Kum. Externalities", "Flynn Kum. Wertschoepfung")(
+    lambda q: q["Flynn Kum. Wertschoepfung"] - q["Ext. Kum. Externalities"])
+
+CUMULATIVE_COLUMNS = ("Ext. Kum. Externalities", "Ext. Kum. Wertvernichtung",
+                      "Flynn Kum. Wertschoepfung", "Kum. Schere (abs)", "Netto-Systemsaldo")
+# Everything project_paths can return (per-step flows/levels and cumulative columns)
+PROJECTION_COLUMNS = tuple(
+    [k for k in _QUANTITIES if not k.startswith("_") and k not in CUMULATIVE_COLUMNS]
+    + [f"Ext. {c}" for c in EXT_CAT_NAMES] + list(CUMULATIVE_COLUMNS))
+
+
+def project_paths(
+    S: np.ndarray,
+    Rev: np.ndarray,
+    norm,
+    ehi_0, hri_0, iri_0,
+    gamma, dr_0, beta,
+    q_b_share, ext_degrad,
+    dt: float = 1.0,
+    outputs=None,
+    cum_ext_0=0.0,
+    memo: dict | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Vectorized Phase-2 kernel: extractive degradation + Flynn recurrence.
+    S, Rev have shape (steps, *batch); `norm` (the log1p impact scale,
+    last NI * 0.5 + 1) and all parameters broadcast against the batch shape,
+    so one call runs a whole set of companies or scenarios.
+    The recurrence is sequential in steps — only the batch axis is vectorized.
+
+    dt is the step length in years (1, 1/4, 1/12). S and Rev are flows per
+    step; the annual rates (degradation, index regeneration) are compounded
+    down to the step so that n steps of 1/n reproduce one annual step.
+
+    `outputs` names the columns wanted (default: all of PROJECTION_COLUMNS);
+    only those and their inputs in the quantity graph are evaluated. The
+    cumulative columns start from the debt `cum_ext_0`.
+
+    `memo` (a dict kept between calls, e.g. in session state) makes the call
+    incremental: inputs are diffed against the previous call and only the
+    quantities downstream of a changed one are recomputed, the rest is reused.
+    """
+    S = np.asarray(S, dtype=float)
+    Rev = np.asarray(Rev, dtype=float)
+    n_steps = S.shape[0]
+    batch = np.broadcast_shapes(
+        S.shape[1:], Rev.shape[1:], *(np.shape(p) for p in (
+            norm, ehi_0, hri_0, iri_0, gamma, dr_0, beta, q_b_share, ext_degrad, cum_ext_0)),
+    )
+
+    def _steps_by_batch(a):
+        # (steps, *b) → (steps, 1.., *b): batch dims are right-aligned like parameters
+        a = a.reshape((n_steps,) + (1,) * (len(batch) - a.ndim + 1) + a.shape[1:])
+        return np.broadcast_to(a, (n_steps,) + batch)
+
+    outputs = PROJECTION_COLUMNS if outputs is None else tuple(outputs)
+    q = dict(
+        S=_steps_by_batch(S), Rev=_steps_by_batch(Rev), norm=norm, dt=dt,
+        ehi_0=ehi_0, hri_0=hri_0, iri_0=iri_0, gamma=gamma, dr_0=dr_0, beta=beta,
+        q_b_share=q_b_share, ext_degrad=ext_degrad, cum_ext_0=cum_ext_0,
+        n_steps=n_steps, batch=batch,
+    )
+    reuse: dict[str, np.ndarray] = {}
+    if memo is not None:
+        prev = memo.get("inputs", {})
+        if prev.get("shape") == (n_steps,) + batch:
+            stale = _affected_quantities(k for k in PATH_INPUTS if not np.array_equal(prev[k], q[k]))
+            reuse = {k: v for k, v in memo.get("values", {}).items() if k not in stale}
+        memo["inputs"] = {k: q[k] for k in PATH_INPUTS}
+        memo["inputs"]["shape"] = (n_steps,) + batch
+        memo["values"] = reuse
+    for name in _resolve_quantities(outputs):
+        if name in reuse:
+            q[name] = reuse[name]
+            continue
+        q[name] = np.broadcast_to(_QUANTITIES[name][1](q), (n_steps,) + batch) \
+            if not name.startswith("_") else _QUANTITIES[name][1](q)
+        if memo is not None:
+            memo["values"][name] = q[name]
+
+    out = {}
+    for name in outputs:
+        if name.startswith("Ext. ") and name[5:] in EXT_CAT_NAMES:
+            out[name] = q["_ext_cats"][EXT_CAT_NAMES.index(name[5:])]
+        else:
+            out[name] = q[name]
+    return out
+
+
+def _accumulate_paths(cols: dict[str, np.ndarray], cum_ext_0: float) -> dict[str, np.ndarray]:
+    """Add the cumulative columns (debt carried in from earlier phases) in place."""
+    q = dict(cols, cum_ext_0=cum_ext_0)
+    for name in _resolve_quantities(CUMULATIVE_COLUMNS):
+        if name in CUMULATIVE_COLUMNS:
+            q[name] = cols[name] = _QUANTITIES[name][1](q)
+    return cols
+
+
+# Per-company series emitted in per-company mode as "{ticker} {series}"
+COMPANY_SERIES = [
+    "Ext. Externalities", "Flynn Ext. Kosten", "Flynn Jahres-Aufbau",
+    "Flynn Matrix Value", "Delta (abs)", "Flynn EHI", "Flynn HRI", "Flynn IRI",
+]
+
+# Columns that are flows per period (summed when periods are split or merged);
+# everything else is a level (index, price, rate, cumulative) and is sampled.
+_FLOW_SERIES = [
+    "Surplus (S)", "Revenue", "Ext. Marktwert", "Ext. Externalities", "Ext. True Value",
+    "Flynn Retained", "Matrix-Kapital (Q)", "Flynn Matrix Value", "MW_Total",
+    "Matrix-Metamorphose", "Dialyse-Durchsatz", "Delta (abs)", "Flynn Ext. Kosten",
+    "Flynn Jahres-Aufbau",
+]
+FLOW_COLUMNS = frozenset(
+    _FLOW_SERIES
+    + [f"Ext. {c}" for c in EXT_CAT_NAMES]
+    + [f"{tk} {s}" for tk in TICKERS for s in ("Net Income", "Revenue")]
+    + [f"{tk} {s}" for tk in TICKERS for s in COMPANY_SERIES if s in _FLOW_SERIES]
+)
+
+
+def _expand_periods(annual: dict[str, np.ndarray], steps_per_year: int,
+                    period_prices: pd.DataFrame | None = None) -> dict[str, np.ndarray]:
+    """
+    Split annual Retropolation/Historisch rows (column arrays) into sub-annual
+    periods: flows are spread evenly, levels repeat, cumulative debt is
+    re-accumulated per period, and real quarterly/monthly closes replace the
+    annual price wherever they were downloaded.
+    """
+    n = steps_per_year
+    out = {c: np.repeat(v, n) for c, v in annual.items()}
+    out["Jahr"] = out["Jahr"].astype(float) + np.tile(np.arange(n) / n, len(annual["Jahr"]))
+    for c in out:
+        if c in FLOW_COLUMNS:
+            out[c] = out[c] / n
+
+    cum = np.cumsum(out["Ext. Externalities"])
+    out["Ext. Kum. Externalities"] = cum
+    for col in ("Ext. Kum. Wertvernichtung", "Kum. Schere (abs)", "Netto-Systemsaldo"):
+        out[col] = -cum
+
+    if period_prices is not None and not period_prices.empty:
+        hist_rows = out["Phase"] == PHASES.index("Historisch")
+        keys = np.round(out["Jahr"], 4)
+        for tk in period_prices.columns:
+            col = f"{tk} Kurs"
+            if col in out:
+                bars = period_prices[tk].reindex(keys).ffill().to_numpy()
+                use = hist_rows & ~np.isnan(bars)
+                out[col] = np.where(use, bars, out[col])
+    return out
+
+
+def _projection_base(hist_df: pd.DataFrame) -> tuple[int, float, dict[str, float]]:
+    """Current year, its combined NI (projection base) and per-ticker NI shares."""
     hist_years = sorted(hist_df.index.tolist())
     current_year = hist_years[-1] if hist_years else 2025
-    first_real_year = hist_years[0] if hist_years else 2021
     last_ni = _sf(hist_df.loc[current_year, "Combined_NI"], 12e9) if current_year in hist_df.index else 12e9
     avail = _available_tickers(hist_df)
 
@@ -379,6 +1419,324 @@ def run_full_simulation(
         total_last += v
     for tk in avail:
         ni_shares[tk] = ni_shares[tk] / total_last if total_last else 1.0 / len(avail)
+    return current_year, last_ni, ni_shares
+
+
+PHASES = ("Retropolation", "Historisch", "Projektion")
+
+
+class _TrackedRow(dict):
+    """SimResult.row() of a tracked result: records the keys looked up."""
+
+    def __init__(self, values: dict, reads: set):
+        super().__init__(values)
+        self.reads = reads
+
+    def __getitem__(self, key):
+        self.reads.add(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.reads.add(key)
+        return super().get(key, default)
+
+
+class SimResult:
+    """
+    Simulation timeline backed by one contiguous float64 block (one row per
+    series, so every series is a contiguous array) and int8 phase codes.
+
+    res["Ext. EHI"]      → the series (array view); res["Phase"] → labels
+    res[mask], res[a:b]  → a row subset sharing the same columns
+    res.row(i)           → one period as {column: value}
+    res.to_pandas()      → DataFrame view, built only for tables and exports
+    res.tracked()        → same data, recording which columns get read
+    """
+    __slots__ = ("columns", "data", "phase_codes", "_pos", "reads")
+
+    def __init__(self, columns, data: np.ndarray, phase_codes: np.ndarray, reads: set | None = None):
+        self.columns = tuple(columns)       # display order, "Phase" included
+        self.data = data                    # (numeric columns, rows)
+        self.phase_codes = phase_codes      # (rows,) index into PHASES
+        self._pos = {c: i for i, c in enumerate(c for c in self.columns if c != "Phase")}
+        self.reads = reads                  # columns read so far (None: not tracked)
+
+    @classmethod
+    def from_columns(cls, cols: dict[str, np.ndarray]) -> "SimResult":
+        """Pack column arrays (with "Phase" as codes) into one block."""
+        names = [c for c in cols if c != "Phase"]
+        data = np.empty((len(names), len(cols["Phase"])))
+        for i, c in enumerate(names):
+            data[i] = cols[c]
+        return cls(cols.keys(), data, np.asarray(cols["Phase"], dtype=np.int8))
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if self.reads is not None:
+                self.reads.add(key)
+            if key == "Phase":
+                return np.array(PHASES, dtype=object)[self.phase_codes]
+            return self.data[self._pos[key]]
+        return SimResult(self.columns, self.data[:, key], self.phase_codes[key], self.reads)
+
+    def __len__(self) -> int:
+        return len(self.phase_codes)
+
+    def __contains__(self, name: str) -> bool:
+        return name == "Phase" or name in self._pos
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + self.phase_codes.nbytes
+
+    def phase_mask(self, *phases: str) -> np.ndarray:
+        return np.isin(self.phase_codes, [PHASES.index(p) for p in phases])
+
+    def row(self, i: int) -> dict:
+        out = {c: float(v) for c, v in zip(self._pos, self.data[:, i])}
+        out["Phase"] = PHASES[self.phase_codes[i]]
+        return out if self.reads is None else _TrackedRow(out, self.reads)
+
+    def to_pandas(self, columns=None) -> pd.DataFrame:
+        out = {}
+        for c in columns or self.columns:
+            out[c] = self[c].astype(str) if c == "Phase" else self[c]
+        if "Jahr" in out:
+            out["Jahr"] = self.years()
+        return pd.DataFrame(out)
+
+    def years(self) -> np.ndarray:
+        """"Jahr" as integers for annual timelines, decimal period starts otherwise."""
+        jahr = self["Jahr"]
+        return jahr.astype(np.int64) if np.all(jahr == np.round(jahr)) else jahr
+
+    def tracked(self) -> "SimResult":
+        return SimResult(self.columns, self.data, self.phase_codes, set())
+
+    def fingerprint(self, columns) -> str:
+        """Digest of the row layout, the column set and the values of `columns`."""
+        h = hashlib.blake2b(repr(self.columns).encode())
+        h.update(self.phase_codes.tobytes())
+        for c in sorted(columns):
+            if c != "Phase":
+                h.update(c.encode())
+                h.update(self.data[self._pos[c]].tobytes())
+        return h.hexdigest()
+
+
+# ── Compact storage of results at rest (shared cache) ──
+# FLYNN_COMPACT=1 stores every column of a cached SimResult in the smallest
+# form that keeps it within _COMPACT_RTOL of its own magnitude:
+#   const   one value for the whole column (series that never move)
+#   sparse  positions + values of the rows that differ from a fill of 0 or
+#           NaN (projection-only series on the past rows and vice versa,
+#           the zero-filled retropolation fields)
+#   float32 / float64   dense, float32 where the round trip is close enough
+# Phase stays int8 codes (a categorical). Results are unpacked to the
+# float64 block on read, so the engine and the charts never see the packing.
+COMPACT = bool(os.environ.get("FLYNN_COMPACT"))
+_COMPACT_RTOL = 1e-6
+
+
+def _pack_column(x: np.ndarray, rtol: float) -> tuple:
+    finite = np.isfinite(x)
+    if (x == x[0]).all() or not finite.any():
+        return ("const", x[0] if len(x) else np.nan)
+    fill = 0.0 if np.count_nonzero(x == 0) >= np.count_nonzero(~finite) else np.nan
+    keep = ~np.isnan(x) if np.isnan(fill) else x != 0
+    values = x[keep]
+    x32 = values.astype(np.float32)
+    scale = np.abs(values[np.isfinite(values)]).max(initial=0.0)
+    if np.all((np.abs(x32 - values) <= rtol * scale) | ~np.isfinite(values)):
+        values = x32
+    if np.count_nonzero(keep) * (4 + values.itemsize) < len(x) * values.itemsize:
+        return ("sparse", fill, np.flatnonzero(keep).astype(np.int32), values)
+    if values.dtype == np.float32:
+        return ("float32", x.astype(np.float32))
+    return ("float64", x)
+
+
+def pack_result(res: SimResult, rtol: float = _COMPACT_RTOL) -> dict:
+    """Column-wise compact form of `res` (see above); unpack_result restores it."""
+    return {"columns": res.columns, "phase": res.phase_codes, "rows": len(res),
+            "cols": [_pack_column(res.data[i], rtol) for i in range(len(res.data))]}
+
+
+def unpack_result(packed: dict) -> SimResult:
+    data = np.empty((len(packed["cols"]), packed["rows"]))
+    for row, col in zip(data, packed["cols"]):
+        if col[0] == "const":
+            row[:] = col[1]
+        elif col[0] == "sparse":
+            row[:] = col[1]
+            row[col[2]] = col[3]
+        else:
+            row[:] = col[1]
+    return SimResult(packed["columns"], data, packed["phase"])
+
+
+def memory_report(res: SimResult, rtol: float = _COMPACT_RTOL) -> pd.DataFrame:
+    """
+    Per storage kind: columns, bytes in memory vs packed, worst relative error.
+    The last row ("stored") compares the blobs the shared cache actually keeps
+    for the plain and the packed form, after pickling and zlib.
+    """
+    packed = pack_result(res, rtol)
+    restored = unpack_result(packed).data
+    rows = []
+    for name, col, x, y in zip(res._pos, packed["cols"], res.data, restored):
+        both = np.isfinite(x)
+        scale = np.abs(x[both]).max(initial=0.0)
+        err = np.abs(x[both] - y[both]).max(initial=0.0) / scale if scale else 0.0
+        rows.append((col[0], name, x.nbytes, sum(getattr(a, "nbytes", 8) for a in col[1:]), err))
+    df = pd.DataFrame(rows, columns=["storage", "column", "dense_bytes", "packed_bytes", "max_rel_error"])
+    out = df.groupby("storage").agg(columns=("column", "size"), dense_bytes=("dense_bytes", "sum"),
+                                    packed_bytes=("packed_bytes", "sum"),
+                                    max_rel_error=("max_rel_error", "max")).reset_index()
+    extra = pd.DataFrame([
+        (f"phase ({res.phase_codes.dtype})", 1, res.phase_codes.nbytes, packed["phase"].nbytes, 0.0),
+        ("stored", len(res.data), len(_encode((res.columns, res.data, res.phase_codes))),
+         len(_encode(packed)), df["max_rel_error"].max()),
+    ], columns=out.columns)
+    return pd.concat([out, extra], ignore_index=True)
+
+
+def _company_bases(hist_df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Per-ticker projection base (last NI) and own Revenue/NI ratio, in TICKERS order."""
+    current_year, last_ni, _ = _projection_base(hist_df)
+    avail = _available_tickers(hist_df)
+    last_row = hist_df.loc[current_year]
+    comb_rev_last = _sf(last_row.get("Combined_Revenue", 0))
+    comb_ratio = comb_rev_last / last_ni if last_ni > 0 and comb_rev_last > 0 else 3.2
+    ni_c = np.array([_sf(last_row.get(f"{tk}_netincome", 0)) if tk in avail
+                     else last_ni * 0.2 for tk in TICKERS])
+    rev_c = np.array([_sf(last_row.get(f"{tk}_revenue", 0)) for tk in TICKERS])
+    ratio_c = np.where((ni_c > 0) & (rev_c > 0), rev_c / np.where(ni_c > 0, ni_c, 1), comb_ratio)
+    return ni_c, ratio_c
+
+
+# ── Closed form of the extractive path ──
+# Without Flynn feedback every extractive quantity is explicit in the 1-based
+# projection step i (n steps per year, growth q = (1+g)^(1/n) per step):
+#   S_i = S_0 · q^i / n,   Rev_i = Rev_0 · q^i / n
+#   e_k,i = max(floor, e_k,0 · d_k^i),   d_k = (1 - w_k · degrad)^(1/n)
+#   Ext_i = Rev_i · Σ_c rate_c · (1 - e_idx(c),i)
+# Running totals are geometric series, split at the step where each index
+# reaches its floor — any year and any horizon cost O(1).
+
+def _geom_sum(r, lo, hi):
+    """Σ r^i for i = lo..hi (0 where hi < lo); arguments broadcast."""
+    r = np.asarray(r, dtype=float)
+    lo = np.asarray(lo, dtype=float)
+    count = np.maximum(np.asarray(hi, dtype=float) - lo + 1, 0)
+    unit = np.abs(r - 1) < 1e-12
+    r_safe = np.where(unit, 2.0, r)
+    with np.errstate(over="ignore", invalid="ignore"):
+        series = r_safe ** lo * (1 - r_safe ** count) / (1 - r_safe)
+    return np.where(count > 0, np.where(unit, count * r ** lo, series), 0.0)
+
+
+def _floor_step(e_0, d):
+    """Last step at which e_0 · d^i is still above the index floor (inf if d ≥ 1)."""
+    e_0, d = np.asarray(e_0, dtype=float), np.asarray(d, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m = np.floor(np.log(_EXT_INDEX_FLOOR / e_0) / np.log(d))
+    return np.where(e_0 <= _EXT_INDEX_FLOOR, 0.0, np.where(d >= 1, np.inf, np.maximum(m, 0)))
+
+
+def _extractive_decay(ext_degrad, steps_per_year: int) -> list:
+    return [(1 - np.asarray(ext_degrad, dtype=float) * w) ** (1 / steps_per_year)
+            for w in _EXT_DEGRAD_WEIGHTS]
+
+
+def extractive_base(hist_df: pd.DataFrame, per_company: bool = False) -> tuple[float, float]:
+    """Annual surplus and revenue at projection year 0, as run_full_simulation uses them."""
+    _, last_ni, ni_shares = _projection_base(hist_df)
+    if per_company:
+        ni_c, ratio_c = _company_bases(hist_df)
+        return float(ni_c.sum()), float((ni_c * ratio_c).sum())
+    return last_ni, last_ni * 3.2 * sum(ni_shares.get(tk, 0.2) for tk in TICKERS)
+
+
+def extractive_at(
+    step, S_0: float, Rev_0: float,
+    growth_rate, ehi_0, hri_0, iri_0, ext_degrad,
+    steps_per_year: int = 1,
+) -> dict[str, np.ndarray]:
+    """
+    Extractive-path values at projection step(s) `step` (1-based; step i of
+    n per year covers year current_year + (i-1)/n) without the recurrence.
+    Keys match the simulation columns; `step` may be any array shape.
+    """
+    n = steps_per_year
+    i = np.asarray(step, dtype=float)
+    growth = (1 + np.asarray(growth_rate, dtype=float)) ** (i / n) / n
+    S, Rev = S_0 * growth, Rev_0 * growth
+    e_idx = [np.maximum(_EXT_INDEX_FLOOR, np.asarray(e_0, dtype=float) * d ** i)
+             for e_0, d in zip((ehi_0, hri_0, iri_0), _extractive_decay(ext_degrad, n))]
+    out = {"Surplus (S)": S, "Revenue": Rev,
+           "Ext. EHI": e_idx[0], "Ext. HRI": e_idx[1], "Ext. IRI": e_idx[2]}
+    cats = Rev * _ext_cost_share(np.stack(np.broadcast_arrays(*e_idx)))
+    for k, cat_name in enumerate(EXT_CAT_NAMES):
+        out[f"Ext. {cat_name}"] = cats[k]
+    ext = cats.sum(axis=0)
+    out["Ext. Externalities"] = ext
+    out["Ext. True Value"] = S - ext
+    return out
+
+
+def extractive_totals(
+    n_steps, S_0: float, Rev_0: float,
+    growth_rate, ehi_0, hri_0, iri_0, ext_degrad,
+    steps_per_year: int = 1, cum_ext_0: float = 0.0,
+) -> dict[str, np.ndarray]:
+    """
+    Sums of the extractive flows over projection steps 1..n_steps as closed
+    geometric series; "Ext. Kum. Externalities" adds the debt carried in.
+    """
+    n = steps_per_year
+    N = np.asarray(n_steps, dtype=float)
+    q = (1 + np.asarray(growth_rate, dtype=float)) ** (1 / n)
+    sum_q = _geom_sum(q, 1, N)
+    # Σ Rev_i·e_k,i: geometric in q·d_k up to the floor step, then floor · Σ q^i
+    weighted = 0.0
+    for k, (e_0, d) in enumerate(zip((ehi_0, hri_0, iri_0), _extractive_decay(ext_degrad, n))):
+        m = np.minimum(N, _floor_step(e_0, d))
+        rate_k = _EXT_INDEX_W[:, k].sum()
+        weighted = weighted + rate_k * (
+            np.asarray(e_0, dtype=float) * _geom_sum(q * d, 1, m)
+            + _EXT_INDEX_FLOOR * _geom_sum(q, m + 1, N))
+    total_S = S_0 * sum_q / n
+    total_ext = Rev_0 / n * (_EXT_RATES.sum() * sum_q - weighted)
+    return {
+        "Surplus (S)": total_S, "Revenue": Rev_0 * sum_q / n,
+        "Ext. Externalities": total_ext, "Ext. True Value": total_S - total_ext,
+        "Ext. Kum. Externalities": cum_ext_0 + total_ext,
+    }
+
+
+CENTURY_YEARS = 100   # horizon of the closed-form long-run KPI
+
+
+def _past_timeline(
+    hist_df: pd.DataFrame,
+    ehi_0: float, hri_0: float, iri_0: float,
+    per_company: bool, steps_per_year: int,
+    period_prices: pd.DataFrame | None,
+) -> tuple[dict[str, np.ndarray], float]:
+    """
+    Retropolation and historical phases of run_full_simulation as column
+    arrays ("Phase" as codes), plus the externality debt carried into the
+    projection. Depends only on the history and the start indices.
+    """
+    records = []
+    hist_years = sorted(hist_df.index.tolist())
+    first_real_year = hist_years[0] if hist_years else 2021
+    current_year = hist_years[-1] if hist_years else 2025
 
     # ═══════════════════════════════════════════════
     #  PHASE 0: Retropolation (1996 – year before real data)
@@ -387,10 +1745,17 @@ def run_full_simulation(
     #  The cancer didn't start in 2021 — it started DECADES ago.
     # ═══════════════════════════════════════════════
     cum_ext_cost = 0.0
-    cum_flynn_created = 0.0
+    ext_cols = [f"Ext. {c}" for c in EXT_CAT_NAMES]
 
     retro_years = sorted([y for y in _RETRO_COMBINED_REVENUE if y < first_real_year])
-    for yr in retro_years:
+    # Indices were WORSE in the past (less ESG, less regulation): worse the further back
+    years_ago = current_year - np.array(retro_years, dtype=float)
+    retro_idx = np.maximum(np.array(_RETRO_FLOORS)[:, None],
+                           np.array([ehi_0, hri_0, iri_0])[:, None] - np.array(_RETRO_SLOPES)[:, None] * years_ago)
+    # Externalities from estimated revenue — all categories and years in one product
+    retro_revs = np.array([_RETRO_COMBINED_REVENUE[yr] for yr in retro_years], dtype=float)
+    retro_cats = (retro_revs * _ext_cost_share(retro_idx)).T
+    for j, yr in enumerate(retro_years):
         retro_rev = _RETRO_COMBINED_REVENUE[yr]
         rec: dict = {"Jahr": yr, "Phase": "Retropolation"}
 
@@ -400,22 +1765,15 @@ def run_full_simulation(
             rec[f"{tk} Net Income"] = 0
             rec[f"{tk} Revenue"] = retro_rev / len(TICKERS)
 
-        # Externalities from estimated revenue
-        # Indices were WORSE in the past (less ESG, less regulation)
-        years_ago = current_year - yr
-        retro_ehi = max(0.10, ehi_0 - 0.005 * years_ago)  # worse the further back
-        retro_hri = max(0.15, hri_0 - 0.004 * years_ago)
-        retro_iri = max(0.20, iri_0 - 0.003 * years_ago)
-        idx_map_retro = {"ehi": retro_ehi, "hri": retro_hri, "iri": retro_iri}
-
-        retro_ext_cost = 0.0
-        for cat_name, cat_cfg in EXT_CATEGORIES.items():
-            cat_cost = cat_cfg["rate"] * retro_rev * (1 - idx_map_retro[cat_cfg["index"]])
-            rec[f"Ext. {cat_name}"] = cat_cost
-            retro_ext_cost += cat_cost
+        retro_ehi, retro_hri, retro_iri = retro_idx[:, j].tolist()
+        rec.update(zip(ext_cols, retro_cats[j].tolist()))
+        retro_ext_cost = float(retro_cats[j].sum())
 
         cum_ext_cost += retro_ext_cost
         retro_ni_est = retro_rev * 0.15  # rough NI/Rev ratio
+        if per_company:
+            for tk in TICKERS:
+                rec[f"{tk} Ext. Externalities"] = retro_ext_cost / len(TICKERS)
 
         rec.update({
             "Surplus (S)": retro_ni_est, "Revenue": retro_rev,
@@ -445,6 +1803,7 @@ def run_full_simulation(
     #  Flynn did NOT exist yet → no value creation
     # ═══════════════════════════════════════════════
     # cum_ext_cost already seeded from Phase 0 retropolation!
+    hist_share = _ext_cost_share(np.array([ehi_0, hri_0, iri_0]))  # constant indices → one product
 
     for yr in hist_years:
         row = hist_df.loc[yr]
@@ -464,15 +1823,15 @@ def run_full_simulation(
 
         # ── Historical externalities from REAL Revenue ──
         # The cancer was ALREADY growing before Flynn existed
-        idx_map_hist = {"ehi": ehi_0, "hri": hri_0, "iri": iri_0}
-        hist_ext_cost = 0.0
-        for cat_name, cat_cfg in EXT_CATEGORIES.items():
-            cat_cost = cat_cfg["rate"] * comb_rev * (1 - idx_map_hist[cat_cfg["index"]])
-            rec[f"Ext. {cat_name}"] = cat_cost
-            hist_ext_cost += cat_cost
+        hist_cats = comb_rev * hist_share
+        rec.update(zip(ext_cols, hist_cats.tolist()))
+        hist_ext_cost = float(hist_cats.sum())
 
         # ACCUMULATE — even in the past!
         cum_ext_cost += hist_ext_cost
+        if per_company:
+            for tk in TICKERS:
+                rec[f"{tk} Ext. Externalities"] = float(hist_share.sum() * rec[f"{tk} Revenue"])
 
         rec.update({
             "Surplus (S)": comb_ni, "Revenue": comb_rev,
@@ -495,108 +1854,737 @@ def run_full_simulation(
         })
         records.append(rec)
 
+    past = {
+        c: np.array([PHASES.index(rec[c]) for rec in records], dtype=np.int8) if c == "Phase"
+        else np.array([rec[c] for rec in records], dtype=float)
+        for c in records[0]
+    } if records else {}
+    if steps_per_year > 1 and past:
+        past = _expand_periods(past, steps_per_year, period_prices)
+        cum_ext_cost = float(past["Ext. Kum. Externalities"][-1])
+    return past, cum_ext_cost
+
+
+def _frame_key(df: pd.DataFrame | None):
+    """Content fingerprint of a (small) input frame, for memo keys."""
+    if df is None:
+        return None
+    return tuple(df.columns), hashlib.blake2b(pd.util.hash_pandas_object(df).to_numpy().tobytes()).hexdigest()
+
+
+def run_full_simulation(
+    hist_df: pd.DataFrame,
+    proj_years: int,
+    growth_rate: float,
+    gamma: float,
+    dr_0: float,
+    beta: float,
+    ehi_0: float,
+    hri_0: float,
+    iri_0: float,
+    q_b_share: float,
+    ext_degrad: float,
+    per_company: bool = False,
+    steps_per_year: int = 1,
+    period_prices: pd.DataFrame | None = None,
+    columns=None,
+    memo: dict | None = None,
+) -> SimResult:
+    """
+    Build a complete timeline:
+    - PAST (historical): Real stock prices, net income, revenue
+    - FUTURE (projected): Extractive path (degradation) vs Flynn path (regeneration)
+
+    per_company=True runs the projection separately for every ticker (own NI,
+    own Revenue/NI ratio, own Flynn indices) in one vectorized pass, aggregates
+    the result into the combined columns and adds "{ticker} {series}" columns.
+
+    steps_per_year > 1 (quarterly/monthly) splits every year into periods:
+    history is spread over the periods (with real sub-annual closes from
+    `period_prices` where available), the projection runs proj_years *
+    steps_per_year kernel steps with rates rescaled to the step length.
+    "Jahr" then holds the decimal period start and flows are per period.
+
+    `columns` restricts the result to those columns (plus Jahr and Phase);
+    the projection kernel then only evaluates what they depend on.
+
+    `memo` (a dict kept across reruns) turns a call into an incremental
+    update of the previous one: the past phases are reused while the start
+    indices are unchanged, and the kernel recomputes only the quantities
+    downstream of the parameters that changed.
+    """
+    current_year, last_ni, ni_shares = _projection_base(hist_df)
+    n = max(1, int(steps_per_year))
+    # Phases 0–1 only depend on the history and the start indices: reused from
+    # `memo` as long as those are unchanged
+    past_key = (ehi_0, hri_0, iri_0, per_company, n, _frame_key(hist_df), _frame_key(period_prices))
+    if memo is not None and memo.get("past_key") == past_key:
+        past, cum_ext_cost = memo["past"]
+    else:
+        past, cum_ext_cost = _past_timeline(hist_df, ehi_0, hri_0, iri_0, per_company, n, period_prices)
+        if memo is not None:
+            memo.update(past_key=past_key, past=(past, cum_ext_cost))
+
     # ═══════════════════════════════════════════════
     #  PHASE 2: Projected future years
     #  cum_ext_cost ALREADY carries the historical debt!
     #  Flynn starts NOW — but the damage is already done.
     # ═══════════════════════════════════════════════
-    f_ehi, f_hri, f_iri = ehi_0, hri_0, iri_0
-    e_ehi, e_hri, e_iri = ehi_0, hri_0, iri_0
-    # cum_ext_cost already seeded from historical years!
-    # cum_flynn_created starts at 0 — Flynn begins now
-
-    for i in range(1, proj_years + 1):
-        yr = current_year + i
-        S = last_ni * ((1 + growth_rate) ** i)
-        rec: dict = {"Jahr": yr, "Phase": "Projektion"}
+    steps = np.arange(1, proj_years * n + 1)
+    t_years = steps / n if n > 1 else steps   # elapsed years at the end of each step
+    growth = (1 + growth_rate) ** t_years / n  # per-step share of the annual surplus
+    proj: dict[str, np.ndarray] = {
+        "Jahr": current_year + 1 + (steps - 1) / n if n > 1 else current_year + steps,
+        "Phase": np.full(len(steps), PHASES.index("Projektion"), dtype=np.int8),
+    }
 
-        # Per-ticker projected prices & NI
+    # Per-ticker projected prices & NI
+    for tk in TICKERS:
+        base_p = float(hist_df.loc[current_year].get(f"{tk}_price", 50) or 50)
+        proj[f"{tk} Kurs"] = base_p * ((1 + growth_rate * 0.6) ** t_years)
+
+    if per_company:
+        # ── One batch column per ticker: own NI base, own Revenue/NI ratio ──
+        ni_c, ratio_c = _company_bases(hist_df)
+        S_c = growth[:, None] * ni_c
+        Rev_c = S_c * ratio_c
+        # The aggregation below needs most series, so every per-step column is computed
+        cols = project_paths(
+            S_c, Rev_c, np.maximum(ni_c, 0) * 0.5 + 1,
+            ehi_0, hri_0, iri_0, gamma, dr_0, beta, q_b_share, ext_degrad, dt=1 / n,
+            outputs=[c for c in PROJECTION_COLUMNS if c not in CUMULATIVE_COLUMNS],
+            memo=None if memo is None else memo.setdefault("paths", {}),
+        )
+        for j, tk in enumerate(TICKERS):
+            proj[f"{tk} Net Income"] = S_c[:, j]
+            proj[f"{tk} Revenue"] = Rev_c[:, j]
+
+        # ── Aggregate: flows add up, indices/rates are revenue- or Q-weighted ──
+        S = S_c.sum(axis=1)
+        Rev = Rev_c.sum(axis=1)
+        w_rev = Rev_c / np.where(Rev > 0, Rev, 1)[:, None]
+        Q = cols["Matrix-Kapital (Q)"].sum(axis=1)
+        Q_safe = np.where(Q != 0, Q, 1)
+        agg = {k: v.sum(axis=1) for k, v in cols.items()}
+        for idx_name in ("EHI", "HRI", "IRI"):
+            agg[f"Ext. {idx_name}"] = (cols[f"Ext. {idx_name}"] * w_rev).sum(axis=1)
+            agg[f"Flynn {idx_name}"] = (cols[f"Flynn {idx_name}"] * w_rev).sum(axis=1)
+        agg["Dialyse-Rate (DR)"] = agg["Dialyse-Durchsatz"] / Q_safe
+        agg["Alpha"] = agg["Matrix-Metamorphose"] / Q_safe
+        agg["Delta (%)"] = agg["Delta (abs)"] / np.maximum(S, 1) * 100
+        company_cols = {f"{tk} {series}": cols[series][:, j]
+                        for series in COMPANY_SERIES for j, tk in enumerate(TICKERS)}
+        # ── CUMULATIVE: the cancer that never heals ──
+        cols = _accumulate_paths(agg, cum_ext_cost)
+    else:
+        S = last_ni * growth
         for tk in TICKERS:
-            base_p = float(hist_df.loc[current_year].get(f"{tk}_price", 50) or 50)
-            rec[f"{tk} Kurs"]      = base_p * ((1 + growth_rate * 0.6) ** i)
-            rec[f"{tk} Net Income"] = S * ni_shares.get(tk, 0.2)
-            rec[f"{tk} Revenue"]    = S * ni_shares.get(tk, 0.2) * 3.2
-
+            proj[f"{tk} Net Income"] = S * ni_shares.get(tk, 0.2)
+            proj[f"{tk} Revenue"] = S * ni_shares.get(tk, 0.2) * 3.2
         # ── Total Revenue for externality base ──
-        Rev = sum(rec.get(f"{tk} Revenue", 0) for tk in TICKERS)
-
-        # ── EXTRACTIVE PATH ──
-        ext_retained = S
-        e_ehi = max(0.02, e_ehi * (1 - ext_degrad))
-        e_hri = max(0.02, e_hri * (1 - ext_degrad * 0.8))
-        e_iri = max(0.02, e_iri * (1 - ext_degrad * 0.5))
-
-        # ── Per-category externality costs (based on REVENUE!) ──
-        idx_map = {"ehi": e_ehi, "hri": e_hri, "iri": e_iri}
-        ext_cost = 0.0
-        for cat_name, cat_cfg in EXT_CATEGORIES.items():
-            cat_cost = cat_cfg["rate"] * Rev * (1 - idx_map[cat_cfg["index"]])
-            rec[f"Ext. {cat_name}"] = cat_cost
-            ext_cost += cat_cost
-        ext_true = ext_retained - ext_cost
-
-        # ── FLYNN PATH ──
-        Q = 0.5 * S
-        f_retained = S - Q
-        DR = dr_0 * (1 - beta * max(f_ehi, f_hri)) * f_iri
-        dialysis_flow = DR * Q
-        alpha = 1 + gamma * (DR / dr_0) if dr_0 > 0 else 1
-        MQ = alpha * Q
-        Q_B = q_b_share * Q
-        Q_H = (1 - q_b_share) * Q
-
-        impact_b = 0.04 * math.log1p(Q_B / (last_ni * 0.5 + 1))
-        impact_h = 0.04 * math.log1p(Q_H / (last_ni * 0.5 + 1))
-        f_ehi = min(1.0, f_ehi + impact_b * (1 - f_ehi))
-        f_hri = min(1.0, f_hri + impact_h * (1 - f_hri))
-        f_iri = min(1.0, f_iri + 0.008 * (1 - f_iri))
-
-        MW_B = Q_B * f_ehi * 2.5
-        MW_H = Q_H * f_hri * 2.5
-        MW_total = MW_B + MW_H
-        flynn_value = f_retained + MQ + MW_total
-
-        delta_abs = flynn_value - ext_true
-        # % Vorteil bezogen auf Brutto-Surplus (S), NICHT auf ext_true!
-        # Wenn ext_true negativ ist (Externalitaeten > NI), waere Division unsinnig.
-        delta_pct = (delta_abs / max(ext_retained, 1)) * 100
-
-        # ── Flynn-path externalities (using improved Flynn indices) ──
-        f_idx_map = {"ehi": f_ehi, "hri": f_hri, "iri": f_iri}
-        flynn_ext_cost = sum(
-            cfg["rate"] * Rev * (1 - f_idx_map[cfg["index"]])
-            for cfg in EXT_CATEGORIES.values()
+        Rev = sum(proj[f"{tk} Revenue"] for tk in TICKERS)
+        # ── CUMULATIVE: the cancer that never heals (cum_ext_cost seeds the kernel) ──
+        cols = project_paths(
+            S, Rev, last_ni * 0.5 + 1,
+            ehi_0, hri_0, iri_0, gamma, dr_0, beta, q_b_share, ext_degrad, dt=1 / n,
+            outputs=None if columns is None else [c for c in columns if c in PROJECTION_COLUMNS],
+            cum_ext_0=cum_ext_cost,
+            memo=None if memo is None else memo.setdefault("paths", {}),
         )
-        flynn_jahres_aufbau = (MQ - Q) + MW_total
+        company_cols = {}
 
-        # ── CUMULATIVE: the cancer that never heals ──
-        cum_ext_cost += ext_cost           # externalities pile up EVERY year
-        cum_flynn_created += flynn_jahres_aufbau  # net value Flynn creates above baseline
-        cum_schere = cum_ext_cost + cum_flynn_created  # total gap between systems
+    proj.update({"Surplus (S)": S, "Revenue": Rev, "Ext. Marktwert": S})
+    proj.update({k: v for k, v in cols.items() if k not in proj})
+    proj.update(company_cols)
 
-        rec.update({
-            "Surplus (S)": S,
-            "Revenue": Rev,
-            "Ext. Marktwert": ext_retained, "Ext. Externalities": ext_cost,
-            "Ext. True Value": ext_true,
-            "Ext. Kum. Externalities": cum_ext_cost,
-            "Ext. Kum. Wertvernichtung": -cum_ext_cost,   # negative: the debt
-            "Ext. EHI": e_ehi, "Ext. HRI": e_hri, "Ext. IRI": e_iri,
-            "Flynn Retained": f_retained, "Matrix-Kapital (Q)": Q,
-            "Flynn Matrix Value": flynn_value,
-            "Flynn Kum. Wertschoepfung": cum_flynn_created,
-            "Flynn EHI": f_ehi, "Flynn HRI": f_hri, "Flynn IRI": f_iri,
-            "MW_Total": MW_total, "Matrix-Metamorphose": MQ,
-            "Dialyse-Durchsatz": dialysis_flow, "Dialyse-Rate (DR)": DR,
-            "Alpha": alpha, "Delta (abs)": delta_abs, "Delta (%)": delta_pct,
-            "Kum. Schere (abs)": cum_schere,
-            "Flynn Ext. Kosten": flynn_ext_cost,
-            "Flynn Jahres-Aufbau": flynn_jahres_aufbau,
-            "Netto-Systemsaldo": cum_flynn_created - cum_ext_cost,
-        })
-        records.append(rec)
+    # Past columns first, then projection-only ones; gaps are NaN (as in a frame concat)
+    n_past = len(past.get("Phase", ()))
+    gap = np.full(n_past, np.nan)
+    names = list(past) + [c for c in proj if c not in past]
+    if columns is not None:
+        names = [c for c in names if c in ("Jahr", "Phase") or c in columns]
+    return SimResult.from_columns({
+        c: np.concatenate([past.get(c, gap), proj.get(c, np.full(len(steps), np.nan))])
+        for c in names
+    })
 
-    return pd.DataFrame(records)
+
+def shared_full_simulation(memo: dict | None = None, **kwargs) -> SimResult:
+    """
+    run_full_simulation through the shared cache: sessions (and replicas)
+    asking for the same scenario reuse one result; a miss still runs
+    incrementally against the session's `memo`.
+
+    Only plain arrays go through the cache: every script run defines its own
+    SimResult class, so pickled instances would not load in another run.
+    """
+    parts = tuple(sorted(
+        (k, _frame_key(v) if isinstance(v, pd.DataFrame) else v) for k, v in kwargs.items()
+    ))
+
+    def compute():
+        res = run_full_simulation(memo=memo, **kwargs)
+        return pack_result(res) if COMPACT else (res.columns, res.data, res.phase_codes)
+
+    cached = shared_cached("sim", parts + (("compact", COMPACT),), compute)
+    return unpack_result(cached) if COMPACT else SimResult(*cached)
+
+
+# ── Externality tensor: company × category × year ──
+TENSOR_AXES = ("company", "category", "year")
+
+
+def externality_tensor(df: SimResult) -> dict:
+    """
+    Extractive externalities split by company, category and period, built from
+    a simulation result in one product: every company's revenue times the
+    category cost shares of its period (the extractive indices are shared by
+    all companies). Summing over companies and categories gives back
+    "Ext. Externalities". Values are float32 — slices and sums are only
+    displayed, and the full tensor stays ~4 bytes per cell.
+    """
+    rev = np.stack([df[f"{tk} Revenue"] for tk in TICKERS])                # (C, Y)
+    idx = np.stack([df["Ext. EHI"], df["Ext. HRI"], df["Ext. IRI"]])       # (3, Y)
+    share = _ext_cost_share(idx)                                                     # (K, Y)
+    return {
+        "companies": list(TICKERS), "categories": list(EXT_CAT_NAMES),
+        "years": df["Jahr"], "phase": df["Phase"],
+        "revenue": rev.astype(np.float32), "index": idx.astype(np.float32),
+        "values": np.einsum("cy,ky->cky", rev, share).astype(np.float32),
+    }
+
+
+def tensor_total(tensor: dict, keep: tuple[str, ...] = (), mask: np.ndarray | None = None) -> np.ndarray:
+    """Sum the tensor over every axis not in `keep` (periods filtered by `mask`)."""
+    values = tensor["values"] if mask is None else tensor["values"][:, :, mask]
+    drop = tuple(i for i, ax in enumerate(TENSOR_AXES) if ax not in keep)
+    return values.sum(axis=drop, dtype=np.float64)
+
+
+def subcategory_breakdown(tensor: dict, category: str, company: str | None = None,
+                          mask: np.ndarray | None = None) -> pd.DataFrame:
+    """
+    Drill one category down to its registry sub-categories (region, sector, …),
+    for one company or all of them, summed over the masked periods.
+    """
+    rows = np.flatnonzero(_EXT_REGISTRY["sub_to_cat"][:, EXT_CAT_NAMES.index(category)])
+    rev = tensor["revenue"] if company is None else tensor["revenue"][[TICKERS.index(company)]]
+    rev = rev.sum(axis=0, dtype=np.float64)
+    idx = tensor["index"].astype(np.float64)
+    if mask is not None:
+        rev, idx = rev[mask], idx[:, mask]
+    # cost_s = Σ_y Rev_y · rate_s · (1 − index_w_s · I_y)
+    sub_rates = _EXT_REGISTRY["sub_rates"][rows]
+    cost = sub_rates * (rev.sum() - _EXT_REGISTRY["sub_index"][rows] @ (idx @ rev))
+    subs = [EXT_SUBCATEGORIES[r] for r in rows]
+    dims = [k for k in subs[0] if k not in ("name", "rate", "index", "category")]
+    out = pd.DataFrame({d: [sub.get(d, "") for sub in subs] for d in dims} if dims
+                       else {"name": [sub["name"] for sub in subs]})
+    out["Ext. Kosten"] = cost
+    return out
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  BATCHED ANALYSES — many scenarios through ONE project_paths call
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Scenario inputs of run_full_simulation: (min, max, default, step) — the
+# sidebar sliders, the explorer axes and the optimizer all share these bounds.
+PARAM_BOUNDS: dict[str, tuple[float, float, float, float]] = {
+    "gamma":       (0.0, 3.0, 1.0, 0.05),
+    "dr_0":        (0.01, 0.20, 0.05, 0.005),
+    "beta":        (0.0, 0.50, 0.15, 0.01),
+    "ehi_0":       (0.1, 0.9, 0.30, 0.05),
+    "hri_0":       (0.1, 0.9, 0.40, 0.05),
+    "iri_0":       (0.1, 0.9, 0.50, 0.05),
+    "q_b_share":   (0.0, 1.0, 0.50, 0.05),
+    "ext_degrad":  (0.01, 0.10, 0.04, 0.005),
+    "growth_rate": (0.0, 0.15, 0.04, 0.005),
+    "proj_years":  (5, 20, 10, 1),
+}
+# Translation key of each parameter's slider label
+PARAM_LABELS = {
+    "gamma": "gamma_label", "dr_0": "dr0_label", "beta": "beta_label",
+    "ehi_0": "ehi_label", "hri_0": "hri_label", "iri_0": "iri_label",
+    "q_b_share": "bio_share", "ext_degrad": "degrad_label",
+    "growth_rate": "growth_label", "proj_years": "proj_years_label",
+}
+
+
+def legacy_debt(hist_df: pd.DataFrame, ehi_0, hri_0, iri_0) -> np.ndarray:
+    """
+    Cumulative externalities of Phase 0 + 1 (retropolation and real history),
+    i.e. the debt the projection starts with. Broadcasts over index arrays.
+    """
+    hist_years = sorted(hist_df.index.tolist())
+    current_year = hist_years[-1] if hist_years else 2025
+    first_real_year = hist_years[0] if hist_years else 2021
+    idx0 = np.stack([np.asarray(v, dtype=float) for v in np.broadcast_arrays(ehi_0, hri_0, iri_0)])
+    expand = (slice(None),) + (None,) * (idx0.ndim - 1)
+
+    years_ago = np.array([current_year - y for y in _RETRO_COMBINED_REVENUE if y < first_real_year], dtype=float)
+    retro_rev = np.array([v for y, v in _RETRO_COMBINED_REVENUE.items() if y < first_real_year])
+    debt = np.zeros(idx0.shape[1:])
+    for ago, rev in zip(years_ago, retro_rev):
+        retro_idx = np.maximum(np.array(_RETRO_FLOORS)[expand], idx0 - np.array(_RETRO_SLOPES)[expand] * ago)
+        debt = debt + rev * _ext_cost_share(retro_idx).sum(axis=0)
+
+    hist_rev = sum(_sf(hist_df.loc[yr].get(f"{tk}_revenue", 0)) for yr in hist_years for tk in TICKERS)
+    return debt + hist_rev * _ext_cost_share(idx0).sum(axis=0)
+
+
+def run_batch_simulation(
+    hist_df: pd.DataFrame,
+    proj_years: int,
+    growth_rate=0.04, gamma=1.0, dr_0=0.05, beta=0.15,
+    ehi_0=0.30, hri_0=0.40, iri_0=0.50, q_b_share=0.50, ext_degrad=0.04,
+    outputs=None,
+    shock=None,
+) -> dict[str, np.ndarray]:
+    """
+    Projection phase of run_full_simulation (annual, combined) for a whole
+    batch of scenarios: every parameter may be a scalar or an array, all are
+    broadcast together. Returns "Jahr" (years,) and every projection column
+    (or only `outputs`) as (years, *batch), cumulative debt included.
+
+    `shock` (years, *batch) scales the surplus and revenue path by level
+    factors relative to the smooth growth path (see stress_test).
+    """
+    current_year, last_ni, ni_shares = _projection_base(hist_df)
+    rev_factor = 3.2 * sum(ni_shares.get(tk, 0.2) for tk in TICKERS)
+    steps = np.arange(1, proj_years + 1)
+    g = np.asarray(growth_rate, dtype=float)
+    shock = np.ones((len(steps),)) if shock is None else np.asarray(shock, dtype=float)
+    # (steps, *batch) with the batch dims of growth_rate and shock right-aligned
+    nd = max(g.ndim, shock.ndim - 1)
+    S = last_ni * (1 + g) ** steps.reshape((-1,) + (1,) * nd)
+    S = S * shock.reshape((len(steps),) + (1,) * (nd - shock.ndim + 1) + shock.shape[1:])
+    cols = project_paths(
+        S, S * rev_factor, last_ni * 0.5 + 1,
+        ehi_0, hri_0, iri_0, gamma, dr_0, beta, q_b_share, ext_degrad,
+        outputs=outputs, cum_ext_0=legacy_debt(hist_df, ehi_0, hri_0, iri_0),
+    )
+    cols["Jahr"] = current_year + steps
+    return cols
+
+
+def _zero_crossing(years: np.ndarray, series: np.ndarray, start, step: float = 1.0) -> np.ndarray:
+    """
+    First upward zero crossing of `series` (steps, *batch), linearly
+    interpolated; `start` is the value one step (of `step` years) before
+    years[0]. NaN where the series stays negative within the horizon.
+    """
+    series = np.asarray(series, dtype=float)
+    prev = np.concatenate([np.broadcast_to(start, (1,) + series.shape[1:]), series[:-1]])
+    hit = (series >= 0) & (prev < 0)
+    first = np.argmax(hit, axis=0)
+    found = hit.any(axis=0)
+    s0 = np.take_along_axis(prev, first[None], axis=0)[0]
+    s1 = np.take_along_axis(series, first[None], axis=0)[0]
+    frac = np.where(s1 != s0, -s0 / np.where(s1 != s0, s1 - s0, 1), 0)
+    return np.where(found, np.asarray(years)[first] - step + frac * step, np.nan)
+
+
+def _break_even_full(hist_df: pd.DataFrame, proj_years: int, max_years: int,
+                     per_company: bool, steps_per_year: int, **params) -> float:
+    """solve_break_even for one scenario of the per-company or sub-annual model."""
+    horizon = max(2, int(proj_years))
+    while True:
+        res = run_full_simulation(hist_df, horizon, **params, per_company=per_company,
+                                  steps_per_year=steps_per_year,
+                                  columns=("Netto-Systemsaldo", "Ext. Kum. Externalities"))
+        proj = res[res.phase_mask("Projektion")]
+        legacy = res[res.phase_mask("Historisch", "Retropolation")]["Ext. Kum. Externalities"][-1]
+        yr = float(_zero_crossing(proj["Jahr"], proj["Netto-Systemsaldo"], -legacy, step=1 / steps_per_year))
+        if not np.isnan(yr) or horizon >= max_years:
+            return yr
+        horizon = min(max_years, horizon * 2)
+
+
+def solve_break_even(hist_df: pd.DataFrame, proj_years: int, max_years: int = 200,
+                     per_company: bool = False, steps_per_year: int = 1, **params):
+    """
+    Break-even year of the Netto-Systemsaldo (cumulative Flynn creation =
+    cumulative debt) for one scenario or a broadcast batch of scenarios.
+
+    Starts with the `proj_years` horizon and doubles it, for the scenarios
+    that have not crossed yet only, up to `max_years`; scenarios that do not
+    cross within `max_years` are unreachable (NaN).
+    Returns a float for scalar input, else an array of the batch shape.
+
+    The batch runs the combined annual model (run_batch_simulation);
+    per_company or steps_per_year > 1 solve one scalar scenario with
+    run_full_simulation in that mode, so the year matches the displayed run.
+    """
+    if per_company or steps_per_year != 1:
+        return _break_even_full(hist_df, proj_years, max_years, per_company, steps_per_year, **params)
+    keys = [k for k in PARAM_BOUNDS if k != "proj_years"]
+    values = np.broadcast_arrays(*(np.asarray(params.get(k, PARAM_BOUNDS[k][2]), dtype=float) for k in keys))
+    flat = {k: v.ravel() for k, v in zip(keys, values)}
+    result = np.full(values[0].size, np.nan)
+    pending = np.arange(values[0].size)
+    horizon = max(2, int(proj_years))
+    while pending.size:
+        cols = run_batch_simulation(hist_df, horizon, **{k: v[pending] for k, v in flat.items()},
+                                    outputs=("Netto-Systemsaldo", "Ext. Kum. Externalities", "Ext. Externalities"))
+        saldo = cols["Netto-Systemsaldo"]
+        legacy = cols["Ext. Kum. Externalities"][0] - cols["Ext. Externalities"][0]
+        yr = _zero_crossing(cols["Jahr"], saldo, -legacy)
+        found = ~np.isnan(yr)
+        result[pending[found]] = yr[found]
+        if horizon >= max_years:
+            break
+        pending = pending[~found]
+        horizon = min(max_years, horizon * 2)
+    return result.reshape(values[0].shape)[()]
+
+
+def shared_break_even(**kwargs) -> float:
+    """
+    solve_break_even for one scenario through the shared cache, like
+    shared_full_simulation: a series that never crosses sends the solver
+    through ever longer runs, which every rerun would otherwise repeat.
+    """
+    parts = tuple(sorted(
+        (k, _frame_key(v) if isinstance(v, pd.DataFrame) else v) for k, v in kwargs.items()
+    ))
+    return shared_cached("break_even", parts, partial(solve_break_even, **kwargs))
+
+
+EXPLORER_MAX_YEARS = 100   # break-even search horizon for the explorer grid
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def explorer_grid(
+    hist_df: pd.DataFrame,
+    x_param: str,
+    y_param: str,
+    fixed: tuple[tuple[str, float], ...],
+    n: int = 100,
+) -> dict[str, np.ndarray]:
+    """
+    n × n grid of final Netto-Systemsaldo, Delta (%) and break-even year over
+    the full slider range of two parameters, all other inputs held at
+    `fixed`. One run_batch_simulation call; cached by the fixed inputs, so
+    moving the two explored sliders never recomputes the grid. Combined
+    annual model only: the tab is off in the other modes.
+    """
+    params = dict(fixed)
+    lo_x, hi_x = PARAM_BOUNDS[x_param][:2]
+    lo_y, hi_y = PARAM_BOUNDS[y_param][:2]
+    xs = np.linspace(lo_x, hi_x, n)
+    ys = np.linspace(lo_y, hi_y, n)
+    params[x_param] = xs[None, :]
+    params[y_param] = ys[:, None]
+    proj_years = int(params.pop("proj_years"))
+    cols = run_batch_simulation(hist_df, proj_years, **params, outputs=("Netto-Systemsaldo", "Delta (%)"))
+    return {
+        "x": xs, "y": ys,
+        "saldo": cols["Netto-Systemsaldo"][-1],
+        "delta_pct": cols["Delta (%)"][-1],
+        "break_even": solve_break_even(hist_df, proj_years, max_years=EXPLORER_MAX_YEARS, **params),
+    }
+
+# Columns of the simulation result that run_backtest_sweep reads
+BACKTEST_COLUMNS = ("Surplus (S)", "Revenue", "Ext. Externalities", "Ext. EHI", "Ext. HRI", "Ext. IRI")
+
+
+def run_backtest_sweep(
+    sim_df: SimResult,
+    gamma: float,
+    dr_0: float,
+    beta: float,
+    q_b_share: float,
+    ext_degrad: float,
+) -> dict[str, np.ndarray]:
+    """
+    "What if Flynn had started in year X?" for every X from the first
+    retropolation year up to the regular start (current year + 1).
+
+    `sim_df` is an annual run_full_simulation result; its Surplus/Revenue
+    timeline and its extractive externalities are the baseline. Each start
+    year is one batch column: the series is shifted so that step 0 is the
+    start year, padded with zero flows after the horizon, and the Flynn
+    indices start from the extractive indices of the year before.
+    The regular start year reproduces run_full_simulation exactly.
+
+    Returns start_years (B,), years (T,) and the (B, T) surfaces
+    value_created (cum. Flynn Jahres-Aufbau) and debt_avoided (cum.
+    extractive minus Flynn-path externalities), NaN before each start.
+    """
+    years = sim_df["Jahr"].astype(int)
+    S_all = sim_df["Surplus (S)"]
+    rev_all = sim_df["Revenue"]
+    ext_all = sim_df["Ext. Externalities"]
+    idx_all = np.stack([sim_df["Ext. EHI"], sim_df["Ext. HRI"], sim_df["Ext. IRI"]], axis=1)
+    first_proj = int(np.argmax(sim_df.phase_mask("Projektion")))
+    n_years = len(years)
+
+    starts = np.arange(0, first_proj + 1)   # row index of every possible start year
+    prev = np.maximum(starts - 1, 0)        # "last year before Flynn"
+    k = np.arange(n_years)[:, None]
+    rows = starts[None, :] + k              # (steps, B) row index into the timeline
+    inside = rows < n_years
+    rows = np.where(inside, rows, 0)
+    S = np.where(inside, S_all[rows], 0.0)
+    Rev = np.where(inside, rev_all[rows], 0.0)
+
+    cols = project_paths(
+        S, Rev, S_all[prev] * 0.5 + 1,
+        idx_all[prev, 0], idx_all[prev, 1], idx_all[prev, 2],
+        gamma, dr_0, beta, q_b_share, ext_degrad,
+        outputs=("Flynn Jahres-Aufbau", "Flynn Ext. Kosten"),
+    )
+
+    # Scatter the start-aligned steps back onto calendar years
+    value = np.full((len(starts), n_years), np.nan)
+    avoided = np.full((len(starts), n_years), np.nan)
+    b_idx = np.broadcast_to(np.arange(len(starts)), rows.shape)
+    gain = np.where(inside, np.cumsum(cols["Flynn Jahres-Aufbau"], axis=0), np.nan)
+    saved = np.where(inside, np.cumsum(np.where(inside, ext_all[rows], 0.0)
+                                       - cols["Flynn Ext. Kosten"], axis=0), np.nan)
+    value[b_idx[inside], rows[inside]] = gain[inside]
+    avoided[b_idx[inside], rows[inside]] = saved[inside]
+    return {
+        "start_years": years[starts],
+        "years": years,
+        "value_created": value,
+        "debt_avoided": avoided,
+    }
+
+
+# ── Historical stress tests: recorded revenue shocks replayed on the projection ──
+# Crisis windows of _RETRO_COMBINED_REVENUE: (first, last) year of the shock path
+STRESS_WINDOWS = {"dotcom": (2001, 2003), "gfc": (2008, 2010), "covid": (2020, 2020)}
+STRESS_SCENARIOS = ("baseline", *STRESS_WINDOWS, "custom")
+# Projection columns stress_test returns per scenario
+STRESS_COLUMNS = ("Netto-Systemsaldo", "Flynn Kum. Wertschoepfung", "Delta (%)")
+
+
+def stress_levels(growth_rate: float, years: int, onset: int = 0,
+                  custom: tuple[float, int] = (0.30, 3)) -> np.ndarray:
+    """
+    Surplus level relative to the smooth (1 + growth_rate) ** t path, as
+    (years, scenarios) in STRESS_SCENARIOS order. From projection year
+    `onset` on, a historical scenario replaces the trend growth with the
+    revenue growth recorded in its window and keeps the level it reached
+    (the trend resumes from there). `custom` is (drawdown, recovery years):
+    the level drops by the drawdown and recovers linearly to the trend.
+    """
+    levels = np.ones((years, len(STRESS_SCENARIOS)))
+    k = np.arange(years) - onset            # years since the shock hit (< 0: before it)
+    for j, name in enumerate(STRESS_SCENARIOS):
+        if name in STRESS_WINDOWS:
+            first, last = STRESS_WINDOWS[name]
+            rev = np.array([_RETRO_COMBINED_REVENUE[y] for y in range(first - 1, last + 1)])
+            path = np.cumprod(rev[1:] / rev[:-1] / (1 + growth_rate))
+            levels[:, j] = np.where(k < 0, 1.0, path[np.clip(k, 0, len(path) - 1)])
+        elif name == "custom":
+            drawdown, recovery = custom
+            levels[:, j] = np.where(k < 0, 1.0, 1 - drawdown * np.clip(1 - k / max(1, recovery), 0, 1))
+    return levels
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def stress_test(
+    hist_df: pd.DataFrame,
+    fixed: tuple[tuple[str, float], ...],
+    onset: int = 0,
+    custom: tuple[float, int] = (0.30, 3),
+) -> dict[str, np.ndarray]:
+    """
+    Every STRESS_SCENARIOS shock path against the scenario `fixed` (all
+    inputs incl. proj_years, like explorer_grid) in one run_batch_simulation
+    call, with the shock paths on the batch axis. The baseline column is the
+    unshocked projection. Combined annual model only, like explorer_grid.
+
+    Returns "years", "levels" and the STRESS_COLUMNS as (years, scenarios),
+    plus "break_even" (scenarios,): the break-even year within the horizon,
+    NaN where it is not reached.
+    """
+    params = dict(fixed)
+    proj_years = int(params.pop("proj_years"))
+    levels = stress_levels(params["growth_rate"], proj_years, onset, custom)
+    cols = run_batch_simulation(hist_df, proj_years, **params, shock=levels,
+                                outputs=STRESS_COLUMNS + ("Ext. Kum. Externalities", "Ext. Externalities"))
+    legacy = cols["Ext. Kum. Externalities"][0] - cols["Ext. Externalities"][0]
+    out = {"years": cols["Jahr"], "levels": levels}
+    out.update({c: cols[c] for c in STRESS_COLUMNS})
+    out["break_even"] = _zero_crossing(cols["Jahr"], cols["Netto-Systemsaldo"], -legacy)
+    return out
+
+
+def stress_table(res: dict[str, np.ndarray]) -> pd.DataFrame:
+    """One row per scenario: trough, final values and change against the baseline."""
+    value = res["Flynn Kum. Wertschoepfung"][-1]
+    base = value[STRESS_SCENARIOS.index("baseline")]
+    return pd.DataFrame({
+        "scenario": STRESS_SCENARIOS,
+        "trough_pct": (res["levels"].min(axis=0) - 1) * 100,
+        "value": value,
+        "value_vs_base_pct": (value / base - 1) * 100 if base else np.nan,
+        "saldo": res["Netto-Systemsaldo"][-1],
+        "delta_pct": res["Delta (%)"][-1],
+        "break_even": res["break_even"],
+    })
+
+
+# ── Goal-seek over the Flynn allocation parameters ──
+OPT_PARAMS = ("q_b_share", "gamma", "dr_0")
+OPT_OBJECTIVES = ("max_value", "min_break_even", "target_saldo")
+OPT_MAX_YEARS = 100
+
+
+def _param_lattice(name: str) -> np.ndarray:
+    """All values the slider of `name` can take."""
+    lo, hi, _, step = PARAM_BOUNDS[name]
+    return np.round(np.arange(lo, hi + step / 2, step), 6)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _score_lattice(
+    hist_df: pd.DataFrame,
+    objective: str,
+    fixed: tuple[tuple[str, float], ...],
+    axes: tuple[tuple[float, ...], ...],
+    target: float = 0.0,
+    target_year: int | None = None,
+) -> np.ndarray:
+    """
+    Objective score (higher = better) on the outer product of the OPT_PARAMS
+    axes — one batched engine call per block, cached so that repeated
+    searches and overlapping refinement windows are free.
+    """
+    params = dict(fixed)
+    proj_years = int(params.pop("proj_years"))
+    q, g, d = (np.asarray(a, dtype=float) for a in axes)
+    params.update(q_b_share=q[:, None, None], gamma=g[None, :, None], dr_0=d[None, None, :])
+    if objective == "max_value":
+        return run_batch_simulation(hist_df, proj_years, **params,
+                                    outputs=("Flynn Kum. Wertschoepfung",))["Flynn Kum. Wertschoepfung"][-1]
+    if objective == "min_break_even":
+        be = solve_break_even(hist_df, proj_years, max_years=OPT_MAX_YEARS, **params)
+        return np.where(np.isnan(be), -np.inf, -be)
+    if objective == "target_saldo":
+        horizon = max(1, int(target_year) - _projection_base(hist_df)[0])
+        saldo = run_batch_simulation(hist_df, horizon, **params, outputs=("Netto-Systemsaldo",))["Netto-Systemsaldo"][-1]
+        return -np.abs(saldo - target)
+    raise ValueError(f"unknown objective: {objective}")
+
+
+def optimize_allocation(
+    hist_df: pd.DataFrame,
+    objective: str,
+    fixed: tuple[tuple[str, float], ...],
+    target: float = 0.0,
+    target_year: int | None = None,
+    stride: int = 4,
+) -> dict:
+    """
+    Goal-seek q_b_share, gamma and dr_0 on their slider lattices:
+    a coarse pass over every `stride`-th slider position, then windows
+    around the best point at half the stride until stride 1 — about 1.2k
+    scenario evaluations instead of the ~50k of the full lattice.
+    `fixed` holds all other inputs (incl. proj_years), like explorer_grid;
+    combined annual model only. Returns the best slider values, the
+    achieved objective value and the number of evaluated scenarios.
+    """
+    lattices = [_param_lattice(p) for p in OPT_PARAMS]
+    center = None
+    evaluated = 0
+    while True:
+        if center is None:
+            idx_axes = [np.unique(np.append(np.arange(0, len(lat), stride), len(lat) - 1)) for lat in lattices]
+        else:
+            idx_axes = [np.arange(max(0, c - 2 * stride), min(len(lat), c + 2 * stride + 1), stride)
+                        for lat, c in zip(lattices, center)]
+        axes = tuple(tuple(lat[ix].tolist()) for lat, ix in zip(lattices, idx_axes))
+        scores = _score_lattice(hist_df, objective, fixed, axes, target, target_year)
+        evaluated += scores.size
+        best = np.unravel_index(np.argmax(scores), scores.shape)
+        center = [int(ix[b]) for ix, b in zip(idx_axes, best)]
+        if stride == 1:
+            break
+        stride = max(1, stride // 2)
+
+    best_params = {p: float(lat[c]) for p, lat, c in zip(OPT_PARAMS, lattices, center)}
+    score = float(scores[best])
+    achieved = {"max_value": score, "min_break_even": -score,
+                "target_saldo": None}[objective]
+    if objective == "target_saldo":
+        params = {**dict(fixed), **best_params}
+        params.pop("proj_years")
+        horizon = max(1, int(target_year) - _projection_base(hist_df)[0])
+        achieved = float(run_batch_simulation(hist_df, horizon, **params,
+                                              outputs=("Netto-Systemsaldo",))["Netto-Systemsaldo"][-1])
+    return {"params": best_params, "achieved": achieved if np.isfinite(achieved) else np.nan,
+            "evaluated": evaluated}
+
+
+# ── Calibration of the hand-set rates to the recorded history ──
+# FLYNN_CALIBRATE=1 starts new sessions with the sliders at the calibrated
+# values instead of the PARAM_BOUNDS defaults.
+CALIBRATED_DEFAULTS = bool(os.environ.get("FLYNN_CALIBRATE"))
+_CI_Z = 1.96   # two-sided 95 % interval (normal approximation)
+
+
+def _ols(X: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Least-squares coefficients and their standard errors; X (n, k), y (n,)."""
+    beta, *_ = np.linalg.lstsq(X, y, rcond=None)
+    resid = y - X @ beta
+    sigma2 = resid @ resid / max(1, X.shape[0] - X.shape[1])
+    return beta, np.sqrt(np.diag(np.linalg.pinv(X.T @ X)) * sigma2)
+
+
+def _fit_calibration(hist_df: pd.DataFrame) -> list[dict]:
+    hist_years = sorted(hist_df.index.tolist())
+    first_real_year = hist_years[0] if hist_years else 2021
+    current_year = hist_years[-1] if hist_years else 2025
+    retro = [(y, v) for y, v in _RETRO_COMBINED_REVENUE.items() if y < first_real_year]
+    real = [(y, _sf(hist_df.loc[y].get("Combined_Revenue", 0))) for y in hist_years]
+    real = [(y, v) for y, v in real if v > 0]
+    years = np.array([y for y, _ in retro + real], dtype=float)
+    log_rev = np.log([v for _, v in retro + real])
+    # One trend, a level per source: the estimates cover the asset-management
+    # divisions only, the reported revenue the whole companies.
+    X = np.column_stack([np.arange(len(years)) < len(retro), np.arange(len(years)) >= len(retro),
+                         years - current_year]).astype(float)
+    X = X[:, X.any(axis=0)]
+    beta, se = _ols(X, log_rev)
+    rows = [dict(param="growth_rate", hand_set=PARAM_BOUNDS["growth_rate"][2],
+                 estimate=float(np.expm1(beta[-1])), lo=float(np.expm1(beta[-1] - _CI_Z * se[-1])),
+                 hi=float(np.expm1(beta[-1] + _CI_Z * se[-1])), n=len(years))]
+    # Neither source observes the EHI/HRI/IRI indices these rates drive
+    rows.append(dict(param="ext_degrad", hand_set=PARAM_BOUNDS["ext_degrad"][2],
+                     estimate=np.nan, lo=np.nan, hi=np.nan, n=0))
+    rows += [dict(param=f"retro_slope_{k}", hand_set=s, estimate=np.nan, lo=np.nan, hi=np.nan, n=0)
+             for k, s in zip(("ehi", "hri", "iri"), _RETRO_SLOPES)]
+    return rows
+
+
+def calibrate(hist_df: pd.DataFrame) -> list[dict]:
+    """
+    Fit the hand-set model rates to _RETRO_COMBINED_REVENUE and the real
+    years of `hist_df`, cached in the shared cache by the data fingerprint
+    (so it reruns only when a refresh changes the data).
+
+    growth_rate is the log-linear least-squares trend of combined revenue,
+    which the projection grows with the surplus. ext_degrad and the
+    retropolation slopes act on the indices, which the data do not contain:
+    they are reported as not identified (estimate NaN) and stay hand-set.
+    One row per parameter: hand_set, estimate, lo/hi (95 % CI), n.
+    """
+    return shared_cached("calib", (_frame_key(hist_df),), partial(_fit_calibration, hist_df))
+
+
+def calibrated_defaults(rows: list[dict]) -> dict[str, float]:
+    """Identified estimates as slider values (on the slider lattice)."""
+    out = {}
+    for r in rows:
+        if r["param"] in PARAM_BOUNDS and np.isfinite(r["estimate"]):
+            lo, hi, _, step = PARAM_BOUNDS[r["param"]]
+            out[r["param"]] = float(np.clip(np.round(round(r["estimate"] / step) * step, 6), lo, hi))
+    return out
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -638,20 +2626,71 @@ def _layout_defaults() -> dict:
         margin=dict(l=60, r=30, t=60, b=50),
     )
 
+# Upper bound on x-points per trace; sub-annual runs are merged down to this
+MAX_CHART_POINTS = 120
+
+
+def decimate_for_chart(df: SimResult, max_points: int = MAX_CHART_POINTS) -> SimResult:
+    """
+    Merge consecutive periods (within each phase) until the result has at most
+    `max_points` rows. Flows are summed and levels take the last value in
+    each bucket, so cumulative curves and stacked totals stay exact.
+    Annual results are returned unchanged.
+    """
+    if len(df) <= max_points:
+        return df
+    k = math.ceil(len(df) / max_points)
+    bounds = np.flatnonzero(np.diff(df.phase_codes)) + 1
+    blocks = zip(np.r_[0, bounds], np.r_[bounds, len(df)])
+    starts = np.concatenate([np.arange(b0, b1, k) for b0, b1 in blocks])
+    ends = np.r_[starts[1:], len(df)]
+    flows = np.array([c in FLOW_COLUMNS for c in df._pos])
+    data = np.where(flows[:, None], np.add.reduceat(df.data, starts, axis=1), df.data[:, ends - 1])
+    return SimResult(df.columns, data, df.phase_codes[starts])
+
+
+# Externality breakdown in charts: one trace per category while they fit,
+# otherwise categories roll up to their index domain (EHI/HRI/IRI) so the
+# figures stay small however many categories the registry defines.
+MAX_CATEGORY_TRACES = 12
+_DOMAIN_COLORS = {"ehi": "#cc4444", "hri": "#e07020", "iri": "#d4a017"}
+
+
+def category_traces(df: SimResult) -> list[tuple[str, str, np.ndarray]]:
+    """(label, color, values) per trace of the externality breakdown."""
+    names = [c for c in EXT_CAT_NAMES if f"Ext. {c}" in df.columns]
+    if len(names) <= MAX_CATEGORY_TRACES:
+        return [(_tcat(c), EXT_CATEGORIES[c]["color"], df[f"Ext. {c}"]) for c in names]
+    domains: dict[str, list[str]] = {}
+    for c in names:
+        domains.setdefault(EXT_CATEGORIES[c]["index"], []).append(f"Ext. {c}")
+    return [(t(f"domain_{k}"), _DOMAIN_COLORS[k], np.sum([df[c] for c in cols], axis=0))
+            for k, cols in domains.items()]
+
+
+def _with_last_history(df: SimResult) -> SimResult:
+    """Projection rows preceded by the last historical row (the curves' anchor)."""
+    rows = df.phase_mask("Projektion")
+    rows[np.flatnonzero(df.phase_mask("Historisch"))[-1:]] = True
+    return df[rows]
+
+
 def _add_projection_shading(fig, df):
-    """Add a vertical shaded area for projection years."""
-    proj = df[df["Phase"] == "Projektion"]
+    """Add a vertical shaded area for the projection periods, half a step around their points."""
+    proj = df[df.phase_mask("Projektion")]
     if proj.empty:
         return
-    x0 = proj["Jahr"].iloc[0] - 0.5
-    x1 = proj["Jahr"].iloc[-1] + 0.5
+    years = df["Jahr"]
+    half = (years[-1] - years[-2]) / 2 if len(years) > 1 else 0.5
+    x0 = proj["Jahr"][0] - half
+    x1 = proj["Jahr"][-1] + half
     fig.add_vrect(x0=x0, x1=x1, fillcolor="rgba(0,229,160,0.04)",
                   line_width=0, annotation_text="Projection →",
                   annotation_position="top left",
                   annotation_font=dict(size=11, color="#5fa8ff"))
 
 
-def chart_stock_prices(df: pd.DataFrame) -> go.Figure:
+def chart_stock_prices(df: SimResult) -> go.Figure:
     """Historical + projected stock prices for all tickers."""
     fig = go.Figure()
     for tk in TICKERS:
@@ -675,7 +2714,7 @@ def chart_stock_prices(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def chart_net_income(df: pd.DataFrame) -> go.Figure:
+def chart_net_income(df: SimResult) -> go.Figure:
     """Grouped bar chart: Net Income per ticker by year."""
     fig = go.Figure()
     for tk in TICKERS:
@@ -701,12 +2740,11 @@ def chart_net_income(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def chart_value_comparison(df: pd.DataFrame) -> go.Figure:
+def chart_value_comparison(df: SimResult) -> go.Figure:
     """The core comparison: Extractive True Value vs Flynn Matrix Value."""
-    proj = df[df["Phase"] == "Projektion"]
+    proj = df[df.phase_mask("Projektion")]
     # Also include last historical year as connection point
-    hist_last = df[df["Phase"] == "Historisch"].tail(1)
-    plot_df = pd.concat([hist_last, proj]) if not hist_last.empty else proj
+    plot_df = _with_last_history(df)
 
     fig = go.Figure()
 
@@ -734,16 +2772,14 @@ def chart_value_comparison(df: pd.DataFrame) -> go.Figure:
         hovertemplate="%{x}: $%{y:,.0f}<extra>" + t('hover_all_ext_costs') + "</extra>",
     ))
     # Individual category lines (thin, stacked visibility)
-    for cat_name, cat_cfg in EXT_CATEGORIES.items():
-        col = f"Ext. {cat_name}"
-        if col in plot_df.columns:
-            fig.add_trace(go.Scatter(
-                x=plot_df["Jahr"], y=plot_df[col],
-                name=_tcat(cat_name), mode="lines",
-                line=dict(color=cat_cfg["color"], width=1, dash="dash"),
-                hovertemplate="%{x}: $%{y:,.0f}<extra>" + _tcat(cat_name) + "</extra>",
-                visible="legendonly",  # toggle-able — default hidden to avoid clutter
-            ))
+    for label, color, values in category_traces(plot_df):
+        fig.add_trace(go.Scatter(
+            x=plot_df["Jahr"], y=values,
+            name=label, mode="lines",
+            line=dict(color=color, width=1, dash="dash"),
+            hovertemplate="%{x}: $%{y:,.0f}<extra>" + label + "</extra>",
+            visible="legendonly",  # toggle-able — default hidden to avoid clutter
+        ))
     # Flynn
     fig.add_trace(go.Scatter(
         x=plot_df["Jahr"], y=plot_df["Flynn Matrix Value"],
@@ -771,7 +2807,7 @@ def chart_value_comparison(df: pd.DataFrame) -> go.Figure:
 
     # Final year annotations
     if not proj.empty:
-        final = proj.iloc[-1]
+        final = proj.row(-1)
         yr = final["Jahr"]
         flynn_adv = _sf(final["Delta (%)"])
         fig.add_annotation(
@@ -816,9 +2852,9 @@ def chart_value_comparison(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def chart_delta_bars(df: pd.DataFrame) -> go.Figure:
+def chart_delta_bars(df: SimResult) -> go.Figure:
     """Bar chart: Flynn advantage % per year (vs. Brutto-Surplus S)."""
-    proj = df[df["Phase"] == "Projektion"]
+    proj = df[df.phase_mask("Projektion")]
     colors = [COLORS["flynn"] if v >= 0 else COLORS["extractive"] for v in proj["Delta (%)"]]
 
     fig = go.Figure()
@@ -837,7 +2873,7 @@ def chart_delta_bars(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def chart_cumulative_destruction(df: pd.DataFrame) -> go.Figure:
+def chart_cumulative_destruction(df: SimResult) -> go.Figure:
     """
     THE CORE CHART: Cumulative externality destruction (the cancer)
     vs cumulative Flynn value creation.
@@ -845,15 +2881,15 @@ def chart_cumulative_destruction(df: pd.DataFrame) -> go.Figure:
     This is what stays invisible in the extractive system.
     """
     # Full timeline: historical + projection
-    all_data = df.copy()
+    all_data = df
     if all_data.empty:
         return go.Figure()
 
-    proj = df[df["Phase"] == "Projektion"]
-    hist = df[df["Phase"] == "Historisch"]
-    retro = df[df["Phase"] == "Retropolation"]
+    proj = df[df.phase_mask("Projektion")]
+    hist = df[df.phase_mask("Historisch")]
+    retro = df[df.phase_mask("Retropolation")]
     # current_year = last year before projection starts
-    non_proj = df[df["Phase"] != "Projektion"]
+    non_proj = df[~df.phase_mask("Projektion")]
     current_year = int(non_proj["Jahr"].max()) if not non_proj.empty else 2025
     first_real = int(hist["Jahr"].min()) if not hist.empty else 2021
 
@@ -862,18 +2898,14 @@ def chart_cumulative_destruction(df: pd.DataFrame) -> go.Figure:
     # ── Per-category cumulative destruction over FULL timeline ──
     # The data already has pre-computed Ext. Kum. values, but for stacked areas
     # we need per-category cumsum over ALL phases
-    for cat_name in reversed(EXT_CAT_NAMES):
-        col = f"Ext. {cat_name}"
-        if col in all_data.columns:
-            cum_cat = -all_data[col].cumsum()
-            cat_cfg = EXT_CATEGORIES[cat_name]
-            fig.add_trace(go.Scatter(
-                x=all_data["Jahr"], y=cum_cat,
-                name=f"{t('cum_prefix')} {_tcat(cat_name)}",
-                mode="lines", line=dict(color=cat_cfg["color"], width=0.5),
-                stackgroup="ext_cats",
-                hovertemplate="%{x}: %{y:$,.0f}<extra>" + _tcat(cat_name) + "</extra>",
-            ))
+    for label, color, values in reversed(category_traces(all_data)):
+        fig.add_trace(go.Scatter(
+            x=all_data["Jahr"], y=-np.cumsum(values),
+            name=f"{t('cum_prefix')} {label}",
+            mode="lines", line=dict(color=color, width=0.5),
+            stackgroup="ext_cats",
+            hovertemplate="%{x}: %{y:$,.0f}<extra>" + label + "</extra>",
+        ))
 
     # ── Total cumulative destruction line (bold on top) ──
     fig.add_trace(go.Scatter(
@@ -911,7 +2943,7 @@ def chart_cumulative_destruction(df: pd.DataFrame) -> go.Figure:
     )
 
     # ── Historical debt annotation at Flynn-start ──
-    non_proj_last = non_proj.iloc[-1] if not non_proj.empty else None
+    non_proj_last = non_proj.row(-1) if not non_proj.empty else None
     if non_proj_last is not None:
         hist_debt = _sf(non_proj_last.get("Ext. Kum. Externalities", 0))
         fig.add_annotation(
@@ -939,7 +2971,7 @@ def chart_cumulative_destruction(df: pd.DataFrame) -> go.Figure:
 
     # ── End-year annotations ──
     if not proj.empty:
-        final = proj.iloc[-1]
+        final = proj.row(-1)
         schere = _sf(final["Kum. Schere (abs)"])
         yr = final["Jahr"]
         fig.add_annotation(
@@ -973,46 +3005,40 @@ def chart_cumulative_destruction(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def chart_annual_comparison(df: pd.DataFrame) -> go.Figure:
+def chart_annual_comparison(df: SimResult) -> go.Figure:
     """
     Side-by-side per year: what the extractive system DESTROYS
     vs what Flynn CREATES. Mirror bars above/below zero.
     """
     # Full timeline — historical shows pure destruction, projection adds Flynn
-    all_data = df.copy()
+    all_data = df
     if all_data.empty:
         return go.Figure()
 
-    hist = df[df["Phase"] == "Historisch"]
-    retro = df[df["Phase"] == "Retropolation"]
-    proj = df[df["Phase"] == "Projektion"]
-    non_proj = df[df["Phase"] != "Projektion"]
+    hist = df[df.phase_mask("Historisch")]
+    retro = df[df.phase_mask("Retropolation")]
+    proj = df[df.phase_mask("Projektion")]
+    non_proj = df[~df.phase_mask("Projektion")]
     current_year = int(non_proj["Jahr"].max()) if not non_proj.empty else 2025
     first_real = int(hist["Jahr"].min()) if not hist.empty else 2021
 
     fig = go.Figure()
 
     # ── Negative: per-category annual costs as stacked bars (ALL years) ──
-    for cat_name in EXT_CAT_NAMES:
-        col = f"Ext. {cat_name}"
-        if col in all_data.columns:
-            cat_cfg = EXT_CATEGORIES[cat_name]
-            fig.add_trace(go.Bar(
-                x=all_data["Jahr"],
-                y=[-v for v in all_data[col]],
-                name=_tcat(cat_name),
-                marker_color=cat_cfg["color"], opacity=0.85,
-                hovertemplate="%{x}: %{y:$,.0f}<extra>" + _tcat(cat_name) + "</extra>",
-            ))
+    for label, color, values in category_traces(all_data):
+        fig.add_trace(go.Bar(
+            x=all_data["Jahr"],
+            y=-values,
+            name=label,
+            marker_color=color, opacity=0.85,
+            hovertemplate="%{x}: %{y:$,.0f}<extra>" + label + "</extra>",
+        ))
 
     # Positive: Flynn generated value (MW + MQ uplift) — only in projection!
     # Historical years: Flynn = 0
-    flynn_added = []
-    for _, row in all_data.iterrows():
-        if row["Phase"] == "Projektion":
-            flynn_added.append(row["MW_Total"] + (row["Matrix-Metamorphose"] - row["Matrix-Kapital (Q)"]))
-        else:
-            flynn_added.append(0)
+    flynn_added = np.where(
+        all_data.phase_mask("Projektion"),
+        all_data["MW_Total"] + (all_data["Matrix-Metamorphose"] - all_data["Matrix-Kapital (Q)"]), 0.0)
     fig.add_trace(go.Bar(
         x=all_data["Jahr"],
         y=flynn_added,
@@ -1065,11 +3091,10 @@ def chart_annual_comparison(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def chart_indices_compare(df: pd.DataFrame) -> go.Figure:
+def chart_indices_compare(df: SimResult) -> go.Figure:
     """Side-by-side: Extractive degradation vs Flynn regeneration."""
-    proj = df[df["Phase"] == "Projektion"]
-    hist_last = df[df["Phase"] == "Historisch"].tail(1)
-    plot_df = pd.concat([hist_last, proj]) if not hist_last.empty else proj
+    proj = df[df.phase_mask("Projektion")]
+    plot_df = _with_last_history(df)
 
     fig = make_subplots(
         rows=1, cols=2, shared_yaxes=True, horizontal_spacing=0.06,
@@ -1108,14 +3133,14 @@ def chart_indices_compare(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def chart_dialysis(df: pd.DataFrame) -> go.Figure:
+def chart_dialysis(df: SimResult) -> go.Figure:
     """Dialyse: Externalitäten ins MINUS, Flynn-Aufbau ins PLUS — Gleichgewicht bei y=0."""
-    years = df["Jahr"].values
+    years = df["Jahr"]
 
     # Externalitäten als NEGATIVE Werte (Zerstörung = unter Null!)
-    ext_annual = -df["Ext. Externalities"].values / 1e9        # extraktiv → MINUS
-    flynn_ext  = -df["Flynn Ext. Kosten"].values / 1e9         # Flynn-Pfad → MINUS (aber sinkend → 0)
-    flynn_aufb =  df["Flynn Jahres-Aufbau"].values / 1e9       # Flynn-Aufbau → PLUS
+    ext_annual = -df["Ext. Externalities"] / 1e9        # extraktiv → MINUS
+    flynn_ext  = -df["Flynn Ext. Kosten"] / 1e9         # Flynn-Pfad → MINUS (aber sinkend → 0)
+    flynn_aufb =  df["Flynn Jahres-Aufbau"] / 1e9       # Flynn-Aufbau → PLUS
 
     # Netto-Bilanz pro Jahr: Aufbau minus Zerstörung
     netto = flynn_aufb + flynn_ext   # flynn_ext ist negativ, also Aufbau + (neg. Rest-Ext.)
@@ -1166,7 +3191,7 @@ def chart_dialysis(df: pd.DataFrame) -> go.Figure:
     )
 
     # ── Flynn start marker ──
-    first_proj = df[df["Phase"] == "Projektion"]["Jahr"].min()
+    first_proj = df[df.phase_mask("Projektion")]["Jahr"].min()
     fig.add_vline(
         x=first_proj, line_dash="dash", line_color="#2ecc71", line_width=1.5,
         annotation_text=t("flynn_starts"), annotation_position="top right",
@@ -1174,31 +3199,29 @@ def chart_dialysis(df: pd.DataFrame) -> go.Figure:
     )
 
     # ── Mark when Netto-Bilanz crosses zero (equilibrium reached!) ──
-    proj = df[df["Phase"] == "Projektion"]
+    proj = df[df.phase_mask("Projektion")]
     if len(proj) >= 2:
-        proj_aufb = proj["Flynn Jahres-Aufbau"].values / 1e9
-        proj_fext = -proj["Flynn Ext. Kosten"].values / 1e9
-        proj_netto = proj_aufb + proj_fext
-        for i in range(1, len(proj_netto)):
-            if proj_netto[i] >= 0 and proj_netto[i - 1] < 0:
-                # Linear interpolation for exact crossing year
-                frac = -proj_netto[i - 1] / (proj_netto[i] - proj_netto[i - 1]) if (proj_netto[i] - proj_netto[i - 1]) != 0 else 0
-                eq_yr = float(proj.iloc[i - 1]["Jahr"]) + frac
-                fig.add_annotation(
-                    x=eq_yr, y=0,
-                    text=t("equilibrium_approx", yr=f'{eq_yr:.0f}'),
-                    showarrow=True, arrowhead=2, ay=-50,
-                    font=dict(size=14, color="#f1c40f"),
-                    bgcolor="rgba(0,0,0,0.8)", bordercolor="#f1c40f", borderwidth=2,
-                )
-                break
+        proj_years = proj["Jahr"]
+        proj_netto = (proj["Flynn Jahres-Aufbau"] - proj["Flynn Ext. Kosten"]) / 1e9
+        # Linear interpolation for exact crossing year
+        eq_yr = _zero_crossing(proj_years[1:], proj_netto[1:], proj_netto[0],
+                               step=proj_years[1] - proj_years[0])
+        if not np.isnan(eq_yr):
+            fig.add_annotation(
+                x=float(eq_yr), y=0,
+                text=t("equilibrium_approx", yr=f'{eq_yr:.0f}'),
+                showarrow=True, arrowhead=2, ay=-50,
+                font=dict(size=14, color="#f1c40f"),
+                bgcolor="rgba(0,0,0,0.8)", bordercolor="#f1c40f", borderwidth=2,
+            )
 
     # ── End-year annotations ──
     if len(proj) > 0:
-        final_yr = int(proj.iloc[-1]["Jahr"])
-        final_ext = -_sf(proj.iloc[-1]["Ext. Externalities"]) / 1e9
-        final_fext = -_sf(proj.iloc[-1]["Flynn Ext. Kosten"]) / 1e9
-        final_aufb = _sf(proj.iloc[-1]["Flynn Jahres-Aufbau"]) / 1e9
+        final = proj.row(-1)
+        final_yr = int(final["Jahr"])
+        final_ext = -_sf(final["Ext. Externalities"]) / 1e9
+        final_fext = -_sf(final["Flynn Ext. Kosten"]) / 1e9
+        final_aufb = _sf(final["Flynn Jahres-Aufbau"]) / 1e9
         fig.add_annotation(
             x=final_yr, y=final_ext,
             text=t("bn_extractive") + f': {final_ext:,.0f}',
@@ -1227,12 +3250,13 @@ def chart_dialysis(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def chart_metamorphose(df: pd.DataFrame) -> go.Figure:
-    """Metamorphose: Kumulative Heilung — wann ist die Systemschuld abgetragen."""
-    years = df["Jahr"].values
-    saldo     = df["Netto-Systemsaldo"].values / 1e9          # Netto (gelbe Linie)
-    cum_ext   = (-df["Ext. Kum. Externalities"].values) / 1e9 # negativ = Schuld
-    cum_flynn = df["Flynn Kum. Wertschoepfung"].values / 1e9  # positiv = Aufbau
+def chart_metamorphose(df: SimResult, break_even: float | None = None) -> go.Figure:
+    """Metamorphose: Kumulative Heilung — wann ist die Systemschuld abgetragen.
+    `break_even` (from solve_break_even) labels crossings beyond the horizon."""
+    years = df["Jahr"]
+    saldo     = df["Netto-Systemsaldo"] / 1e9          # Netto (gelbe Linie)
+    cum_ext   = (-df["Ext. Kum. Externalities"]) / 1e9 # negativ = Schuld
+    cum_flynn = df["Flynn Kum. Wertschoepfung"] / 1e9  # positiv = Aufbau
 
     fig = go.Figure()
 
@@ -1270,50 +3294,39 @@ def chart_metamorphose(df: pd.DataFrame) -> go.Figure:
     )
 
     # ── Flynn start marker ──
-    first_proj = df[df["Phase"] == "Projektion"]["Jahr"].min()
+    first_proj = df[df.phase_mask("Projektion")]["Jahr"].min()
     fig.add_vline(
         x=first_proj, line_dash="dash", line_color="#2ecc71", line_width=1.5,
         annotation_text=t("flynn_starts"), annotation_position="top right",
         annotation_font_color="#2ecc71",
     )
 
-    # ── Check if / when net saldo reaches 0, or extrapolate ──
-    proj = df[df["Phase"] == "Projektion"]
-    eq_found = False
+    # ── Check if / when net saldo reaches 0, or use the solver beyond the horizon ──
+    proj = df[df.phase_mask("Projektion")]
     if len(proj) >= 2:
-        for i in range(1, len(proj)):
-            prev_s = proj.iloc[i - 1]["Netto-Systemsaldo"]
-            curr_s = proj.iloc[i]["Netto-Systemsaldo"]
-            if curr_s >= 0 and prev_s < 0:
-                frac = -prev_s / (curr_s - prev_s) if (curr_s - prev_s) != 0 else 0
-                eq_yr = proj.iloc[i - 1]["Jahr"] + frac
-                fig.add_annotation(
-                    x=eq_yr, y=0,
-                    text=t("equilibrium_approx", yr=f'{eq_yr:.0f}'),
-                    showarrow=True, arrowhead=2, ay=-50,
-                    font=dict(size=14, color="#f1c40f"),
-                    bgcolor="rgba(0,0,0,0.8)", bordercolor="#f1c40f",
-                )
-                eq_found = True
-                break
-
-    if not eq_found and len(proj) >= 2:
-        last_s = proj.iloc[-1]["Netto-Systemsaldo"]
-        prev_s = proj.iloc[-2]["Netto-Systemsaldo"]
-        annual_impr = last_s - prev_s
-        if annual_impr > 0 and last_s < 0:
-            yrs_to_eq = -last_s / annual_impr
-            est_yr = int(proj.iloc[-1]["Jahr"] + yrs_to_eq)
+        proj_years = proj["Jahr"]
+        proj_saldo = proj["Netto-Systemsaldo"]
+        eq_yr = _zero_crossing(proj_years[1:], proj_saldo[1:], proj_saldo[0],
+                               step=proj_years[1] - proj_years[0])
+        if not np.isnan(eq_yr):
+            fig.add_annotation(
+                x=float(eq_yr), y=0,
+                text=t("equilibrium_approx", yr=f'{eq_yr:.0f}'),
+                showarrow=True, arrowhead=2, ay=-50,
+                font=dict(size=14, color="#f1c40f"),
+                bgcolor="rgba(0,0,0,0.8)", bordercolor="#f1c40f",
+            )
+        elif break_even is not None and not np.isnan(break_even):
             fig.add_annotation(
-                x=float(proj.iloc[-1]["Jahr"]), y=saldo[-1],
-                text=t("forecast_eq", yr=est_yr),
+                x=proj_years[-1], y=saldo[-1],
+                text=t("forecast_eq", yr=int(break_even)),
                 showarrow=True, arrowhead=2, ay=-40,
                 font=dict(size=12, color="#f1c40f"),
                 bgcolor="rgba(0,0,0,0.7)", bordercolor="#f1c40f",
             )
-        elif annual_impr <= 0:
+        elif break_even is not None:
             fig.add_annotation(
-                x=float(proj.iloc[-1]["Jahr"]), y=saldo[-1],
+                x=proj_years[-1], y=saldo[-1],
                 text=t("eq_not_reachable"),
                 showarrow=True, arrowhead=2, ay=-40,
                 font=dict(size=12, color="#e74c3c"),
@@ -1333,6 +3346,212 @@ def chart_metamorphose(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
+def chart_backtest_heatmap(bt: dict[str, np.ndarray], metric: str) -> go.Figure:
+    """Start year × calendar year surface of a cumulative backtest metric (Bn)."""
+    z = bt[metric] / 1e9
+    years, starts = bt["years"], bt["start_years"]
+    fig = go.Figure(go.Heatmap(
+        x=years, y=starts, z=z,
+        colorscale="Viridis" if metric == "value_created" else "Tealgrn",
+        colorbar=dict(title=t("ann_bn")),
+        hovertemplate=t("bt_start") + " %{y} · %{x}: $%{z:,.0f} Bn<extra></extra>",
+    ))
+    # Regular Flynn start (today) as reference row
+    fig.add_hline(y=starts[-1], line_dash="dash", line_color="#00e5a0", line_width=1.5,
+                  annotation_text=t("flynn_starts"), annotation_position="bottom right",
+                  annotation_font_color="#00e5a0")
+    best = int(np.nanargmax(z[:, -1]))
+    fig.add_annotation(
+        x=years[-1], y=starts[best],
+        text=f"{starts[best]}: ${z[best, -1]:,.0f} Bn", showarrow=True, arrowhead=2, ax=-60, ay=0,
+        font=dict(size=13, color="#f1c40f"),
+        bgcolor="rgba(0,0,0,0.8)", bordercolor="#f1c40f",
+    )
+    fig.update_layout(
+        **_layout_defaults(),
+        title=dict(text=t(f"bt_{metric}"), font=dict(size=18)),
+        xaxis_title=t("year"), yaxis_title=t("bt_start"),
+    )
+    return fig
+
+
+def chart_ext_tensor_heatmap(matrix: np.ndarray) -> go.Figure:
+    """Company × category externality totals (Bn) from `tensor_total`."""
+    fig = go.Figure(go.Heatmap(
+        x=[_tcat(c) for c in EXT_CAT_NAMES], y=[NAMES.get(tk, tk) for tk in TICKERS],
+        z=matrix / 1e9, colorscale="Reds",
+        colorbar=dict(title=t("ann_bn")),
+        hovertemplate="%{y} · %{x}: $%{z:,.1f} Bn<extra></extra>",
+    ))
+    fig.update_layout(
+        **_layout_defaults(),
+        title=dict(text=t("drill_heatmap_title"), font=dict(size=18)),
+    )
+    fig.update_yaxes(autorange="reversed")
+    return fig
+
+
+def chart_ext_by_company(tensor: dict, category: str, mask: np.ndarray | None = None) -> go.Figure:
+    """Stacked per-company costs of one externality category over time."""
+    k = EXT_CAT_NAMES.index(category)
+    years = tensor["years"] if mask is None else tensor["years"][mask]
+    values = tensor["values"][:, k] if mask is None else tensor["values"][:, k][:, mask]
+    fig = go.Figure()
+    for tk, series in zip(TICKERS, values):
+        fig.add_trace(go.Scatter(
+            x=years, y=series, name=NAMES.get(tk, tk), mode="lines",
+            line=dict(color=TICKER_COLORS.get(tk), width=0.5), stackgroup="companies",
+            hovertemplate="%{x}: $%{y:,.0f}<extra>" + tk + "</extra>",
+        ))
+    fig.update_layout(
+        **_layout_defaults(),
+        title=dict(text=_tcat(category), font=dict(size=18)),
+        xaxis_title=t("year"), yaxis_title="USD",
+    )
+    return fig
+
+
+EXPLORER_METRICS = ("saldo", "delta_pct", "break_even")
+
+
+def chart_param_heatmap(grid: dict[str, np.ndarray], x_param: str, y_param: str,
+                        metric: str, current: tuple[float, float]) -> go.Figure:
+    """Heatmap of one explorer metric over two parameters; ◆ = current sliders."""
+    z = grid[metric] / 1e9 if metric == "saldo" else grid[metric]
+    unit = {"saldo": " Bn", "delta_pct": "%", "break_even": ""}[metric]
+    fmt = ",.0f" if metric != "break_even" else ".1f"
+    fig = go.Figure(go.Heatmap(
+        x=grid["x"], y=grid["y"], z=z,
+        colorscale="RdYlGn_r" if metric == "break_even" else "RdYlGn",
+        zmid=0 if metric == "saldo" else None,
+        colorbar=dict(title=unit.strip() or t("year")),
+        hovertemplate=f"{t(PARAM_LABELS[x_param])}: %{{x:.3f}}<br>{t(PARAM_LABELS[y_param])}: %{{y:.3f}}"
+                      f"<br>%{{z:{fmt}}}{unit}<extra></extra>",
+    ))
+    fig.add_trace(go.Scatter(
+        x=[current[0]], y=[current[1]], mode="markers", showlegend=False,
+        marker=dict(symbol="diamond", size=13, color="#ffffff", line=dict(color="#000000", width=2)),
+        hoverinfo="skip",
+    ))
+    fig.update_layout(
+        **_layout_defaults(),
+        title=dict(text=t(f"explorer_{metric}"), font=dict(size=18)),
+    )
+    fig.update_xaxes(title=t(PARAM_LABELS[x_param]))
+    fig.update_yaxes(title=t(PARAM_LABELS[y_param]))
+    return fig
+
+
+STRESS_COLORS = {"baseline": COLORS["flynn"], "dotcom": "#6ea8fe", "gfc": COLORS["extractive"],
+                 "covid": "#fbbf24", "custom": "#c084fc"}
+
+
+def chart_stress_paths(res: dict[str, np.ndarray], metric: str = "Netto-Systemsaldo") -> go.Figure:
+    """One projection column (Bn, Delta in %) per stress scenario; baseline dashed."""
+    pct = metric == "Delta (%)"
+    fig = go.Figure()
+    for j, name in enumerate(STRESS_SCENARIOS):
+        y = res[metric][:, j] if pct else res[metric][:, j] / 1e9
+        fig.add_trace(go.Scatter(
+            x=res["years"], y=y, name=t(f"stress_{name}"), mode="lines+markers",
+            line=dict(color=STRESS_COLORS[name], width=3 if name == "baseline" else 2,
+                      dash="dash" if name == "baseline" else "solid"),
+            hovertemplate="%{x}: " + ("%{y:,.1f}%" if pct else "$%{y:,.0f} Bn") + f"<extra>{t(f'stress_{name}')}</extra>",
+        ))
+    fig.update_layout(
+        **_layout_defaults(),
+        title=dict(text=t(f"stress_metric_{STRESS_COLUMNS.index(metric)}"), font=dict(size=18)),
+        xaxis_title=t("year"), yaxis_title="%" if pct else t("ann_bn"),
+    )
+    return fig
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  EXPORT — generated on demand, written chunk by chunk
+#  Nothing is serialized during a normal rerun: the download buttons get a
+#  callable that Streamlit only runs when the user actually clicks.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+EXPORT_FORMATS = {
+    "csv":     ("text/csv", ".csv"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+    "arrow":   ("application/vnd.apache.arrow.stream", ".arrow"),
+}
+EXPORT_CHUNK_ROWS = 50_000
+_EXPORT_SPOOL_BYTES = 32 * 1024 * 1024   # larger exports spill to a temp file
+
+
+def available_export_formats() -> list[str]:
+    return [f for f in EXPORT_FORMATS if f == "csv" or ARROW_AVAILABLE]
+
+
+def iter_export_chunks(df: SimResult, view: str = "full",
+                       chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Yield the export rows for `view` in chunks of at most `chunk_rows`
+    source rows:
+    - "full":       the simulation timeline as is
+    - "categories": long format, one row per (year, externality category)
+    - "companies":  long format, one row per (year, ticker) incl. the
+                    per-company series when the simulation produced them
+    """
+    for start in range(0, len(df), chunk_rows):
+        chunk = df[start:start + chunk_rows]
+        if view == "full":
+            yield chunk.to_pandas()
+        elif view == "categories":
+            parts = [pd.DataFrame({
+                "Jahr": chunk.years(), "Phase": chunk["Phase"],
+                "Kategorie": cat_name, "Index": cfg["index"].upper(),
+                "Revenue": chunk["Revenue"],
+                "Ext. Kosten": chunk[f"Ext. {cat_name}"],
+            }) for cat_name, cfg in EXT_CATEGORIES.items() if f"Ext. {cat_name}" in chunk.columns]
+            if parts:
+                yield pd.concat(parts, ignore_index=True).sort_values(["Jahr", "Kategorie"], kind="stable")
+        elif view == "companies":
+            series = ["Kurs", "Net Income", "Revenue"] + COMPANY_SERIES
+            parts = []
+            for tk in TICKERS:
+                cols = {s: f"{tk} {s}" for s in series if f"{tk} {s}" in chunk.columns}
+                part = pd.DataFrame({"Jahr": chunk.years(), "Phase": chunk["Phase"],
+                                     "Ticker": tk})
+                for s, c in cols.items():
+                    part[s] = chunk[c]
+                parts.append(part)
+            yield pd.concat(parts, ignore_index=True).sort_values(["Jahr", "Ticker"], kind="stable")
+        else:
+            raise ValueError(f"unknown export view: {view}")
+
+
+def write_export(chunks: Iterator[pd.DataFrame], fmt: str) -> IO[bytes]:
+    """
+    Encode chunks into a spooled file (in memory up to _EXPORT_SPOOL_BYTES,
+    on disk beyond) and return it rewound. Only one chunk is held as a
+    DataFrame at a time; Parquet gets one row group per chunk.
+    """
+    out = tempfile.SpooledTemporaryFile(max_size=_EXPORT_SPOOL_BYTES)
+    writer = schema = None
+    for i, chunk in enumerate(chunks):
+        if fmt == "csv":
+            out.write(chunk.to_csv(index=False, header=(i == 0)).encode("utf-8"))
+            continue
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            schema = table.schema
+            writer = (pq.ParquetWriter(out, schema) if fmt == "parquet"
+                      else pa.ipc.new_stream(out, schema))
+        writer.write_table(table.cast(schema))
+    if writer is not None:
+        writer.close()
+    out.seek(0)
+    return out
+
+
+def export_callable(df: SimResult, view: str, fmt: str) -> Callable[[], IO[bytes]]:
+    """Deferred export for st.download_button — runs only on click."""
+    return lambda: write_export(iter_export_chunks(df, view), fmt)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  FORMATTING HELPERS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -1354,13 +3573,403 @@ def fmt_usd(v) -> str:
 #  MAIN UI
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def _slider_args(name: str) -> dict:
+    """Slider kwargs for a PARAM_BOUNDS entry; the default is seeded in session
+    state so other widgets (e.g. the optimizer) can move the slider."""
+    lo, hi, default, step = PARAM_BOUNDS[name]
+    st.session_state.setdefault(name, default)
+    return dict(min_value=lo, max_value=hi, step=step, key=name)
+
+
+def _apply_params(params: dict[str, float]) -> None:
+    """Button callback: move the sidebar sliders (keyed by parameter name)."""
+    for name, value in params.items():
+        st.session_state[name] = value
+
+
+@st.cache_resource(show_spinner=False)
+def _chart_reads() -> dict[str, frozenset]:
+    """Columns each chart read when it was last built, in any session."""
+    return {}
+
+
+def _memo_figure(chart: Callable[..., go.Figure], df: SimResult, *args) -> go.Figure:
+    """
+    Reuse the figure of the previous rerun when none of the columns the chart
+    read last time (nor its other arguments or the language) has changed;
+    otherwise look for the same figure, serialized, in the shared cache.
+    """
+    memo = st.session_state.setdefault("_fig_memo", {})
+    name = chart.__name__
+    extra = repr((args, st.session_state.get("lang", "en")))
+    prev = memo.get(name)
+    if prev is not None and prev["extra"] == extra and prev["key"] == df.fingerprint(prev["reads"]):
+        return prev["fig"]
+    reads = _chart_reads().get(name)
+    fig_json = None if reads is None else cache_get(f"fig:{name}:{df.fingerprint(reads)}:{extra}")
+    if fig_json is not None:
+        fig = pio.from_json(fig_json, skip_invalid=True)
+    else:
+        tracked = df.tracked()
+        fig = chart(tracked, *args)
+        reads = _chart_reads()[name] = frozenset(tracked.reads)
+        cache_set(f"fig:{name}:{df.fingerprint(reads)}:{extra}", fig.to_json(), 3600)
+    memo[name] = dict(extra=extra, reads=reads, key=df.fingerprint(reads), fig=fig)
+    return fig
+
+
+# ── Tab bodies with their own widgets (rendered by _result_tabs) ──
+def _drilldown_tab(df: SimResult) -> None:
+    tensor = externality_tensor(df)
+    span = st.radio(t("drill_span"), ("all", "past", "future"), horizontal=True,
+                    format_func=lambda k: t(f"drill_{k}"), key="_drill_span")
+    phase = tensor["phase"]
+    mask = None if span == "all" else (phase == "Projektion") if span == "future" else (phase != "Projektion")
+    st.plotly_chart(chart_ext_tensor_heatmap(tensor_total(tensor, ("company", "category"), mask)),
+                    width="stretch")
+    cc, ck = st.columns(2)
+    company = cc.selectbox(t("drill_company"), [None] + TICKERS, key="_drill_company",
+                           format_func=lambda tk: t("drill_all_companies") if tk is None else NAMES.get(tk, tk))
+    category = ck.selectbox(t("drill_category"), EXT_CAT_NAMES, format_func=_tcat, key="_drill_category")
+    st.plotly_chart(chart_ext_by_company(tensor, category, mask), width="stretch")
+    sub = subcategory_breakdown(tensor, category, company, mask)
+    dims = [c for c in sub.columns if c != "Ext. Kosten"]
+    table = sub.pivot_table(index=dims[0], columns=dims[1], values="Ext. Kosten", aggfunc="sum", sort=False) \
+        if len(dims) >= 2 else sub.set_index(dims[0])
+    st.markdown(f"**{t('drill_sub_title', cat=_tcat(category))}**")
+    st.dataframe(table.map(lambda v: f"${v / 1e9:,.2f}B"), width="stretch")
+    st.caption(t("cap_drilldown", c=len(TICKERS), k=len(EXT_CAT_NAMES), y=len(tensor["years"]),
+                 kb=f"{tensor['values'].nbytes / 1024:,.0f}", s=len(EXT_SUBCATEGORIES)))
+
+
+def _backtest_tab(annual_df: SimResult, scenario: dict) -> None:
+    bt = run_backtest_sweep(annual_df, **{k: scenario[k] for k in
+                                          ("gamma", "dr_0", "beta", "q_b_share", "ext_degrad")})
+    bt_metric = st.radio(t("bt_metric"), ["value_created", "debt_avoided"], horizontal=True,
+                         format_func=lambda m: t(f"bt_{m}"), key="_bt_metric")
+    st.plotly_chart(chart_backtest_heatmap(bt, bt_metric), width="stretch")
+    st.caption(t("cap_backtest", start=int(bt["start_years"][0]), end=int(bt["years"][-1])))
+
+
+def _combined_annual_only(per_company: bool, steps_per_year: int) -> bool:
+    """
+    Gate for the tabs built on run_batch_simulation, which only has the
+    combined annual model: a note when it matches the displayed run, else
+    an explanation and False, so the tab stays off.
+    """
+    if per_company or steps_per_year != 1:
+        st.info(t("batch_model_off"))
+        return False
+    st.caption(t("batch_model_note"))
+    return True
+
+
+def _explorer_tab(hist_df: pd.DataFrame, scenario: dict) -> None:
+    axes = [p for p in PARAM_BOUNDS if p != "proj_years"]
+    cx, cy, cm = st.columns(3)
+    x_param = cx.selectbox(t("explorer_x"), axes, index=axes.index("gamma"),
+                           format_func=lambda p: t(PARAM_LABELS[p]), key="_ex_x")
+    y_axes = [p for p in axes if p != x_param]
+    y_param = cy.selectbox(t("explorer_y"), y_axes, index=y_axes.index("dr_0") if "dr_0" in y_axes else 0,
+                           format_func=lambda p: t(PARAM_LABELS[p]), key="_ex_y")
+    ex_metric = cm.selectbox(t("bt_metric"), EXPLORER_METRICS,
+                             format_func=lambda m: t(f"explorer_{m}"), key="_ex_metric")
+    fixed = tuple(sorted((k, v) for k, v in scenario.items() if k not in (x_param, y_param)))
+    grid = explorer_grid(hist_df, x_param, y_param, fixed)
+    st.plotly_chart(chart_param_heatmap(grid, x_param, y_param, ex_metric,
+                                        (scenario[x_param], scenario[y_param])), width="stretch")
+    st.caption(t("cap_explorer", n=len(grid["x"]), m=EXPLORER_MAX_YEARS))
+
+
+def _optimizer_tab(hist_df: pd.DataFrame, scenario: dict, current_year: int) -> None:
+    st.caption(t("opt_intro"))
+    objective = st.radio(t("opt_objective"), OPT_OBJECTIVES, horizontal=True,
+                         format_func=lambda o: t(f"opt_{o}"), key="_opt_objective")
+    target, target_year = 0.0, None
+    if objective == "target_saldo":
+        ct, cy = st.columns(2)
+        target = ct.number_input(t("opt_target"), value=0.0, step=50.0, key="_opt_target") * 1e9
+        target_year = int(cy.number_input(t("opt_target_year"), min_value=current_year + 1,
+                                          max_value=current_year + OPT_MAX_YEARS,
+                                          value=current_year + scenario["proj_years"], step=1, key="_opt_year"))
+    fixed = tuple(sorted((k, v) for k, v in scenario.items() if k not in OPT_PARAMS))
+    if st.button(t("opt_run"), type="primary", key="_opt_run"):
+        st.session_state["_opt_result"] = optimize_allocation(
+            hist_df, objective, fixed, target=target, target_year=target_year)
+    res = st.session_state.get("_opt_result")
+    if res:
+        c1, c2, c3, c4 = st.columns(4)
+        for cw, p_name in zip((c1, c2, c3), OPT_PARAMS):
+            cw.metric(t(PARAM_LABELS[p_name]), f"{res['params'][p_name]:.3f}",
+                      f"{res['params'][p_name] - scenario[p_name]:+.3f}", delta_color="off")
+        ach = res["achieved"]
+        c4.metric(t("opt_achieved"),
+                  "—" if np.isnan(ach) else (f"{ach:.1f}" if objective == "min_break_even" else fmt_usd(ach)),
+                  t("opt_evaluated", n=res["evaluated"]), delta_color="off")
+        # Moving the sidebar sliders needs a full rerun, not just this fragment
+        if st.button(t("opt_apply"), key="_opt_apply", on_click=_apply_params, args=(res["params"],)):
+            st.rerun(scope="app")
+
+
+def _stress_tab(hist_df: pd.DataFrame, scenario: dict, current_year: int) -> None:
+    proj_years = int(scenario["proj_years"])
+    co, cd, cr = st.columns(3)
+    onset_year = co.slider(t("stress_onset"), current_year + 1, current_year + proj_years,
+                           current_year + 1, key="_st_onset")
+    drawdown = cd.slider(t("stress_drawdown"), 0, 60, 30, 5, format="%d%%", key="_st_drawdown")
+    recovery = cr.slider(t("stress_recovery"), 1, 10, 3, key="_st_recovery")
+    res = stress_test(hist_df, tuple(sorted(scenario.items())), onset_year - current_year - 1,
+                      (drawdown / 100, recovery))
+    metric = st.radio(t("bt_metric"), STRESS_COLUMNS, horizontal=True,
+                      format_func=lambda m: t(f"stress_metric_{STRESS_COLUMNS.index(m)}"), key="_st_metric")
+    st.plotly_chart(chart_stress_paths(res, metric), width="stretch")
+    table = stress_table(res)
+    st.dataframe(pd.DataFrame({
+        t("stress_col_scenario"): [t(f"stress_{s}") for s in table["scenario"]],
+        t("stress_col_trough"): table["trough_pct"].map(lambda v: f"{v:+.1f}%"),
+        t("stress_col_value"): table["value"].map(fmt_usd),
+        t("stress_col_vs_base"): table["value_vs_base_pct"].map(lambda v: f"{v:+.1f}%"),
+        t("stress_col_saldo"): table["saldo"].map(fmt_usd),
+        t("stress_col_delta"): table["delta_pct"].map(lambda v: f"{v:,.1f}%"),
+        t("stress_col_break_even"): table["break_even"].map(lambda v: "—" if np.isnan(v) else f"{v:.1f}"),
+    }), width="stretch", hide_index=True)
+    st.caption(t("cap_stress", n=len(STRESS_SCENARIOS)))
+
+
+def _data_tab(df: SimResult, final: dict, per_company: bool) -> None:
+    if per_company:
+        st.markdown(f"##### {t('company_table_title', yr=int(final['Jahr']))}")
+        company_df = pd.DataFrame({
+            series: [f'{final[f"{tk} {series}"]:.3f}' if series.endswith(("EHI", "HRI", "IRI"))
+                     else fmt_usd(final[f"{tk} {series}"]) for tk in TICKERS]
+            for series in COMPANY_SERIES
+        }, index=[f"{NAMES.get(tk, tk)} ({tk})" for tk in TICKERS])
+        st.dataframe(company_df, width="stretch")
+    with st.expander(t('data_table_title'), expanded=False):
+        if st.toggle(t("show_table"), value=False, key="_show_table"):
+            st.dataframe(df.to_pandas(), width="stretch", height=500)
+        fmt = st.radio(t("export_format"), available_export_formats(), horizontal=True,
+                       format_func=str.upper, key="_export_fmt")
+        mime, ext = EXPORT_FORMATS[fmt]
+        for cw, view in zip(st.columns(3), ("full", "categories", "companies")):
+            cw.download_button(
+                t(f"export_{view}"), export_callable(df, view, fmt),
+                f"flynn_matrix_{view}{ext}", mime, on_click="ignore", key=f"_export_{view}",
+            )
+
+
+def _index_label(spec) -> str:
+    """Index column of the math reference: 'EHI', or a weighted mix like '0.5·EHI + 0.5·HRI'."""
+    if isinstance(spec, str):
+        return spec.upper()
+    total = sum(spec.values())
+    return " + ".join(f"{w / total:.2g}·{k.upper()}" for k, w in spec.items() if w)
+
+
+@st.fragment
+def _math_reference() -> None:
+    """Math reference expander; its (LaTeX-heavy) content is only sent while open."""
+    expander = st.expander(t("math_ref_title"), expanded=False, key="_math_ref", on_change="rerun")
+    if expander.open:
+        with expander:
+            st.markdown(t("math_alloc"))
+            st.markdown(t("math_dialysis"))
+            st.markdown(t("math_roi"))
+            st.markdown(t("math_metamorphose"))
+            st.markdown(t("math_wellness"))
+            st.markdown(t("math_ext_title"))
+            st.markdown(t("math_cat_header") + "\n|---|---|---|\n" + "".join(
+                f"| {_tcat(name)} | ${cfg['rate']:.4g} \\cdot Rev \\cdot "
+                f"(1-{cfg['index'].upper() if isinstance(cfg['index'], str) else f'I_{{{k}}}'})$ | {_index_label(cfg['index'])} |\n"
+                for k, (name, cfg) in enumerate(EXT_CATEGORIES.items(), 1)))
+            st.markdown(rf"$$C_{{ext}} = \sum_{{k=1}}^{{{len(EXT_CATEGORIES)}}} r_k \cdot Rev \cdot (1 - I_k)$$")
+            total = sum(cfg["rate"] for cfg in EXT_CATEGORIES.values())
+            st.markdown(t("math_ext_formula", total=f"{total:.2f}", share=f"{total:.0%}"))
+            st.markdown(t("math_cum_destruction"))
+            st.markdown(t("math_flynn_value"))
+            st.markdown(t("math_cum_flynn"))
+            st.markdown(t("math_gap"))
+            st.markdown(t("math_ext_true"))
+
+
+@st.fragment
+def _diagnostics(df: SimResult) -> None:
+    """Runtime diagnostics: market data, circuit breakers, shared cache, result memory."""
+    expander = st.expander(t("diag_title"), expanded=False, key="_diag", on_change="rerun")
+    if expander.open:
+        with expander:
+            store = market_data_store()
+            st.caption(t("diag_market"))
+            st.dataframe(store.status().round(3), width="stretch", hide_index=True)
+            st.caption(t("diag_breakers"))
+            breakers = breaker_status()
+            if not breakers.empty:
+                st.dataframe(breakers.round(1), width="stretch", hide_index=True)
+            fallback = fallback_datasets()
+            if fallback:
+                st.caption(t("diag_fallback", items=", ".join(fallback)))
+            cache = cache_backend().status()
+            st.caption(t("diag_cache", backend=cache["backend"], hits=cache["hits"],
+                         misses=cache["misses"], errors=cache["errors"],
+                         ratio=f"{cache['hit_ratio']:.0%}" if cache["hits"] + cache["misses"] else "–"))
+            report = memory_report(df)
+            stored = report.iloc[-1]
+            st.caption(t("diag_memory", dense=f"{report['dense_bytes'].iloc[:-1].sum() / 1024:,.0f}",
+                         plain=f"{stored['dense_bytes'] / 1024:,.0f}",
+                         packed=f"{stored['packed_bytes'] / 1024:,.0f}",
+                         mode=t("diag_compact_on" if COMPACT else "diag_compact_off")))
+            st.dataframe(report, width="stretch", hide_index=True)
+            st.caption(t("diag_jit_on" if _jit_recurrence() is not None else
+                         "diag_jit_off" if NUMBA_AVAILABLE else "diag_jit_missing"))
+
+
+def _calibration(rows: list[dict]) -> None:
+    """Sidebar panel: calibrated vs hand-set rates; the button moves the sliders."""
+    with st.expander(t("calib_title"), expanded=False):
+        labels = {"growth_rate": t("growth_label"), "ext_degrad": t("degrad_label")}
+        fmt = lambda v: "—" if np.isnan(v) else f"{v:.4f}"
+        st.dataframe(pd.DataFrame({
+            t("calib_col_param"): [labels.get(r["param"]) or t("calib_retro_slope", idx=r["param"][-3:].upper())
+                                   for r in rows],
+            t("calib_col_hand"): [fmt(r["hand_set"]) for r in rows],
+            t("calib_col_fit"): [fmt(r["estimate"]) for r in rows],
+            t("calib_col_ci"): ["—" if np.isnan(r["estimate"]) else f"{r['lo']:.4f} – {r['hi']:.4f}" for r in rows],
+            "n": [r["n"] for r in rows],
+        }), width="stretch", hide_index=True)
+        st.caption(t("cap_calib"))
+        st.button(t("calib_apply"), key="_calib_apply", on_click=_apply_params,
+                  args=(calibrated_defaults(rows),))
+
+
+@st.fragment
+def _result_tabs(df: SimResult, chart_df: SimResult, annual_df: SimResult, hist_df: pd.DataFrame,
+                 final: dict, break_even: float, scenario: dict, per_company: bool,
+                 steps_per_year: int) -> None:
+    """
+    Result tabs as one fragment: only the open tab is rendered, and switching
+    tabs or using a tab's own widgets reruns this fragment, not the page.
+    """
+    current_year = _projection_base(hist_df)[0]
+    first_year = int(min(hist_df.index)) if len(hist_df.index) else current_year
+    retro_start = int(df["Jahr"].min())
+    tab0, tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab_dd, tab_bt, tab_ex, tab_opt, tab_st, tab8 = st.tabs([
+        t("tab_cum_destruction"), t("tab_annual"),
+        t("tab_stocks"), t("tab_netincome"), t("tab_comparison"),
+        t("tab_flynn_pct"), t("tab_indices"),
+        t("tab_dialysis"), t("tab_drilldown"), t("tab_backtest"), t("tab_explorer"),
+        t("tab_optimizer"), t("tab_stress"), t("tab_data"),
+    ], key="_tab", on_change="rerun", bind="query-params")
+
+    if tab0.open:
+        with tab0:
+            st.plotly_chart(_memo_figure(chart_cumulative_destruction, chart_df), width="stretch")
+            st.caption(t("cap_cum_destruction", yr=first_year))
+            # ── Per-category breakdown table (ALL years: historical + projection) ──
+            with st.expander(t('all_categories_title', start=retro_start), expanded=False):
+                cat_cols = ["Jahr", "Phase", "Revenue"] + [f"Ext. {c}" for c in EXT_CAT_NAMES] + [
+                    "Ext. Externalities", "Ext. Kum. Externalities"]
+                cat_cols_avail = [c for c in cat_cols if c in df.columns]
+                breakdown = df.to_pandas(cat_cols_avail)
+                nice_names = {"Jahr": t("col_year"), "Phase": t("col_phase"), "Revenue": t("col_revenue"),
+                              "Ext. Externalities": t("col_sum"),
+                              "Ext. Kum. Externalities": t("col_cumulated")}
+                for cn in EXT_CAT_NAMES:
+                    nice_names[f"Ext. {cn}"] = f"{EXT_CATEGORIES[cn]['icon']} {_tcat(cn)}"
+                breakdown.rename(columns=nice_names, inplace=True)
+                for c in breakdown.columns:
+                    if c not in (t("col_year"), t("col_phase")):
+                        breakdown[c] = breakdown[c].apply(lambda v: f"${_sf(v)/1e9:,.2f}B")
+                st.dataframe(breakdown, width="stretch", hide_index=True)
+
+            with st.expander(t('cum_gap_title', start=retro_start), expanded=False):
+                schere_df = df.to_pandas(["Jahr", "Phase", "Ext. Kum. Externalities",
+                                          "Flynn Kum. Wertschoepfung", "Kum. Schere (abs)"])
+                schere_df.columns = [t("col_year"), t("col_phase"), t("col_cum_debt_ext"),
+                                     t("col_cum_building_flynn"), t("col_gap")]
+                for c in schere_df.columns:
+                    if c not in (t("col_year"), t("col_phase")):
+                        schere_df[c] = schere_df[c].apply(lambda v: f"${_sf(v)/1e9:,.2f}B")
+                st.dataframe(schere_df, width="stretch", hide_index=True)
+
+    if tab1.open:
+        with tab1:
+            st.plotly_chart(_memo_figure(chart_annual_comparison, chart_df), width="stretch")
+            st.caption(t("cap_annual"))
+
+    if tab2.open:
+        with tab2:
+            st.plotly_chart(_memo_figure(chart_stock_prices, chart_df), width="stretch")
+            st.caption(t("cap_stocks"))
+
+    if tab3.open:
+        with tab3:
+            st.plotly_chart(_memo_figure(chart_net_income, chart_df), width="stretch")
+            st.caption(t("cap_netincome"))
+
+    if tab4.open:
+        with tab4:
+            st.plotly_chart(_memo_figure(chart_value_comparison, chart_df), width="stretch")
+            st.caption(t("cap_comparison"))
+
+    if tab5.open:
+        with tab5:
+            st.plotly_chart(_memo_figure(chart_delta_bars, chart_df), width="stretch")
+
+    if tab6.open:
+        with tab6:
+            st.plotly_chart(_memo_figure(chart_indices_compare, chart_df), width="stretch")
+            st.markdown("##### {}".format(t("index_change_to", yr=int(final["Jahr"]))))
+            c1, c2, c3 = st.columns(3)
+            for cw, nm in [(c1, "EHI"), (c2, "HRI"), (c3, "IRI")]:
+                with cw:
+                    st.metric(f"{nm} {t('label_extractive')}", f'{final[f"Ext. {nm}"]:.3f}',
+                              f'{((final[f"Ext. {nm}"] / max(0.01, scenario[f"{nm.lower()}_0"])) - 1)*100:+,.0f}%')
+                    st.metric(f"{nm} Flynn", f'{final[f"Flynn {nm}"]:.3f}',
+                              f'{((final[f"Flynn {nm}"] / max(0.01, scenario[f"{nm.lower()}_0"])) - 1)*100:+,.0f}%')
+
+    if tab7.open:
+        with tab7:
+            st.plotly_chart(_memo_figure(chart_dialysis, chart_df), width="stretch")
+            st.caption(t("cap_dialysis"))
+            st.markdown("---")
+            st.plotly_chart(_memo_figure(chart_metamorphose, chart_df, break_even), width="stretch")
+            st.caption(t("cap_metamorphose"))
+
+    if tab_dd.open:
+        with tab_dd:
+            _drilldown_tab(df)
+
+    if tab_bt.open:
+        with tab_bt:
+            _backtest_tab(annual_df, scenario)
+
+    if tab_ex.open:
+        with tab_ex:
+            if _combined_annual_only(per_company, steps_per_year):
+                _explorer_tab(hist_df, scenario)
+
+    if tab_opt.open:
+        with tab_opt:
+            if _combined_annual_only(per_company, steps_per_year):
+                _optimizer_tab(hist_df, scenario, current_year)
+
+    if tab_st.open:
+        with tab_st:
+            if _combined_annual_only(per_company, steps_per_year):
+                _stress_tab(hist_df, scenario, current_year)
+
+    if tab8.open:
+        with tab8:
+            _data_tab(df, final, per_company)
+
+
 def main():
     # ── Language selector (top of sidebar, BEFORE any other sidebar widget) ──
     with st.sidebar:
         lang_options = list(LANGUAGES.keys())
         lang_choice = st.selectbox(
             "🌐 Language", lang_options, index=0,
-            key="_lang_sel",
+            key="_lang_sel", bind="query-params",
         )
         st.session_state["lang"] = LANGUAGES[lang_choice]
 
@@ -1387,6 +3996,10 @@ def main():
     hist_years = sorted(hist_df.index.tolist())
     current_year = hist_years[-1] if hist_years else 2025
     latest_ni = float(hist_df.loc[current_year, "Combined_NI"]) if current_year in hist_df.index else 12e9
+    calib = calibrate(hist_df)
+    if CALIBRATED_DEFAULTS:
+        for name, value in calibrated_defaults(calib).items():
+            st.session_state.setdefault(name, value)
 
     # ── Sidebar: Parameters ──
     with st.sidebar:
@@ -1395,42 +4008,59 @@ def main():
         st.divider()
 
         st.markdown(f"### {t('sidebar_flynn')}")
-        gamma = st.slider(t("gamma_label"), 0.0, 3.0, 1.0, 0.05,
+        gamma = st.slider(t("gamma_label"), **_slider_args("gamma"),
             help=t("gamma_help"))
-        dr_0 = st.slider(t("dr0_label"), 0.01, 0.20, 0.05, 0.005, format="%.3f",
+        dr_0 = st.slider(t("dr0_label"), **_slider_args("dr_0"), format="%.3f",
             help=t("dr0_help"))
-        beta = st.slider(t("beta_label"), 0.0, 0.50, 0.15, 0.01,
+        beta = st.slider(t("beta_label"), **_slider_args("beta"),
             help=t("beta_help"))
 
         st.divider()
         st.markdown(f"### {t('sidebar_indices')}")
-        ehi_0 = st.slider(t("ehi_label"), 0.1, 0.9, 0.30, 0.05)
-        hri_0 = st.slider(t("hri_label"),  0.1, 0.9, 0.40, 0.05)
-        iri_0 = st.slider(t("iri_label"),         0.1, 0.9, 0.50, 0.05)
+        ehi_0 = st.slider(t("ehi_label"), **_slider_args("ehi_0"))
+        hri_0 = st.slider(t("hri_label"), **_slider_args("hri_0"))
+        iri_0 = st.slider(t("iri_label"), **_slider_args("iri_0"))
 
         st.divider()
         st.markdown(f"### {t('sidebar_alloc')}")
-        q_b_share = st.slider(t("bio_share"), 0.0, 1.0, 0.50, 0.05)
+        q_b_share = st.slider(t("bio_share"), **_slider_args("q_b_share"))
 
         st.divider()
         st.markdown(f"### {t('sidebar_extract')}")
-        ext_degrad = st.slider(t("degrad_label"), 0.01, 0.10, 0.04, 0.005, format="%.1f%%",
+        ext_degrad = st.slider(t("degrad_label"), **_slider_args("ext_degrad"), format="%.1f%%",
             help=t("degrad_help"))
-        growth_rate = st.slider(t("growth_label"), 0.0, 0.15, 0.04, 0.005, format="%.1f%%")
-        proj_years = st.slider(t("proj_years_label"), 5, 20, 10, 1)
-
-    # ── Run full simulation ──
-    df = run_full_simulation(
+        growth_rate = st.slider(t("growth_label"), **_slider_args("growth_rate"), format="%.1f%%")
+        proj_years = st.slider(t("proj_years_label"), **_slider_args("proj_years"))
+        time_step = st.selectbox(t("time_step_label"), list(TIME_STEPS),
+            format_func=lambda k: t(f"step_{k}"), help=t("time_step_help"))
+        per_company = st.toggle(t("per_company_label"), value=False,
+            help=t("per_company_help"))
+        _calibration(calib)
+
+    # ── Run full simulation (shared cache first, else incrementally: one memo per timeline variant) ──
+    sim_memo = st.session_state.setdefault("_sim_memo", {})
+    df = shared_full_simulation(
         hist_df=hist_df, proj_years=proj_years, growth_rate=growth_rate,
         gamma=gamma, dr_0=dr_0, beta=beta,
         ehi_0=ehi_0, hri_0=hri_0, iri_0=iri_0,
-        q_b_share=q_b_share, ext_degrad=ext_degrad,
+        q_b_share=q_b_share, ext_degrad=ext_degrad, per_company=per_company,
+        steps_per_year=TIME_STEPS[time_step],
+        period_prices=fetch_period_prices(TIME_STEPS[time_step]) if YF_AVAILABLE else None,
+        memo=sim_memo.setdefault((per_company, TIME_STEPS[time_step]), {}),
+    )
+    chart_df = decimate_for_chart(df)
+    annual_df = df if TIME_STEPS[time_step] == 1 else shared_full_simulation(
+        hist_df=hist_df, proj_years=proj_years, growth_rate=growth_rate,
+        gamma=gamma, dr_0=dr_0, beta=beta,
+        ehi_0=ehi_0, hri_0=hri_0, iri_0=iri_0,
+        q_b_share=q_b_share, ext_degrad=ext_degrad, per_company=per_company,
+        columns=BACKTEST_COLUMNS, memo=sim_memo.setdefault((per_company, "annual"), {}),
     )
 
-    proj = df[df["Phase"] == "Projektion"]
-    final = proj.iloc[-1] if not proj.empty else df.iloc[-1]
-    hist_rows = df[df["Phase"].isin(["Historisch", "Retropolation"])]
-    hist_last = hist_rows.iloc[-1] if len(hist_rows) > 0 else df.iloc[0]
+    proj = df[df.phase_mask("Projektion")]
+    final = proj.row(-1) if not proj.empty else df.row(-1)
+    hist_rows = df[df.phase_mask("Historisch", "Retropolation")]
+    hist_last = hist_rows.row(-1) if len(hist_rows) > 0 else df.row(0)
     retro_start = int(df["Jahr"].min())
 
     # ── Live Data KPIs ──
@@ -1463,7 +4093,7 @@ def main():
         unsafe_allow_html=True,
     )
 
-    c1, c2, c3, c4, c5 = st.columns(5)
+    c1, c2, c3, c4, c5, c6 = st.columns(6)
 
     # Historical debt (30 years before Flynn existed)
     hist_debt = _sf(hist_last.get("Ext. Kum. Externalities", 0))
@@ -1496,11 +4126,38 @@ def main():
         t("per_year_rising"),
         delta_color="inverse",
     )
+    # Extractive path a century out — closed form, independent of proj_years
+    n = TIME_STEPS[time_step]
+    S_0, Rev_0 = extractive_base(hist_df, per_company)
+    ext_params = dict(growth_rate=growth_rate, ehi_0=ehi_0, hri_0=hri_0, iri_0=iri_0,
+                      ext_degrad=ext_degrad, steps_per_year=n)
+    century = extractive_totals(CENTURY_YEARS * n, S_0, Rev_0, cum_ext_0=hist_debt, **ext_params)
+    century_yr = extractive_at(np.arange((CENTURY_YEARS - 1) * n + 1, CENTURY_YEARS * n + 1),
+                               S_0, Rev_0, **ext_params)
+    c6.metric(
+        t("cum_destruction_century", yr=current_year + CENTURY_YEARS),
+        f'-{fmt_usd(century["Ext. Kum. Externalities"])}',
+        t("ext_in_year", v=fmt_usd(century_yr["Ext. Externalities"].sum())),
+        delta_color="inverse",
+    )
 
     # ── Projection Results ──
     st.markdown("---")
     st.markdown(f"### {t('result_heading', start=current_year + 1, end=int(final['Jahr']))}")
-    c1, c2, c3, c4, c5 = st.columns(5)
+    # Break-even of the net system balance: plotted series first, solver beyond the horizon
+    proj_jahr = proj["Jahr"]
+    break_even = _zero_crossing(
+        proj_jahr, proj["Netto-Systemsaldo"], -_sf(hist_last.get("Ext. Kum. Externalities", 0)),
+        step=(proj_jahr[1] - proj_jahr[0]) if len(proj_jahr) > 1 else 1.0,
+    ) if not proj.empty else np.nan
+    if np.isnan(break_even):
+        break_even = shared_break_even(
+            hist_df=hist_df, proj_years=proj_years, growth_rate=growth_rate, gamma=gamma, dr_0=dr_0,
+            beta=beta, ehi_0=ehi_0, hri_0=hri_0, iri_0=iri_0, q_b_share=q_b_share, ext_degrad=ext_degrad,
+            per_company=per_company, steps_per_year=TIME_STEPS[time_step],
+        )
+
+    c1, c2, c3, c4, c5, c6 = st.columns(6)
     c1.metric(t("metric_ext_true"), fmt_usd(final["Ext. True Value"]))
     c2.metric("Flynn Matrix Value", fmt_usd(final["Flynn Matrix Value"]))
     c3.metric(t("metric_flynn_advantage"), f'+{final["Delta (%)"]:,.0f}%', fmt_usd(final["Delta (abs)"]))
@@ -1508,116 +4165,23 @@ def main():
               f'{final["Ext. EHI"]:.2f} vs {final["Flynn EHI"]:.2f}')
     c5.metric(t("metric_cum_ext"), fmt_usd(cum_ext),
               t("metric_never_repaid"), delta_color="inverse")
+    c6.metric(t("explorer_break_even"),
+              f"{break_even:.1f}" if not np.isnan(break_even) else "—",
+              t("metric_break_even_sub", n=f"{break_even - current_year:.1f}") if not np.isnan(break_even)
+              else t("eq_not_reachable"), delta_color="off")
 
     # ── TABS ──
     st.markdown("---")
-    tab0, tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
-        t("tab_cum_destruction"), t("tab_annual"),
-        t("tab_stocks"), t("tab_netincome"), t("tab_comparison"),
-        t("tab_flynn_pct"), t("tab_indices"),
-        t("tab_dialysis"), t("tab_data"),
-    ])
-
-    with tab0:
-        st.plotly_chart(chart_cumulative_destruction(df), width="stretch")
-        st.caption(t("cap_cum_destruction", yr=hist_years[0]))
-        # ── Per-category breakdown table (ALL years: historical + projection) ──
-        with st.expander(t('all_categories_title', start=retro_start), expanded=False):
-            cat_cols = ["Jahr", "Phase", "Revenue"] + [f"Ext. {c}" for c in EXT_CAT_NAMES] + [
-                "Ext. Externalities", "Ext. Kum. Externalities"]
-            cat_cols_avail = [c for c in cat_cols if c in df.columns]
-            breakdown = df[cat_cols_avail].copy()
-            nice_names = {"Jahr": t("col_year"), "Phase": t("col_phase"), "Revenue": t("col_revenue"),
-                          "Ext. Externalities": t("col_sum"),
-                          "Ext. Kum. Externalities": t("col_cumulated")}
-            for cn in EXT_CAT_NAMES:
-                nice_names[f"Ext. {cn}"] = f"{EXT_CATEGORIES[cn]['icon']} {_tcat(cn)}"
-            breakdown.rename(columns=nice_names, inplace=True)
-            for c in breakdown.columns:
-                if c not in (t("col_year"), t("col_phase")):
-                    breakdown[c] = breakdown[c].apply(lambda v: f"${_sf(v)/1e9:,.2f}B")
-            st.dataframe(breakdown, width="stretch", hide_index=True)
-
-        with st.expander(t('cum_gap_title', start=retro_start), expanded=False):
-            schere_df = df[["Jahr", "Phase", "Ext. Kum. Externalities",
-                              "Flynn Kum. Wertschoepfung", "Kum. Schere (abs)"]].copy()
-            schere_df.columns = [t("col_year"), t("col_phase"), t("col_cum_debt_ext"),
-                                 t("col_cum_building_flynn"), t("col_gap")]
-            for c in schere_df.columns:
-                if c not in (t("col_year"), t("col_phase")):
-                    schere_df[c] = schere_df[c].apply(lambda v: f"${_sf(v)/1e9:,.2f}B")
-            st.dataframe(schere_df, width="stretch", hide_index=True)
-
-    with tab1:
-        st.plotly_chart(chart_annual_comparison(df), width="stretch")
-        st.caption(t("cap_annual"))
-
-    with tab2:
-        st.plotly_chart(chart_stock_prices(df), width="stretch")
-        st.caption(t("cap_stocks"))
-
-    with tab3:
-        st.plotly_chart(chart_net_income(df), width="stretch")
-        st.caption(t("cap_netincome"))
-
-    with tab4:
-        st.plotly_chart(chart_value_comparison(df), width="stretch")
-        st.caption(t("cap_comparison"))
-
-    with tab5:
-        st.plotly_chart(chart_delta_bars(df), width="stretch")
-
-    with tab6:
-        st.plotly_chart(chart_indices_compare(df), width="stretch")
-        st.markdown("##### {}".format(t("index_change_to", yr=int(final["Jahr"]))))
-        c1, c2, c3 = st.columns(3)
-        for cw, nm in [(c1, "EHI"), (c2, "HRI"), (c3, "IRI")]:
-            with cw:
-                st.metric(f"{nm} {t('label_extractive')}", f'{final[f"Ext. {nm}"]:.3f}',
-                          f'{((final[f"Ext. {nm}"] / max(0.01, {"EHI": ehi_0, "HRI": hri_0, "IRI": iri_0}[nm])) - 1)*100:+,.0f}%')
-                st.metric(f"{nm} Flynn", f'{final[f"Flynn {nm}"]:.3f}',
-                          f'{((final[f"Flynn {nm}"] / max(0.01, {"EHI": ehi_0, "HRI": hri_0, "IRI": iri_0}[nm])) - 1)*100:+,.0f}%')
-
-    with tab7:
-        st.plotly_chart(chart_dialysis(df), width="stretch")
-        st.caption(t("cap_dialysis"))
-        st.markdown("---")
-        st.plotly_chart(chart_metamorphose(df), width="stretch")
-        st.caption(t("cap_metamorphose"))
-
-    with tab8:
-        with st.expander(t('data_table_title'), expanded=False):
-            st.dataframe(df, width="stretch", height=500)
-            csv = df.to_csv(index=False).encode("utf-8")
-            st.download_button(t("csv_export"), csv, "flynn_matrix_full.csv", "text/csv")
+    scenario = dict(growth_rate=growth_rate, gamma=gamma, dr_0=dr_0, beta=beta,
+                    ehi_0=ehi_0, hri_0=hri_0, iri_0=iri_0, q_b_share=q_b_share,
+                    ext_degrad=ext_degrad, proj_years=proj_years)
+    _result_tabs(df, chart_df, annual_df, hist_df, final, break_even, scenario, per_company,
+                 TIME_STEPS[time_step])
 
     # ── Mathematical Reference ──
     st.markdown("---")
-    with st.expander(t("math_ref_title"), expanded=False):
-        st.markdown(t("math_alloc"))
-        st.markdown(t("math_dialysis"))
-        st.markdown(t("math_roi"))
-        st.markdown(t("math_metamorphose"))
-        st.markdown(t("math_wellness"))
-        st.markdown(t("math_ext_title"))
-        st.markdown(
-            t("math_cat_header") + "\n|---|---|---|\n"
-            f"| {t('math_cat_climate')} | $0.12 \\cdot Rev \\cdot (1-EHI)$ | EHI |\n"
-            f"| {t('math_cat_biodiv')} | $0.06 \\cdot Rev \\cdot (1-EHI)$ | EHI |\n"
-            f"| {t('math_cat_water')} | $0.04 \\cdot Rev \\cdot (1-EHI)$ | EHI |\n"
-            f"| {t('math_cat_health')} | $0.06 \\cdot Rev \\cdot (1-HRI)$ | HRI |\n"
-            f"| {t('math_cat_inequality')} | $0.08 \\cdot Rev \\cdot (1-HRI)$ | HRI |\n"
-            f"| {t('math_cat_exploitation')} | $0.04 \\cdot Rev \\cdot (1-HRI)$ | HRI |\n"
-            f"| {t('math_cat_systemic')} | $0.07 \\cdot Rev \\cdot (1-IRI)$ | IRI |\n"
-            f"| {t('math_cat_regulatory')} | $0.03 \\cdot Rev \\cdot (1-IRI)$ | IRI |\n"
-        )
-        st.markdown(r"$$C_{ext} = \sum_{k=1}^{8} r_k \cdot Rev \cdot (1 - I_k)$$")
-        st.markdown(t("math_ext_formula"))
-        st.markdown(t("math_cum_destruction"))
-        st.markdown(t("math_flynn_value"))
-        st.markdown(t("math_cum_flynn"))
-        st.markdown(t("math_gap"))
-        st.markdown(t("math_ext_true"))
+    _math_reference()
+    _diagnostics(df)
 
     st.markdown(
         "<p style='text-align:center; color:#3a5577; font-size:0.75rem; margin-top:40px;'>"
@@ -0,0 +1,77 @@
+"""
+Local stand-in for the network key-value cache (FLYNN_CACHE=redis://host:port).
+
+Speaks the subset of the Redis protocol app.py uses — GET, SET (with PX/EX),
+DEL, PING, FLUSHALL — so tests and single-host setups can run the network
+backend without a Redis/Valkey server:
+
+    python kv_standin.py --port 6390
+    FLYNN_CACHE=redis://127.0.0.1:6390 streamlit run app.py
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+_STORE: dict[bytes, tuple[float, bytes]] = {}   # key -> (expires at, value)
+_LOCK = threading.Lock()
+
+
+def _bulk(value: bytes | None) -> bytes:
+    return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _execute(args: list[bytes]) -> bytes:
+    cmd = args[0].upper()
+    now = time.time()
+    with _LOCK:
+        if cmd == b"PING":
+            return b"+PONG\r\n"
+        if cmd == b"GET" and len(args) == 2:
+            entry = _STORE.get(args[1])
+            if entry is not None and entry[0] < now:
+                del _STORE[args[1]]
+                entry = None
+            return _bulk(None if entry is None else entry[1])
+        if cmd == b"SET" and len(args) in (3, 5):
+            ttl = float("inf")
+            if len(args) == 5:
+                unit = args[3].upper()
+                if unit not in (b"PX", b"EX"):
+                    return b"-ERR syntax error\r\n"
+                ttl = int(args[4]) / (1000 if unit == b"PX" else 1)
+            _STORE[args[1]] = (now + ttl, args[2])
+            return b"+OK\r\n"
+        if cmd == b"DEL":
+            return b":%d\r\n" % sum(_STORE.pop(k, None) is not None for k in args[1:])
+        if cmd == b"FLUSHALL":
+            _STORE.clear()
+            return b"+OK\r\n"
+    return b"-ERR unknown command '%s'\r\n" % args[0]
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        while True:
+            line = self.rfile.readline()
+            if not line.startswith(b"*"):
+                return
+            args = []
+            for _ in range(int(line[1:])):
+                size = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(size + 2)[:-2])
+            self.wfile.write(_execute(args))
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    opts = parser.parse_args()
+    with _Server((opts.host, opts.port), _Handler) as server:
+        server.serve_forever()
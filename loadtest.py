@@ -0,0 +1,248 @@
+"""
+Load test: N concurrent sessions replaying slider changes against the app.
+
+    pip install -r requirements-dev.txt
+    python loadtest.py --sessions 16 --steps 25 --concurrency 8
+    python loadtest.py --url ws://host:8501 ...   (a running server instead)
+
+Starts `streamlit run app.py` on a free port (unless --url is given) and
+connects headless websocket clients speaking Streamlit's protocol, so every
+rerun goes through the real server: session handling, script run,
+serialization. Every session opens the app, then moves one sidebar
+parameter (PARAM_BOUNDS) at a time the way a user drags a slider, a few
+steps from where it stands, and waits for the rerun to finish.
+
+Reported: reruns/s, first-run and rerun latency percentiles, server memory
+per connected session (RSS growth, local server only) and the shared-cache
+hit ratio during the test (read from the diagnostics expander).
+
+The server runs on FALLBACK_DATA (FLYNN_OFFLINE) unless --recorded is
+given; the market data store then replays the snapshots recorded on this
+host by earlier runs (MarketDataStore.preload). FLYNN_CACHE picks the
+cache backend as for the app.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.Markdown_pb2 import Markdown
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from translations import T
+
+APP = Path(__file__).with_name("app.py")
+MOVE_STEPS = (1, 1, 1, 2, 3, 5)   # slider steps per move: mostly small drags
+
+
+class Session:
+    """One headless browser tab: widget states in, deltas out."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.widget_ids: dict[str, str] = {}       # widget key → id
+        self.values: dict[str, float] = {}         # slider key → current value
+        self.states: dict[str, WidgetState] = {}   # key → state sent with every rerun
+        self.captions: list[str] = []
+        self.errors = 0
+
+    @classmethod
+    async def open(cls, url: str) -> "Session":
+        ws = await websockets.connect(f"{url}/_stcore/stream", subprotocols=["streamlit"],
+                                      max_size=None)
+        return cls(ws)
+
+    async def rerun(self) -> float:
+        """Send the widget states, wait for the script run to finish; seconds."""
+        msg = BackMsg()
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        self.captions = []
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "script_finished":
+                return time.perf_counter() - start
+            if kind == "delta":
+                self._read_delta(fwd.delta)
+
+    def _read_delta(self, delta) -> None:
+        if delta.WhichOneof("type") == "add_block":
+            block = delta.add_block
+            if block.WhichOneof("type") == "expandable" and block.expandable.id:
+                self.widget_ids[block.expandable.id.rsplit("-", 1)[-1]] = block.expandable.id
+            return
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.errors += 1
+        elif kind == "slider":
+            key = element.slider.id.rsplit("-", 1)[-1]
+            self.widget_ids[key] = element.slider.id
+            self.values.setdefault(key, element.slider.default[0])
+        elif kind == "markdown" and element.markdown.element_type == Markdown.Type.CAPTION:
+            self.captions.append(element.markdown.body)
+
+    def set_slider(self, key: str, value: float) -> None:
+        self.values[key] = value
+        self.states[key] = WidgetState(id=self.widget_ids[key], double_array_value={"data": [value]})
+
+    def open_expander(self, key: str) -> None:
+        self.states[key] = WidgetState(id=self.widget_ids[key], bool_value=True)
+
+    async def close(self) -> None:
+        await self.ws.close()
+
+
+async def user(url: str, seed: int, steps: int, bounds: dict, gate: asyncio.Semaphore) -> dict:
+    """One user: open the app, then `steps` slider moves; stays connected."""
+    rng = random.Random(seed)
+    async with gate:
+        session = await Session.open(url)
+        first = await session.rerun()
+        latencies = []
+        for _ in range(steps):
+            name = rng.choice([k for k in bounds if k in session.widget_ids])
+            lo, hi, _default, step = bounds[name]
+            value = session.values[name] + rng.choice((-1, 1)) * rng.choice(MOVE_STEPS) * step
+            session.set_slider(name, min(hi, max(lo, round(value / step) * step)))
+            latencies.append(await session.rerun())
+    return dict(session=session, first=first, latencies=latencies)
+
+
+async def cache_counts(url: str) -> tuple[int, int]:
+    """(hits, misses) of the server's shared cache, from the diagnostics expander."""
+    pattern = re.escape(T["diag_cache"]["en"])
+    for field in ("backend", "hits", "misses", "errors", "ratio"):
+        pattern = pattern.replace(re.escape("{" + field + "}"), rf"(?P<{field}>\S+?)")
+    session = await Session.open(url)
+    await session.rerun()
+    session.open_expander("_diag")
+    await session.rerun()
+    await session.close()
+    for caption in session.captions:
+        m = re.fullmatch(pattern, caption)
+        if m:
+            return int(m["hits"]), int(m["misses"])
+    return 0, 0
+
+
+def rss_bytes(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as fh:
+        return next(int(line.split()[1]) * 1024 for line in fh if line.startswith("VmRSS:"))
+
+
+def start_server(recorded: bool) -> tuple[subprocess.Popen, str]:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = dict(os.environ) if recorded else dict(os.environ, FLYNN_OFFLINE="1")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(APP), "--server.port", str(port),
+         "--server.headless", "true", "--browser.gatherUsageStats", "false"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(300):
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return server, f"ws://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("streamlit server did not come up")
+
+
+async def load_test(url: str, opts, pid: int | None) -> dict:
+    sys.path.insert(0, str(APP.parent))
+    from app import PARAM_BOUNDS
+
+    # Warm the server (imports, shared cache) so it is not billed to the first user
+    hits_0, misses_0 = await cache_counts(url)
+    rss_0 = rss_bytes(pid) if pid else None
+
+    gate = asyncio.Semaphore(opts.concurrency)
+    start = time.perf_counter()
+    done = await asyncio.gather(*(user(url, opts.seed + i, opts.steps, PARAM_BOUNDS, gate)
+                                  for i in range(opts.sessions)))
+    wall = time.perf_counter() - start
+    rss = rss_bytes(pid) if pid else None
+    hits, misses = await cache_counts(url)
+    hits, misses = hits - hits_0, misses - misses_0
+    for r in done:
+        await r["session"].close()
+
+    lat = np.array([x for r in done for x in r["latencies"]]) * 1000
+    first = np.array([r["first"] for r in done]) * 1000
+    return {
+        "sessions": opts.sessions, "steps": opts.steps, "concurrency": opts.concurrency,
+        "cache": os.environ.get("FLYNN_CACHE", "memory"),
+        "data": "recorded" if opts.recorded else "fallback",
+        "wall_s": round(wall, 2),
+        "reruns": int(lat.size + first.size),
+        "reruns_per_s": round((lat.size + first.size) / wall, 2),
+        "first_run_ms": {f"p{q}": round(float(np.percentile(first, q)), 1) for q in (50, 95, 99)},
+        "rerun_ms": {f"p{q}": round(float(np.percentile(lat, q)), 1) for q in (50, 95, 99)}
+                    if lat.size else {},
+        "session_mb": round((rss - rss_0) / opts.sessions / 2**20, 2) if pid else None,
+        "cache_hits": hits, "cache_misses": misses,
+        "cache_hit_ratio": round(hits / (hits + misses), 3) if hits + misses else None,
+        "errors": sum(r["session"].errors for r in done),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8, help="simulated users")
+    parser.add_argument("--steps", type=int, default=20, help="slider moves per user")
+    parser.add_argument("--concurrency", type=int, default=4, help="users active at once")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="ws://host:port of a running server (default: start one)")
+    parser.add_argument("--recorded", action="store_true", help="replay recorded market data")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    opts = parser.parse_args()
+
+    server = None
+    if opts.url:
+        url, pid = opts.url.rstrip("/"), None
+    else:
+        server, url = start_server(opts.recorded)
+        pid = server.pid
+    try:
+        r = asyncio.run(load_test(url, opts, pid))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if opts.json:
+        print(json.dumps(r, indent=2))
+        return
+    print(f"{r['sessions']} sessions × {r['steps']} moves, {r['concurrency']} concurrent "
+          f"({r['data']} data, {r['cache']} cache)")
+    print(f"  reruns        {r['reruns']} in {r['wall_s']}s = {r['reruns_per_s']}/s")
+    print("  first run     " + ", ".join(f"{k} {v} ms" for k, v in r["first_run_ms"].items()))
+    if r["rerun_ms"]:
+        print("  rerun         " + ", ".join(f"{k} {v} ms" for k, v in r["rerun_ms"].items()))
+    if r["session_mb"] is not None:
+        print(f"  memory        {r['session_mb']} MB RSS per connected session")
+    print(f"  shared cache  hit ratio {r['cache_hit_ratio']} "
+          f"({r['cache_hits']} hits, {r['cache_misses']} misses)")
+    print(f"  errors        {r['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Production launcher for app.py with a startup warm-up and a readiness probe.
+
+    streamlit run serve.py        (or: python serve.py)
+
+On start, the app is run once in a headless session per language and chart
+tab, before any visitor arrives: market data is seeded from the persistent
+stores, the default scenario is simulated and every chart is built into the
+shared cache (see FLYNN_CACHE in app.py). GET /ready answers 503 until that
+is done and 200 afterwards; point the load balancer's readiness check at it
+(/_stcore/health only says the server is up).
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlencode
+
+import streamlit as st
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.runtime import Runtime
+
+from translations import LANGUAGES, T
+
+# Tabs whose charts the warm-up builds (the other tabs compute on demand)
+WARM_TABS = ("tab_cum_destruction", "tab_annual", "tab_stocks", "tab_netincome",
+             "tab_comparison", "tab_flynn_pct", "tab_indices", "tab_dialysis")
+WARM_TIMEOUT = 120    # seconds per headless run
+
+_log = logging.getLogger("flynn.warmup")
+_warm = {"ready": False, "runs": 0, "failed": 0, "seconds": None}
+
+
+class _HeadlessClient:
+    """SessionClient that discards the output and signals the end of a run."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.finished = asyncio.Event()
+        self.exception = False
+        self._loop = loop
+
+    @property
+    def client_context(self):
+        return None
+
+    def write_forward_msg(self, msg) -> None:
+        kind = msg.WhichOneof("type")
+        if kind == "delta" and msg.delta.new_element.WhichOneof("type") == "exception":
+            self.exception = True
+        elif kind == "script_finished":
+            self._loop.call_soon_threadsafe(self.finished.set)
+
+
+async def _headless_run(runtime: Runtime, query: dict[str, str]) -> bool:
+    """One script run as a session opened with `query`; True if it ran cleanly."""
+    client = _HeadlessClient(asyncio.get_running_loop())
+    session_id = runtime.connect_session(client=client, user_info={})
+    try:
+        msg = BackMsg()
+        msg.rerun_script.query_string = urlencode(query)
+        runtime.handle_backmsg(session_id, msg)
+        await asyncio.wait_for(client.finished.wait(), WARM_TIMEOUT)
+        return not client.exception
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        runtime.close_session(session_id)
+
+
+async def warm_up(runtime: Runtime) -> None:
+    """Render every warmed tab in every language, then flip readiness."""
+    start = time.perf_counter()
+    for label, lang in LANGUAGES.items():
+        for tab in WARM_TABS:
+            ok = await _headless_run(runtime, {"_lang_sel": label, "_tab": T[tab][lang]})
+            _warm["runs"] += 1
+            _warm["failed"] += not ok
+    _warm["seconds"] = round(time.perf_counter() - start, 2)
+    _warm["ready"] = True
+    _log.info("warm-up done: %(runs)d runs, %(failed)d failed, %(seconds)ss", _warm)
+
+
+async def ready(_request) -> JSONResponse:
+    return JSONResponse(_warm, status_code=200 if _warm["ready"] else 503)
+
+
+@asynccontextmanager
+async def lifespan(_app):
+    task = asyncio.create_task(warm_up(Runtime.instance()))
+    yield
+    task.cancel()
+
+
+app = st.App("app.py", lifespan=lifespan, routes=[Route("/ready", ready)])
+
+if __name__ == "__main__":
+    app.run()
@@ -1043,13 +1043,13 @@ T = {
         "fr": "Capture Réglementaire", "es": "Captura Regulatoria", "ja": "規制の虜", "zh": "监管俘获",
     },
     "math_ext_formula": {
-        "en": "At full degradation ($I=0$): $C_{{ext}} = 0.50 \\cdot Rev$ — half of total revenue!",
-        "de": "Bei voller Degradation ($I=0$): $C_{{ext}} = 0.50 \\cdot Rev$ — die Haelfte des gesamten Umsatzes!",
-        "it": "A degradazione completa ($I=0$): $C_{{ext}} = 0.50 \\cdot Rev$ — metà del fatturato totale!",
-        "fr": "À dégradation complète ($I=0$) : $C_{{ext}} = 0.50 \\cdot Rev$ — la moitié du CA total !",
-        "es": "Con degradación total ($I=0$): $C_{{ext}} = 0.50 \\cdot Rev$ — ¡la mitad de los ingresos totales!",
-        "ja": "完全劣化時（$I=0$）：$C_{{ext}} = 0.50 \\cdot Rev$ — 総収益の半分！",
-        "zh": "完全退化时（$I=0$）：$C_{{ext}} = 0.50 \\cdot Rev$ — 总收入的一半！",
+        "en": "At full degradation ($I=0$): $C_{{ext}} = {total} \\cdot Rev$ — {share} of total revenue!",
+        "de": "Bei voller Degradation ($I=0$): $C_{{ext}} = {total} \\cdot Rev$ — {share} des gesamten Umsatzes!",
+        "it": "A degradazione completa ($I=0$): $C_{{ext}} = {total} \\cdot Rev$ — il {share} del fatturato totale!",
+        "fr": "À dégradation complète ($I=0$) : $C_{{ext}} = {total} \\cdot Rev$ — {share} du CA total !",
+        "es": "Con degradación total ($I=0$): $C_{{ext}} = {total} \\cdot Rev$ — ¡el {share} de los ingresos totales!",
+        "ja": "完全劣化時（$I=0$）：$C_{{ext}} = {total} \\cdot Rev$ — 総収益の{share}！",
+        "zh": "完全退化时（$I=0$）：$C_{{ext}} = {total} \\cdot Rev$ — 总收入的{share}！",
     },
     "math_cum_destruction": {
         "en": "**Cumulative Value Destruction (NEVER repaid):**\n$$\\Sigma_{{ext}} = \\sum_{{t=1}}^{{T}} C_{{ext,t}}$$\nExternalities are never \"paid\" — they accumulate as invisible debt on the system.",
@@ -1155,4 +1155,563 @@ T = {
         "it": "Mai ripagato!", "fr": "Jamais remboursé !",
         "es": "¡Nunca reembolsado!", "ja": "返済されない！", "zh": "从未偿还！",
     },
+    # ── Per-company projection mode ──
+    "per_company_label": {
+        "en": "Per-company simulation", "de": "Simulation je Unternehmen",
+        "it": "Simulazione per società", "fr": "Simulation par entreprise",
+        "es": "Simulación por empresa", "ja": "企業別シミュレーション", "zh": "按公司模拟",
+    },
+    "per_company_help": {
+        "en": "Runs externalities and the Flynn dynamics separately for each company "
+              "(own net income and revenue/NI ratio), then aggregates.",
+        "de": "Berechnet Externalitaeten und Flynn-Dynamik getrennt je Unternehmen "
+              "(eigener Gewinn und eigenes Umsatz/Gewinn-Verhaeltnis) und aggregiert danach.",
+        "it": "Calcola esternalità e dinamica Flynn separatamente per ogni società "
+              "(utile e rapporto ricavi/utile propri), poi aggrega.",
+        "fr": "Calcule externalités et dynamique Flynn séparément pour chaque entreprise "
+              "(résultat et ratio CA/résultat propres), puis agrège.",
+        "es": "Calcula externalidades y dinámica Flynn por separado para cada empresa "
+              "(beneficio y ratio ingresos/beneficio propios) y luego agrega.",
+        "ja": "外部性とFlynnダイナミクスを企業ごと（自社の純利益・売上/純利益比率）に計算し、集計します。",
+        "zh": "按公司分别计算外部性与Flynn动态（各自净利润及收入/净利润比率），然后汇总。",
+    },
+    "company_table_title": {
+        "en": "Per-company results {yr}", "de": "Ergebnisse je Unternehmen {yr}",
+        "it": "Risultati per società {yr}", "fr": "Résultats par entreprise {yr}",
+        "es": "Resultados por empresa {yr}", "ja": "企業別結果 {yr}", "zh": "各公司结果 {yr}",
+    },
+    # ── Engine time step ──
+    "time_step_label": {
+        "en": "Time step", "de": "Zeitschritt", "it": "Passo temporale",
+        "fr": "Pas de temps", "es": "Paso temporal", "ja": "時間ステップ", "zh": "时间步长",
+    },
+    "time_step_help": {
+        "en": "Quarterly/monthly splits history and projection into periods; rates are rescaled to the step length.",
+        "de": "Quartal/Monat teilt Historie und Projektion in Perioden; Raten werden auf die Schrittlaenge umgerechnet.",
+        "it": "Trimestrale/mensile divide storico e proiezione in periodi; i tassi vengono riscalati sul passo.",
+        "fr": "Trimestriel/mensuel découpe historique et projection en périodes ; les taux sont ajustés au pas.",
+        "es": "Trimestral/mensual divide historia y proyección en periodos; las tasas se reescalan al paso.",
+        "ja": "四半期/月次では履歴と予測を期間に分割し、各レートをステップ長に換算します。",
+        "zh": "季度/月度将历史与预测拆分为期间，各比率按步长重新换算。",
+    },
+    "step_annual": {
+        "en": "Annual", "de": "Jaehrlich", "it": "Annuale",
+        "fr": "Annuel", "es": "Anual", "ja": "年次", "zh": "年度",
+    },
+    "step_quarterly": {
+        "en": "Quarterly", "de": "Quartalsweise", "it": "Trimestrale",
+        "fr": "Trimestriel", "es": "Trimestral", "ja": "四半期", "zh": "季度",
+    },
+    "step_monthly": {
+        "en": "Monthly", "de": "Monatlich", "it": "Mensile",
+        "fr": "Mensuel", "es": "Mensual", "ja": "月次", "zh": "月度",
+    },
+    # ── Export ──
+    "show_table": {
+        "en": "Show table", "de": "Tabelle anzeigen", "it": "Mostra tabella",
+        "fr": "Afficher le tableau", "es": "Mostrar tabla", "ja": "表を表示", "zh": "显示表格",
+    },
+    "export_format": {
+        "en": "Export format", "de": "Exportformat", "it": "Formato di esportazione",
+        "fr": "Format d'export", "es": "Formato de exportación", "ja": "エクスポート形式", "zh": "导出格式",
+    },
+    "export_full": {
+        "en": "Full simulation", "de": "Komplette Simulation", "it": "Simulazione completa",
+        "fr": "Simulation complète", "es": "Simulación completa", "ja": "全シミュレーション", "zh": "完整模拟",
+    },
+    "export_categories": {
+        "en": "Per category", "de": "Je Kategorie", "it": "Per categoria",
+        "fr": "Par catégorie", "es": "Por categoría", "ja": "カテゴリー別", "zh": "按类别",
+    },
+    "export_companies": {
+        "en": "Per company", "de": "Je Unternehmen", "it": "Per società",
+        "fr": "Par entreprise", "es": "Por empresa", "ja": "企業別", "zh": "按公司",
+    },
+    # ── Backtest sweep ──
+    "tab_backtest": {
+        "en": "Backtest", "de": "Backtest", "it": "Backtest",
+        "fr": "Backtest", "es": "Backtest", "ja": "バックテスト", "zh": "回测",
+    },
+    "bt_metric": {
+        "en": "Metric", "de": "Kennzahl", "it": "Metrica",
+        "fr": "Indicateur", "es": "Métrica", "ja": "指標", "zh": "指标",
+    },
+    "bt_start": {
+        "en": "Flynn start", "de": "Flynn-Start", "it": "Avvio Flynn",
+        "fr": "Début Flynn", "es": "Inicio Flynn", "ja": "Flynn開始", "zh": "Flynn起始",
+    },
+    "bt_value_created": {
+        "en": "Cumulative value created if Flynn had started in year X",
+        "de": "Kumulierte Wertschoepfung bei Flynn-Start im Jahr X",
+        "it": "Valore cumulato creato se Flynn fosse iniziato nell'anno X",
+        "fr": "Valeur cumulée créée si Flynn avait démarré l'année X",
+        "es": "Valor acumulado creado si Flynn hubiera empezado en el año X",
+        "ja": "X年にFlynnが開始していた場合の累積価値創造",
+        "zh": "若Flynn于X年启动的累计价值创造",
+    },
+    "bt_debt_avoided": {
+        "en": "Cumulative externality debt avoided if Flynn had started in year X",
+        "de": "Kumulierte vermiedene Externalitaeten-Schuld bei Flynn-Start im Jahr X",
+        "it": "Debito da esternalità evitato cumulato se Flynn fosse iniziato nell'anno X",
+        "fr": "Dette d'externalités évitée cumulée si Flynn avait démarré l'année X",
+        "es": "Deuda de externalidades evitada acumulada si Flynn hubiera empezado en el año X",
+        "ja": "X年にFlynnが開始していた場合の累積回避外部性債務",
+        "zh": "若Flynn于X年启动的累计规避外部性债务",
+    },
+    "cap_backtest": {
+        "en": "Each row is one Flynn start year ({start} – today), each column a calendar year up to {end}. "
+              "All start years are evaluated in one batched pass.",
+        "de": "Jede Zeile ist ein Flynn-Startjahr ({start} – heute), jede Spalte ein Kalenderjahr bis {end}. "
+              "Alle Startjahre werden in einem gebuendelten Durchlauf berechnet.",
+        "it": "Ogni riga è un anno di avvio Flynn ({start} – oggi), ogni colonna un anno fino al {end}. "
+              "Tutti gli anni di avvio sono calcolati in un unico passaggio.",
+        "fr": "Chaque ligne est une année de démarrage Flynn ({start} – aujourd'hui), chaque colonne une année jusqu'à {end}. "
+              "Toutes les années sont calculées en une seule passe.",
+        "es": "Cada fila es un año de inicio Flynn ({start} – hoy), cada columna un año hasta {end}. "
+              "Todos los años de inicio se calculan en una sola pasada.",
+        "ja": "各行はFlynn開始年（{start}～現在）、各列は{end}までの暦年。全開始年を一括計算しています。",
+        "zh": "每行为一个Flynn起始年（{start}至今），每列为截至{end}的日历年。所有起始年一次批量计算。",
+    },
+    # ── Two-parameter explorer ──
+    "tab_explorer": {
+        "en": "Explorer", "de": "Explorer", "it": "Esploratore",
+        "fr": "Explorateur", "es": "Explorador", "ja": "エクスプローラー", "zh": "参数探索",
+    },
+    "explorer_x": {
+        "en": "X axis", "de": "X-Achse", "it": "Asse X",
+        "fr": "Axe X", "es": "Eje X", "ja": "X軸", "zh": "X轴",
+    },
+    "explorer_y": {
+        "en": "Y axis", "de": "Y-Achse", "it": "Asse Y",
+        "fr": "Axe Y", "es": "Eje Y", "ja": "Y軸", "zh": "Y轴",
+    },
+    "explorer_saldo": {
+        "en": "Final net system balance", "de": "Netto-Systemsaldo am Ende",
+        "it": "Saldo netto finale del sistema", "fr": "Solde net final du système",
+        "es": "Saldo neto final del sistema", "ja": "最終純システム収支", "zh": "期末系统净余额",
+    },
+    "explorer_delta_pct": {
+        "en": "Final Flynn advantage (%)", "de": "Flynn-Vorteil am Ende (%)",
+        "it": "Vantaggio Flynn finale (%)", "fr": "Avantage Flynn final (%)",
+        "es": "Ventaja Flynn final (%)", "ja": "最終Flynnアドバンテージ（%）", "zh": "期末Flynn优势（%）",
+    },
+    "explorer_break_even": {
+        "en": "Break-even year", "de": "Break-even-Jahr", "it": "Anno di pareggio",
+        "fr": "Année d'équilibre", "es": "Año de equilibrio", "ja": "損益分岐年", "zh": "盈亏平衡年",
+    },
+    "cap_explorer": {
+        "en": "{n}×{n} grid over the full slider range, computed in one batched pass and cached for the other parameters. "
+              "Break-even is searched up to {m} years ahead; blank cells never break even.",
+        "de": "{n}×{n}-Raster ueber den vollen Reglerbereich, in einem gebuendelten Durchlauf berechnet und fuer die uebrigen Parameter gecacht. "
+              "Break-even wird bis {m} Jahre voraus gesucht; leere Zellen erreichen ihn nie.",
+        "it": "Griglia {n}×{n} sull'intero intervallo dei cursori, calcolata in un unico passaggio e memorizzata per gli altri parametri. "
+              "Il pareggio è cercato fino a {m} anni; le celle vuote non lo raggiungono mai.",
+        "fr": "Grille {n}×{n} sur toute la plage des curseurs, calculée en une passe et mise en cache pour les autres paramètres. "
+              "L'équilibre est cherché jusqu'à {m} ans ; les cellules vides ne l'atteignent jamais.",
+        "es": "Cuadrícula {n}×{n} sobre todo el rango de los deslizadores, calculada en una pasada y cacheada para los demás parámetros. "
+              "El equilibrio se busca hasta {m} años; las celdas vacías nunca lo alcanzan.",
+        "ja": "スライダー全範囲の{n}×{n}グリッドを一括計算し、他のパラメータごとにキャッシュ。損益分岐は{m}年先まで探索；空白セルは到達しません。",
+        "zh": "在滑块全范围上的{n}×{n}网格，一次批量计算并按其余参数缓存。盈亏平衡最多向前搜索{m}年；空白单元永不达到。",
+    },
+    "batch_model_note": {
+        "en": "Computed with the combined annual model.",
+        "de": "Berechnet mit dem kombinierten Jahresmodell.",
+        "it": "Calcolato con il modello annuale combinato.",
+        "fr": "Calculé avec le modèle annuel combiné.",
+        "es": "Calculado con el modelo anual combinado.",
+        "ja": "統合・年次モデルで計算しています。",
+        "zh": "使用合并年度模型计算。",
+    },
+    "batch_model_off": {
+        "en": "This tab runs the combined annual model, so its results would not match the per-company or "
+              "quarterly/monthly run shown elsewhere. Set the time step to annual and turn off per-company "
+              "simulation to use it.",
+        "de": "Dieser Tab rechnet mit dem kombinierten Jahresmodell; seine Ergebnisse wuerden nicht zum angezeigten "
+              "Lauf je Unternehmen bzw. je Quartal/Monat passen. Zeitschritt auf jaehrlich stellen und die Simulation "
+              "je Unternehmen ausschalten, um ihn zu nutzen.",
+        "it": "Questa scheda usa il modello annuale combinato, quindi i risultati non corrisponderebbero alla "
+              "simulazione per società o trimestrale/mensile mostrata altrove. Imposta il passo annuale e disattiva "
+              "la simulazione per società per usarla.",
+        "fr": "Cet onglet utilise le modèle annuel combiné ; ses résultats ne correspondraient pas à la simulation "
+              "par entreprise ou trimestrielle/mensuelle affichée ailleurs. Choisissez le pas annuel et désactivez "
+              "la simulation par entreprise pour l'utiliser.",
+        "es": "Esta pestaña usa el modelo anual combinado, por lo que sus resultados no coincidirían con la simulación "
+              "por empresa o trimestral/mensual mostrada en otras pestañas. Elija el paso anual y desactive la "
+              "simulación por empresa para usarla.",
+        "ja": "このタブは統合・年次モデルで計算するため、他のタブに表示中の企業別・四半期/月次の結果とは一致しません。"
+              "利用するには時間ステップを年次にし、企業別シミュレーションをオフにしてください。",
+        "zh": "此选项卡使用合并年度模型，其结果与其他选项卡显示的按公司或季度/月度模拟不一致。"
+              "如需使用，请将时间步长设为年度并关闭按公司模拟。",
+    },
+    "metric_break_even_sub": {
+        "en": "in {n} years", "de": "in {n} Jahren", "it": "tra {n} anni",
+        "fr": "dans {n} ans", "es": "en {n} años", "ja": "{n}年後", "zh": "{n}年后",
+    },
+    # ── Goal-seek optimizer ──
+    "tab_optimizer": {
+        "en": "Goal-Seek", "de": "Zielwertsuche", "it": "Ricerca obiettivo",
+        "fr": "Valeur cible", "es": "Buscar objetivo", "ja": "ゴールシーク", "zh": "目标求解",
+    },
+    "opt_intro": {
+        "en": "Searches Bio share, γ and DR₀ within their slider ranges; all other parameters stay as set in the sidebar.",
+        "de": "Durchsucht Bio-Anteil, γ und DR₀ innerhalb ihrer Reglerbereiche; alle uebrigen Parameter bleiben wie in der Seitenleiste.",
+        "it": "Cerca quota Bio, γ e DR₀ negli intervalli dei cursori; gli altri parametri restano come nella barra laterale.",
+        "fr": "Recherche la part Bio, γ et DR₀ dans la plage des curseurs ; les autres paramètres restent ceux de la barre latérale.",
+        "es": "Busca la cuota Bio, γ y DR₀ dentro de sus rangos; los demás parámetros quedan como en la barra lateral.",
+        "ja": "Bio比率・γ・DR₀をスライダー範囲内で探索します。その他のパラメータはサイドバーの設定のままです。",
+        "zh": "在滑块范围内搜索Bio比例、γ和DR₀；其余参数保持侧边栏设置。",
+    },
+    "opt_objective": {
+        "en": "Objective", "de": "Ziel", "it": "Obiettivo",
+        "fr": "Objectif", "es": "Objetivo", "ja": "目的", "zh": "目标",
+    },
+    "opt_max_value": {
+        "en": "Max. cum. Flynn value creation", "de": "Max. kum. Flynn-Wertschoepfung",
+        "it": "Max. creazione di valore Flynn cum.", "fr": "Max. création de valeur Flynn cum.",
+        "es": "Máx. creación de valor Flynn acum.", "ja": "累積Flynn価値創造の最大化", "zh": "最大化累计Flynn价值创造",
+    },
+    "opt_min_break_even": {
+        "en": "Earliest break-even", "de": "Fruehester Break-even", "it": "Pareggio più rapido",
+        "fr": "Équilibre au plus tôt", "es": "Equilibrio más temprano", "ja": "最速の損益分岐", "zh": "最早盈亏平衡",
+    },
+    "opt_target_saldo": {
+        "en": "Hit net system balance by year", "de": "Netto-Systemsaldo bis Jahr erreichen",
+        "it": "Raggiungere saldo netto entro l'anno", "fr": "Atteindre un solde net à une date",
+        "es": "Alcanzar saldo neto en un año", "ja": "指定年までに純システム収支を達成", "zh": "在指定年份达到系统净余额",
+    },
+    "opt_target": {
+        "en": "Target balance (bn USD)", "de": "Zielsaldo (Mrd. USD)", "it": "Saldo obiettivo (mld USD)",
+        "fr": "Solde cible (mrd USD)", "es": "Saldo objetivo (mm USD)", "ja": "目標収支（十億USD）", "zh": "目标余额（十亿美元）",
+    },
+    "opt_target_year": {
+        "en": "Target year", "de": "Zieljahr", "it": "Anno obiettivo",
+        "fr": "Année cible", "es": "Año objetivo", "ja": "目標年", "zh": "目标年份",
+    },
+    "opt_run": {
+        "en": "Run optimizer", "de": "Optimierung starten", "it": "Avvia ottimizzazione",
+        "fr": "Lancer l'optimisation", "es": "Ejecutar optimización", "ja": "最適化を実行", "zh": "运行优化",
+    },
+    "opt_achieved": {
+        "en": "Achieved", "de": "Erreicht", "it": "Raggiunto",
+        "fr": "Atteint", "es": "Alcanzado", "ja": "達成値", "zh": "达成值",
+    },
+    "opt_evaluated": {
+        "en": "{n} scenarios evaluated", "de": "{n} Szenarien ausgewertet", "it": "{n} scenari valutati",
+        "fr": "{n} scénarios évalués", "es": "{n} escenarios evaluados", "ja": "{n}シナリオを評価", "zh": "已评估{n}个情景",
+    },
+    "opt_apply": {
+        "en": "Apply to sidebar", "de": "In Seitenleiste uebernehmen", "it": "Applica alla barra laterale",
+        "fr": "Appliquer à la barre latérale", "es": "Aplicar a la barra lateral", "ja": "サイドバーに適用", "zh": "应用到侧边栏",
+    },
+    # ── Historical stress tests ──
+    "tab_stress": {
+        "en": "Stress Test", "de": "Stresstest", "it": "Stress test",
+        "fr": "Test de résistance", "es": "Prueba de estrés", "ja": "ストレステスト", "zh": "压力测试",
+    },
+    "stress_baseline": {
+        "en": "Baseline (trend)", "de": "Basis (Trend)", "it": "Base (trend)",
+        "fr": "Référence (tendance)", "es": "Base (tendencia)", "ja": "基準（トレンド）", "zh": "基准（趋势）",
+    },
+    "stress_dotcom": {
+        "en": "Dot-com bust 2001–03", "de": "Dotcom-Crash 2001–03", "it": "Crollo dot-com 2001–03",
+        "fr": "Krach Internet 2001–03", "es": "Crisis puntocom 2001–03", "ja": "ドットコム崩壊 2001–03", "zh": "互联网泡沫破裂 2001–03",
+    },
+    "stress_gfc": {
+        "en": "Financial crisis 2008–10", "de": "Finanzkrise 2008–10", "it": "Crisi finanziaria 2008–10",
+        "fr": "Crise financière 2008–10", "es": "Crisis financiera 2008–10", "ja": "金融危機 2008–10", "zh": "金融危机 2008–10",
+    },
+    "stress_covid": {
+        "en": "COVID 2020", "de": "COVID 2020", "it": "COVID 2020",
+        "fr": "COVID 2020", "es": "COVID 2020", "ja": "コロナ禍 2020", "zh": "新冠疫情 2020",
+    },
+    "stress_custom": {
+        "en": "Custom shock", "de": "Eigener Schock", "it": "Shock personalizzato",
+        "fr": "Choc personnalisé", "es": "Shock personalizado", "ja": "カスタムショック", "zh": "自定义冲击",
+    },
+    "stress_onset": {
+        "en": "Shock hits in", "de": "Schock trifft ein", "it": "Lo shock colpisce nel",
+        "fr": "Le choc survient en", "es": "El shock llega en", "ja": "ショック発生年", "zh": "冲击发生年份",
+    },
+    "stress_drawdown": {
+        "en": "Custom shock: drawdown", "de": "Eigener Schock: Einbruch", "it": "Shock personalizzato: calo",
+        "fr": "Choc personnalisé : baisse", "es": "Shock personalizado: caída", "ja": "カスタムショック：下落幅", "zh": "自定义冲击：跌幅",
+    },
+    "stress_recovery": {
+        "en": "Custom shock: recovery (years)", "de": "Eigener Schock: Erholung (Jahre)",
+        "it": "Shock personalizzato: ripresa (anni)", "fr": "Choc personnalisé : reprise (années)",
+        "es": "Shock personalizado: recuperación (años)", "ja": "カスタムショック：回復（年）", "zh": "自定义冲击：恢复期（年）",
+    },
+    "stress_metric_0": {
+        "en": "Net system balance under stress", "de": "Netto-Systemsaldo unter Stress",
+        "it": "Saldo netto del sistema sotto stress", "fr": "Solde net du système sous stress",
+        "es": "Saldo neto del sistema bajo estrés", "ja": "ストレス下の純システム収支", "zh": "压力下的系统净余额",
+    },
+    "stress_metric_1": {
+        "en": "Cumulative Flynn value under stress", "de": "Kumulierte Flynn-Wertschoepfung unter Stress",
+        "it": "Valore Flynn cumulato sotto stress", "fr": "Valeur Flynn cumulée sous stress",
+        "es": "Valor Flynn acumulado bajo estrés", "ja": "ストレス下の累積 Flynn 価値", "zh": "压力下的累计 Flynn 价值",
+    },
+    "stress_metric_2": {
+        "en": "Flynn advantage (Δ %) under stress", "de": "Flynn-Vorsprung (Δ %) unter Stress",
+        "it": "Vantaggio Flynn (Δ %) sotto stress", "fr": "Avantage Flynn (Δ %) sous stress",
+        "es": "Ventaja Flynn (Δ %) bajo estrés", "ja": "ストレス下の Flynn 優位（Δ %）", "zh": "压力下的 Flynn 优势（Δ %）",
+    },
+    "stress_col_scenario": {
+        "en": "Scenario", "de": "Szenario", "it": "Scenario", "fr": "Scénario", "es": "Escenario", "ja": "シナリオ", "zh": "情景",
+    },
+    "stress_col_trough": {
+        "en": "Trough vs. trend", "de": "Tiefpunkt vs. Trend", "it": "Minimo vs. trend",
+        "fr": "Creux vs. tendance", "es": "Mínimo vs. tendencia", "ja": "トレンド比の底", "zh": "相对趋势的谷底",
+    },
+    "stress_col_value": {
+        "en": "Cum. Flynn value", "de": "Kum. Flynn-Wert", "it": "Valore Flynn cum.",
+        "fr": "Valeur Flynn cum.", "es": "Valor Flynn acum.", "ja": "累積 Flynn 価値", "zh": "累计 Flynn 价值",
+    },
+    "stress_col_vs_base": {
+        "en": "vs. baseline", "de": "vs. Basis", "it": "vs. base",
+        "fr": "vs. référence", "es": "vs. base", "ja": "基準比", "zh": "相对基准",
+    },
+    "stress_col_saldo": {
+        "en": "Net balance", "de": "Netto-Saldo", "it": "Saldo netto",
+        "fr": "Solde net", "es": "Saldo neto", "ja": "純収支", "zh": "净余额",
+    },
+    "stress_col_delta": {
+        "en": "Flynn Δ %", "de": "Flynn Δ %", "it": "Flynn Δ %",
+        "fr": "Flynn Δ %", "es": "Flynn Δ %", "ja": "Flynn Δ %", "zh": "Flynn Δ %",
+    },
+    "stress_col_break_even": {
+        "en": "Break-even", "de": "Break-even", "it": "Pareggio",
+        "fr": "Équilibre", "es": "Equilibrio", "ja": "損益分岐", "zh": "盈亏平衡",
+    },
+    "cap_stress": {
+        "en": "{n} scenarios in one batched pass with the sidebar parameters. Historical shocks replay the year-over-year "
+              "revenue growth recorded in that crisis, then the trend resumes from the level reached; break-even only "
+              "within the projection horizon (— = not reached).",
+        "de": "{n} Szenarien in einem gebuendelten Durchlauf mit den Parametern der Seitenleiste. Historische Schocks spielen "
+              "das in der Krise beobachtete Umsatzwachstum gegenueber dem Vorjahr nach, danach setzt der Trend auf dem "
+              "erreichten Niveau wieder ein; Break-even nur innerhalb des Projektionshorizonts (— = nicht erreicht).",
+        "it": "{n} scenari in un unico passaggio con i parametri della barra laterale. Gli shock storici ripetono la crescita "
+              "annua dei ricavi registrata in quella crisi, poi il trend riparte dal livello raggiunto; pareggio solo "
+              "entro l'orizzonte di proiezione (— = non raggiunto).",
+        "fr": "{n} scénarios en une passe avec les paramètres de la barre latérale. Les chocs historiques rejouent la croissance "
+              "annuelle des revenus observée pendant la crise, puis la tendance reprend au niveau atteint ; équilibre "
+              "seulement dans l'horizon de projection (— = non atteint).",
+        "es": "{n} escenarios en una sola pasada con los parámetros de la barra lateral. Los shocks históricos repiten el "
+              "crecimiento interanual de ingresos registrado en esa crisis y luego la tendencia sigue desde el nivel "
+              "alcanzado; equilibrio solo dentro del horizonte de proyección (— = no alcanzado).",
+        "ja": "サイドバーのパラメータで {n} シナリオを一括計算。過去のショックはその危機で記録された前年比の収益成長を再現し、"
+              "その後は到達した水準からトレンドが再開します。損益分岐は予測期間内のみ（— = 未到達）。",
+        "zh": "使用侧边栏参数一次批量计算 {n} 个情景。历史冲击重现该危机期间记录的同比收入增长，之后趋势从所达水平继续；"
+              "盈亏平衡仅在预测期内计算（— = 未达到）。",
+    },
+    # ── Closed-form long-run KPI ──
+    "cum_destruction_century": {
+        "en": "Extractive debt by {yr}", "de": "Extraktive Schuld bis {yr}",
+        "it": "Debito estrattivo al {yr}", "fr": "Dette extractive en {yr}",
+        "es": "Deuda extractiva en {yr}", "ja": "{yr}年までの採取型負債", "zh": "至{yr}年的榨取型债务",
+    },
+    "ext_in_year": {
+        "en": "{v} externalities that year", "de": "{v} Externalitaeten in diesem Jahr",
+        "it": "{v} esternalità in quell'anno", "fr": "{v} d'externalités cette année-là",
+        "es": "{v} de externalidades ese año", "ja": "当年の外部性 {v}", "zh": "当年外部性 {v}",
+    },
+    # ── Externality domains (chart roll-up of large category registries) ──
+    "domain_ehi": {
+        "en": "Ecological externalities", "de": "Oekologische Externalitaeten",
+        "it": "Esternalità ecologiche", "fr": "Externalités écologiques",
+        "es": "Externalidades ecológicas", "ja": "生態系の外部性", "zh": "生态外部性",
+    },
+    "domain_hri": {
+        "en": "Social externalities", "de": "Soziale Externalitaeten",
+        "it": "Esternalità sociali", "fr": "Externalités sociales",
+        "es": "Externalidades sociales", "ja": "社会的外部性", "zh": "社会外部性",
+    },
+    "domain_iri": {
+        "en": "Institutional externalities", "de": "Institutionelle Externalitaeten",
+        "it": "Esternalità istituzionali", "fr": "Externalités institutionnelles",
+        "es": "Externalidades institucionales", "ja": "制度的外部性", "zh": "制度外部性",
+    },
+    # ── Externality drill-down (company × category × year) ──
+    "tab_drilldown": {
+        "en": "Drill-down", "de": "Drill-down", "it": "Dettaglio",
+        "fr": "Détail", "es": "Desglose", "ja": "ドリルダウン", "zh": "下钻分析",
+    },
+    "drill_span": {
+        "en": "Periods", "de": "Zeitraum", "it": "Periodi",
+        "fr": "Périodes", "es": "Periodos", "ja": "期間", "zh": "期间",
+    },
+    "drill_all": {
+        "en": "All", "de": "Alle", "it": "Tutti",
+        "fr": "Tout", "es": "Todo", "ja": "全期間", "zh": "全部",
+    },
+    "drill_past": {
+        "en": "Past (retropolation + history)", "de": "Vergangenheit (Retropolation + Historie)",
+        "it": "Passato (retropolazione + storico)", "fr": "Passé (rétropolation + historique)",
+        "es": "Pasado (retropolación + histórico)", "ja": "過去（遡及推計＋実績）", "zh": "过去（回溯估算＋历史）",
+    },
+    "drill_future": {
+        "en": "Projection", "de": "Projektion", "it": "Proiezione",
+        "fr": "Projection", "es": "Proyección", "ja": "予測", "zh": "预测",
+    },
+    "drill_heatmap_title": {
+        "en": "Extractive externalities: company × category",
+        "de": "Extraktive Externalitaeten: Unternehmen × Kategorie",
+        "it": "Esternalità estrattive: società × categoria",
+        "fr": "Externalités extractives : entreprise × catégorie",
+        "es": "Externalidades extractivas: empresa × categoría",
+        "ja": "採取型外部性：企業 × カテゴリー", "zh": "榨取型外部性：公司 × 类别",
+    },
+    "drill_company": {
+        "en": "Company", "de": "Unternehmen", "it": "Società",
+        "fr": "Entreprise", "es": "Empresa", "ja": "企業", "zh": "公司",
+    },
+    "drill_all_companies": {
+        "en": "All companies", "de": "Alle Unternehmen", "it": "Tutte le società",
+        "fr": "Toutes les entreprises", "es": "Todas las empresas", "ja": "全企業", "zh": "所有公司",
+    },
+    "drill_category": {
+        "en": "Category", "de": "Kategorie", "it": "Categoria",
+        "fr": "Catégorie", "es": "Categoría", "ja": "カテゴリー", "zh": "类别",
+    },
+    "drill_sub_title": {
+        "en": "{cat} by sub-category", "de": "{cat} nach Unterkategorie",
+        "it": "{cat} per sottocategoria", "fr": "{cat} par sous-catégorie",
+        "es": "{cat} por subcategoría", "ja": "{cat}（サブカテゴリー別）", "zh": "{cat}（按子类别）",
+    },
+    "cap_drilldown": {
+        "en": "Tensor of {c} companies × {k} categories × {y} periods ({kb} KB, float32), computed in one pass; sub-categories ({s} in the registry) are derived on demand.",
+        "de": "Tensor aus {c} Unternehmen × {k} Kategorien × {y} Perioden ({kb} KB, float32), in einem Durchlauf berechnet; Unterkategorien ({s} im Register) werden bei Bedarf abgeleitet.",
+        "it": "Tensore di {c} società × {k} categorie × {y} periodi ({kb} KB, float32), calcolato in un passaggio; le sottocategorie ({s} nel registro) sono derivate su richiesta.",
+        "fr": "Tenseur de {c} entreprises × {k} catégories × {y} périodes ({kb} Ko, float32), calculé en une passe ; les sous-catégories ({s} dans le registre) sont dérivées à la demande.",
+        "es": "Tensor de {c} empresas × {k} categorías × {y} periodos ({kb} KB, float32), calculado en una pasada; las subcategorías ({s} en el registro) se derivan bajo demanda.",
+        "ja": "{c}社 × {k}カテゴリー × {y}期間のテンソル（{kb} KB、float32）を一括計算。サブカテゴリー（登録数{s}）は必要時に導出。",
+        "zh": "{c}家公司 × {k}个类别 × {y}个期间的张量（{kb} KB，float32），一次计算完成；子类别（登记{s}个）按需推导。",
+    },
+    # ── Diagnostics ──
+    "diag_title": {
+        "en": "🩺 Diagnostics", "de": "🩺 Diagnose", "it": "🩺 Diagnostica",
+        "fr": "🩺 Diagnostic", "es": "🩺 Diagnóstico", "ja": "🩺 診断", "zh": "🩺 诊断",
+    },
+    "diag_market": {
+        "en": "Market data snapshots — refreshed in the background, durations in seconds",
+        "de": "Marktdaten-Snapshots — im Hintergrund aktualisiert, Dauer in Sekunden",
+        "it": "Snapshot dei dati di mercato — aggiornati in background, durate in secondi",
+        "fr": "Instantanés des données de marché — actualisés en arrière-plan, durées en secondes",
+        "es": "Instantáneas de datos de mercado — actualizadas en segundo plano, duraciones en segundos",
+        "ja": "市場データのスナップショット — バックグラウンドで更新、所要時間は秒",
+        "zh": "市场数据快照 — 后台刷新，耗时单位为秒",
+    },
+    "diag_fallback": {
+        "en": "No live snapshot yet for {items} — built-in fallback data is used for these, live data for the rest.",
+        "de": "Noch kein Live-Snapshot für {items} — dafür werden die eingebauten Ersatzdaten verwendet, für den Rest Live-Daten.",
+        "it": "Nessuno snapshot live per {items} — per questi si usano i dati di riserva integrati, per il resto i dati live.",
+        "fr": "Pas encore d'instantané en direct pour {items} — les données de secours intégrées sont utilisées pour ceux-ci, les données en direct pour le reste.",
+        "es": "Aún no hay instantánea en vivo para {items} — se usan los datos de respaldo integrados para estos y datos en vivo para el resto.",
+        "ja": "{items} のライブスナップショットはまだありません — これらには内蔵のフォールバックデータ、その他にはライブデータを使用しています。",
+        "zh": "{items} 尚无实时快照 — 这些使用内置备用数据，其余使用实时数据。",
+    },
+    "diag_breakers": {
+        "en": "Circuit breakers per ticker and endpoint — open circuits serve the last known good data",
+        "de": "Circuit Breaker je Ticker und Endpunkt — offene Kreise liefern die letzten gültigen Daten",
+        "it": "Circuit breaker per ticker ed endpoint — i circuiti aperti servono gli ultimi dati validi",
+        "fr": "Disjoncteurs par ticker et point d'accès — un circuit ouvert sert les dernières données valides",
+        "es": "Cortacircuitos por ticker y endpoint — los circuitos abiertos sirven los últimos datos válidos",
+        "ja": "ティッカー・エンドポイント別のサーキットブレーカー — 開放中は最後の正常データを提供",
+        "zh": "按代码和接口划分的熔断器 — 熔断期间提供最近一次有效数据",
+    },
+    "diag_cache": {
+        "en": "Shared cache ({backend}): {hits} hits, {misses} misses, {errors} errors — hit ratio {ratio}",
+        "de": "Gemeinsamer Cache ({backend}): {hits} Treffer, {misses} Fehlgriffe, {errors} Fehler — Trefferquote {ratio}",
+        "it": "Cache condivisa ({backend}): {hits} hit, {misses} miss, {errors} errori — tasso di hit {ratio}",
+        "fr": "Cache partagé ({backend}) : {hits} succès, {misses} échecs, {errors} erreurs — taux de succès {ratio}",
+        "es": "Caché compartida ({backend}): {hits} aciertos, {misses} fallos, {errors} errores — tasa de aciertos {ratio}",
+        "ja": "共有キャッシュ（{backend}）：ヒット {hits}、ミス {misses}、エラー {errors} — ヒット率 {ratio}",
+        "zh": "共享缓存（{backend}）：命中 {hits}，未命中 {misses}，错误 {errors} — 命中率 {ratio}",
+    },
+    "diag_memory": {
+        "en": "Current result: {dense} KB in memory; stored in the shared cache (pickled, zlib) {plain} KB plain, {packed} KB packed — compact storage {mode}",
+        "de": "Aktuelles Ergebnis: {dense} KB im Speicher; im gemeinsamen Cache (pickle, zlib) {plain} KB normal, {packed} KB gepackt — kompakte Speicherung {mode}",
+        "it": "Risultato attuale: {dense} KB in memoria; nella cache condivisa (pickle, zlib) {plain} KB normale, {packed} KB compattato — archiviazione compatta {mode}",
+        "fr": "Résultat actuel : {dense} Ko en mémoire ; dans le cache partagé (pickle, zlib) {plain} Ko brut, {packed} Ko compacté — stockage compact {mode}",
+        "es": "Resultado actual: {dense} KB en memoria; en la caché compartida (pickle, zlib) {plain} KB normal, {packed} KB compactado — almacenamiento compacto {mode}",
+        "ja": "現在の結果：メモリ上 {dense} KB；共有キャッシュ（pickle、zlib）では通常 {plain} KB、圧縮形式 {packed} KB — コンパクト保存は{mode}",
+        "zh": "当前结果：内存 {dense} KB；共享缓存中（pickle、zlib）普通 {plain} KB，紧凑格式 {packed} KB — 紧凑存储{mode}",
+    },
+    "diag_compact_on": {
+        "en": "on (FLYNN_COMPACT)", "de": "aktiv (FLYNN_COMPACT)", "it": "attiva (FLYNN_COMPACT)",
+        "fr": "activé (FLYNN_COMPACT)", "es": "activado (FLYNN_COMPACT)", "ja": "有効（FLYNN_COMPACT）",
+        "zh": "已启用（FLYNN_COMPACT）",
+    },
+    "diag_compact_off": {
+        "en": "off", "de": "aus", "it": "disattivata", "fr": "désactivé", "es": "desactivado",
+        "ja": "無効", "zh": "未启用",
+    },
+    "diag_jit_on": {
+        "en": "Flynn index recurrence: compiled (Numba)",
+        "de": "Flynn-Index-Rekursion: kompiliert (Numba)",
+        "it": "Ricorrenza degli indici Flynn: compilata (Numba)",
+        "fr": "Récurrence des indices Flynn : compilée (Numba)",
+        "es": "Recurrencia de los índices Flynn: compilada (Numba)",
+        "ja": "Flynn 指数の漸化式：コンパイル済み（Numba）",
+        "zh": "Flynn 指数递推：已编译（Numba）",
+    },
+    "diag_jit_off": {
+        "en": "Flynn index recurrence: NumPy (Numba disabled or not matching the reference)",
+        "de": "Flynn-Index-Rekursion: NumPy (Numba deaktiviert oder weicht von der Referenz ab)",
+        "it": "Ricorrenza degli indici Flynn: NumPy (Numba disattivato o diverso dal riferimento)",
+        "fr": "Récurrence des indices Flynn : NumPy (Numba désactivé ou différent de la référence)",
+        "es": "Recurrencia de los índices Flynn: NumPy (Numba desactivado o distinto de la referencia)",
+        "ja": "Flynn 指数の漸化式：NumPy（Numba は無効、または基準と不一致）",
+        "zh": "Flynn 指数递推：NumPy（Numba 已禁用或与参考结果不一致）",
+    },
+    "diag_jit_missing": {
+        "en": "Flynn index recurrence: NumPy (Numba not installed)",
+        "de": "Flynn-Index-Rekursion: NumPy (Numba nicht installiert)",
+        "it": "Ricorrenza degli indici Flynn: NumPy (Numba non installato)",
+        "fr": "Récurrence des indices Flynn : NumPy (Numba non installé)",
+        "es": "Recurrencia de los índices Flynn: NumPy (Numba no instalado)",
+        "ja": "Flynn 指数の漸化式：NumPy（Numba 未インストール）",
+        "zh": "Flynn 指数递推：NumPy（未安装 Numba）",
+    },
+    # ── Calibration ──
+    "calib_title": {
+        "en": "Calibration to the data", "de": "Kalibrierung an den Daten", "it": "Calibrazione sui dati",
+        "fr": "Calibrage sur les données", "es": "Calibración con los datos", "ja": "データによる較正", "zh": "基于数据的校准",
+    },
+    "calib_col_param": {
+        "en": "Parameter", "de": "Parameter", "it": "Parametro", "fr": "Paramètre", "es": "Parámetro", "ja": "パラメータ", "zh": "参数",
+    },
+    "calib_col_hand": {
+        "en": "Hand-set", "de": "Gesetzt", "it": "Impostato", "fr": "Fixé", "es": "Fijado", "ja": "設定値", "zh": "设定值",
+    },
+    "calib_col_fit": {
+        "en": "Calibrated", "de": "Kalibriert", "it": "Calibrato", "fr": "Calibré", "es": "Calibrado", "ja": "較正値", "zh": "校准值",
+    },
+    "calib_col_ci": {
+        "en": "95% CI", "de": "95%-KI", "it": "IC 95%", "fr": "IC 95 %", "es": "IC 95%", "ja": "95%信頼区間", "zh": "95%置信区间",
+    },
+    "calib_retro_slope": {
+        "en": "Retro slope {idx}", "de": "Retro-Steigung {idx}", "it": "Pendenza retro {idx}",
+        "fr": "Pente rétro {idx}", "es": "Pendiente retro {idx}", "ja": "遡及勾配 {idx}", "zh": "回溯斜率 {idx}",
+    },
+    "calib_apply": {
+        "en": "Use calibrated values", "de": "Kalibrierte Werte uebernehmen", "it": "Usa valori calibrati",
+        "fr": "Utiliser les valeurs calibrées", "es": "Usar valores calibrados", "ja": "較正値を使用", "zh": "使用校准值",
+    },
+    "cap_calib": {
+        "en": "Growth: least-squares trend of log combined revenue (retropolation and reported years, one level each). "
+              "Degradation and retro slopes act on EHI/HRI/IRI, which the data do not contain — not identified, they stay hand-set.",
+        "de": "Wachstum: Kleinste-Quadrate-Trend des logarithmierten Gesamtumsatzes (Retropolation und berichtete Jahre, je ein Niveau). "
+              "Degradation und Retro-Steigungen wirken auf EHI/HRI/IRI, die in den Daten fehlen — nicht identifiziert, sie bleiben gesetzt.",
+        "it": "Crescita: trend ai minimi quadrati del logaritmo dei ricavi combinati (retropolazione e anni riportati, un livello ciascuno). "
+              "Degrado e pendenze retro agiscono su EHI/HRI/IRI, assenti nei dati — non identificati, restano impostati.",
+        "fr": "Croissance : tendance aux moindres carrés du log des revenus cumulés (rétropolation et années publiées, un niveau chacune). "
+              "La dégradation et les pentes rétro portent sur EHI/HRI/IRI, absents des données — non identifiées, elles restent fixées.",
+        "es": "Crecimiento: tendencia por mínimos cuadrados del log de los ingresos combinados (retropolación y años reportados, un nivel cada uno). "
+              "La degradación y las pendientes retro actúan sobre EHI/HRI/IRI, ausentes en los datos — no identificadas, siguen fijadas.",
+        "ja": "成長率：合算収益の対数に対する最小二乗トレンド（遡及推計と報告年でそれぞれ別の水準）。"
+              "劣化率と遡及勾配はデータに含まれない EHI/HRI/IRI に作用するため識別できず、設定値のままです。",
+        "zh": "增长率：合并收入对数的最小二乘趋势（回溯估算与报告年份各有一个水平）。"
+              "退化率和回溯斜率作用于数据中没有的 EHI/HRI/IRI，无法识别，保持设定值。",
+    },
 }